@@ -4,32 +4,128 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
 import logging
 from typing import TypeAlias
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import ATTR_ENTITY_ID, CONF_FILENAME, CONF_HOST, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 from pyhausbus.BusHandler import BusHandler
 
+from .availability import CHECK_INTERVAL as AVAILABILITY_CHECK_INTERVAL
+from .channels import BASE_PLATFORMS
 from .gateway import HausbusGateway
-from .const import DOMAIN
-
-PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.SWITCH, Platform.BINARY_SENSOR, Platform.SENSOR, Platform.EVENT, Platform.COVER, Platform.BUTTON, Platform.NUMBER]
+from .transport import async_start_transport
+from .const import (
+    CONF_BACKUP_COUNT,
+    CONF_BUS_CAPTURE,
+    CONF_BUS_TRACE,
+    CONF_COMMAND_QUEUE_SIZE,
+    CONF_CONFIGURATION_TIMEOUT,
+    CONF_CONFIRMATION_TIMEOUT,
+    CONF_DISCOVERY_TIMEOUT,
+    CONF_ENERGY_INTERVAL,
+    CONF_INTERPOLATION_INTERVAL,
+    CONF_MAX_BYTES,
+    CONF_OPTIMISTIC,
+    CONF_PROBE_AFTER,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_RETRIES,
+    CONF_REQUEST_TIMEOUT,
+    CONF_REQUESTS_PER_DEVICE,
+    CONF_STATE_WRITE_INTERVAL,
+    CONF_TRANSPORT,
+    CONF_UNAVAILABLE_AFTER,
+    DEFAULT_BUS_CAPTURE_FILENAME,
+    DEFAULT_BUS_TRACE_BACKUP_COUNT,
+    DEFAULT_BUS_TRACE_FILENAME,
+    DEFAULT_BUS_TRACE_MAX_BYTES,
+    DEFAULT_COMMAND_QUEUE_SIZE,
+    DEFAULT_CONFIGURATION_TIMEOUT,
+    DEFAULT_CONFIRMATION_TIMEOUT,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DEFAULT_ENERGY_INTERVAL,
+    DEFAULT_INTERPOLATION_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PROBE_AFTER,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_RETRIES,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_REQUESTS_PER_DEVICE,
+    DEFAULT_STATE_WRITE_INTERVAL,
+    DEFAULT_TRANSPORT,
+    DEFAULT_UNAVAILABLE_AFTER,
+    BUS_TRANSPORT,
+    DOMAIN,
+    TRANSPORT_ASYNCIO,
+    TRANSPORT_THREAD,
+)
 
 LOGGER = logging.getLogger(__name__)
 
-CONFIG_SCHEMA = vol.Schema(
+OPTIONS_SCHEMA = vol.Schema(
     {
-        DOMAIN: vol.Schema(
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Optional(CONF_REQUEST_RATE, default=DEFAULT_REQUEST_RATE): vol.All(vol.Coerce(float), vol.Range(min=1, max=1000)),
+        vol.Optional(CONF_REQUESTS_PER_DEVICE, default=DEFAULT_REQUESTS_PER_DEVICE): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+        vol.Optional(CONF_REQUEST_RETRIES, default=DEFAULT_REQUEST_RETRIES): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+        vol.Optional(CONF_CONFIGURATION_TIMEOUT, default=DEFAULT_CONFIGURATION_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+        vol.Optional(CONF_DISCOVERY_TIMEOUT, default=DEFAULT_DISCOVERY_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=1, max=300)),
+        vol.Optional(CONF_STATE_WRITE_INTERVAL, default=DEFAULT_STATE_WRITE_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+        vol.Optional(CONF_COMMAND_QUEUE_SIZE, default=DEFAULT_COMMAND_QUEUE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+        vol.Optional(CONF_TRANSPORT, default=DEFAULT_TRANSPORT): vol.In([TRANSPORT_THREAD, TRANSPORT_ASYNCIO]),
+        vol.Optional(CONF_ENERGY_INTERVAL, default=DEFAULT_ENERGY_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+        vol.Optional(CONF_PROBE_AFTER, default=DEFAULT_PROBE_AFTER): vol.All(vol.Coerce(float), vol.Range(min=30, max=86400)),
+        vol.Optional(CONF_UNAVAILABLE_AFTER, default=DEFAULT_UNAVAILABLE_AFTER): vol.All(vol.Coerce(float), vol.Range(min=60, max=86400)),
+        vol.Optional(CONF_INTERPOLATION_INTERVAL, default=DEFAULT_INTERPOLATION_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        vol.Optional(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): cv.boolean,
+        vol.Optional(CONF_CONFIRMATION_TIMEOUT, default=DEFAULT_CONFIRMATION_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+        vol.Optional(CONF_BUS_TRACE): vol.Schema(
             {
-                vol.Optional(CONF_HOST): cv.string,
+                vol.Optional(CONF_FILENAME, default=DEFAULT_BUS_TRACE_FILENAME): cv.string,
+                vol.Optional(CONF_MAX_BYTES, default=DEFAULT_BUS_TRACE_MAX_BYTES): vol.All(vol.Coerce(int), vol.Range(min=1024)),
+                vol.Optional(CONF_BACKUP_COUNT, default=DEFAULT_BUS_TRACE_BACKUP_COUNT): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
             }
-        )
+        ),
+        vol.Optional(CONF_BUS_CAPTURE): vol.Schema(
+            {
+                vol.Optional(CONF_FILENAME, default=DEFAULT_BUS_CAPTURE_FILENAME): cv.string,
+                vol.Optional(CONF_MAX_BYTES, default=DEFAULT_BUS_TRACE_MAX_BYTES): vol.All(vol.Coerce(int), vol.Range(min=1024)),
+                vol.Optional(CONF_BACKUP_COUNT, default=DEFAULT_BUS_TRACE_BACKUP_COUNT): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+            }
+        ),
+    }
+)
+
+BULK_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required("commands"): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+                        vol.Required("state"): vol.In(["on", "off"]),
+                        vol.Optional("brightness"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    }
+                )
+            ],
+        ),
+        vol.Optional("gap", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+    }
+)
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: OPTIONS_SCHEMA
     },
     extra=vol.ALLOW_EXTRA,
 )
@@ -57,7 +153,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: HausbusConfigEntry) -> b
 
     gateway = HausbusGateway(hass, entry)
     entry.runtime_data = HausbusConfig(gateway)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Plattformen der Channels lädt das Gateway erst, wenn es Channels dafür gibt
+    await gateway.async_setup_platforms(BASE_PLATFORMS)
+
+    # Creates all known devices and entities from the topology cache
+    await gateway.async_restore_topology()
+
+    # Geräte, die länger schweigen, verteilt anpingen und als nicht verfügbar melden
+    entry.async_on_unload(async_track_time_interval(hass, gateway.async_check_availability, timedelta(seconds=AVAILABILITY_CHECK_INTERVAL)))
 
     # Creates a button to manually start device discovery
     hass.async_create_task(gateway.createDiscoveryButtonAndStartDiscovery())
@@ -68,9 +171,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: HausbusConfigEntry) -> b
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Haus-Bus integration (global services etc.)."""
 
-    domain_config = config.get(DOMAIN, {})
+    domain_config = OPTIONS_SCHEMA(config.get(DOMAIN, {}))
     host = domain_config.get(CONF_HOST)
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN]["options"] = domain_config
+    # der asyncio-Transport muss vor der ersten Verwendung des BusHandlers starten
+    if domain_config[CONF_TRANSPORT] == TRANSPORT_ASYNCIO and BUS_TRANSPORT not in hass.data[DOMAIN]:
+        transport = await async_start_transport(hass)
+        if transport is not None:
+            hass.data[DOMAIN][BUS_TRANSPORT] = transport
+
+            @callback
+            def close_transport(event: Event) -> None:
+                transport.close()
+
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, close_transport)
     if host:
         LOGGER.debug("using direct bridge ip %s", host)
         BusHandler.getInstance().setBroadcastIp(host)
@@ -104,6 +219,27 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
     hass.services.async_register(DOMAIN, "reset_device", reset_service)
 
+    async def bulk_command(call: ServiceCall):
+        entries = hass.config_entries.async_entries(DOMAIN)
+        if not entries:
+            raise HomeAssistantError("No Hausbus-Gateway available")
+
+        gateway = entries[0].runtime_data.gateway
+        # alle Aufrufe vorab auflösen, damit danach nur noch gesendet wird
+        sends = []
+        for command in call.data["commands"]:
+            for entity_id in command[ATTR_ENTITY_ID]:
+                entity = gateway.get_entity(entity_id)
+                send = entity.bulk_command(command["state"], command.get("brightness")) if entity is not None else None
+                if send is None:
+                    raise HomeAssistantError(f"{entity_id} does not support bulk commands")
+                sends.append(send)
+
+        LOGGER.debug("bulk command with %s sends", len(sends))
+        await asyncio.wrap_future(gateway.command_sender.submit(partial(gateway.send_burst, sends, call.data["gap"] / 1000)))
+
+    hass.services.async_register(DOMAIN, "bulk_command", bulk_command, schema=BULK_COMMAND_SCHEMA)
+
     return True
 
 
@@ -112,10 +248,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: HausbusConfigEntry) ->
     gateway = entry.runtime_data.gateway
 
     gateway.home_server.removeBusEventListener(gateway)
+    # schreibt noch die Warteschlangen von Trace und Capture in die Dateien
+    await hass.async_add_executor_job(gateway.shutdown)
     hass.services.async_remove(DOMAIN, "discover_devices")
     hass.services.async_remove(DOMAIN, "reset_device")
+    hass.services.async_remove(DOMAIN, "bulk_command")
 
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    return await hass.config_entries.async_unload_platforms(entry, gateway.platforms)
 
 
 async def async_remove_config_entry_device(hass, config_entry, device_entry):
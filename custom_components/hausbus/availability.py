@@ -0,0 +1,94 @@
+"""Availability of Haus-Bus devices from the messages they send."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import math
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+# Abstand der Prüfungen in Sekunden, auf den die Pings verteilt werden
+CHECK_INTERVAL = 10.0
+
+
+class HausbusAvailability:
+    """Tracks when every device was last heard of.
+
+    Every received message counts as a sign of life, so devices are only pinged after being
+    silent for probe_after seconds. A check spreads these pings over the check intervals,
+    each device is pinged at most once per probe_after. Devices silent for unavailable_after
+    seconds are reported unavailable and available again with their next message.
+    """
+
+    def __init__(self, probe_after: float, unavailable_after: float, on_change: Callable[[int, bool], None]) -> None:
+        """Set up the tracker, on_change(device_id, available) is called on every transition."""
+        self._probe_after = probe_after
+        self._unavailable_after = unavailable_after
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._last_seen: dict[int, float] = {}
+        self._last_probe: dict[int, float] = {}
+        self._unavailable: set[int] = set()
+
+    def add_device(self, device_id: int) -> None:
+        """Track a device; restored devices get the full time to show up."""
+        # check() iteriert im Loop über _last_seen, add_device läuft im Bus-Thread
+        with self._lock:
+            self._last_seen.setdefault(device_id, time.monotonic())
+
+    def remove_device(self, device_id: int) -> None:
+        """Stop tracking a device."""
+        with self._lock:
+            self._last_seen.pop(device_id, None)
+            self._last_probe.pop(device_id, None)
+            self._unavailable.discard(device_id)
+
+    def seen(self, device_id: int) -> None:
+        """Record a message of a device, called from the receive thread for every message."""
+        if device_id not in self._last_seen:
+            return
+        self._last_seen[device_id] = time.monotonic()
+        if device_id in self._unavailable:
+            with self._lock:
+                if device_id not in self._unavailable:
+                    return
+                self._unavailable.discard(device_id)
+            LOGGER.info("device %s is available again", device_id)
+            self._on_change(device_id, True)
+
+    def silent_for(self, device_id: int) -> float | None:
+        """Seconds since the last message of a device."""
+        last_seen = self._last_seen.get(device_id)
+        return None if last_seen is None else time.monotonic() - last_seen
+
+    def is_available(self, device_id: int) -> bool:
+        """False while a device is reported unavailable."""
+        return device_id not in self._unavailable
+
+    def check(self) -> list[int]:
+        """Report silent devices unavailable and return the devices to ping now."""
+        now = time.monotonic()
+        went_silent = []
+        candidates = []
+        with self._lock:
+            for device_id, last_seen in self._last_seen.items():
+                silent = now - last_seen
+                if silent >= self._unavailable_after and device_id not in self._unavailable:
+                    self._unavailable.add(device_id)
+                    went_silent.append(device_id)
+                if silent >= self._probe_after and now - self._last_probe.get(device_id, -math.inf) >= self._probe_after:
+                    candidates.append((last_seen, device_id))
+
+            # so viele je Prüfung, dass jedes Gerät einmal pro probe_after drankommt, die stillsten zuerst
+            budget = math.ceil(len(self._last_seen) * CHECK_INTERVAL / self._probe_after)
+            probes = [device_id for _last_seen, device_id in sorted(candidates)[:budget]]
+            for device_id in probes:
+                self._last_probe[device_id] = now
+
+        for device_id in went_silent:
+            LOGGER.warning("device %s is silent for %s seconds", device_id, self._unavailable_after)
+            self._on_change(device_id, False)
+        return probes
@@ -26,6 +26,7 @@ import voluptuous as vol
 from .const import ATTR_ON_STATE
 from .device import HausbusDevice
 from .entity import HausbusEntity
+from .schemas import SERVICE_SCHEMAS
 
 if TYPE_CHECKING:
     from . import HausbusConfigEntry
@@ -43,10 +44,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
 
     platform.async_register_entity_service(
         "push_button_configure_events",
-        {
-            vol.Required("eventActivationStatus", default="ENABLED"): vol.In(["DISABLED", "ENABLED", "INVERT"]),
-            vol.Optional("disabled_duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
-        },
+        SERVICE_SCHEMAS["push_button_configure_events"],
         "async_push_button_configure_events",
     )
     platform.async_register_entity_service(
@@ -67,17 +65,18 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
         "async_push_button_set_configuration",
     )
 
-    async def async_add_binary_sensor(channel: HausbusEntity) -> None:
-        """Add binary sensor entity."""
-        if isinstance(channel, HausbusBinarySensor):
-            async_add_entities([channel])
+    async def async_add_binary_sensor(channels: list[HausbusEntity]) -> None:
+        """Add binary sensor entities."""
+        async_add_entities([channel for channel in channels if isinstance(channel, HausbusBinarySensor)])
 
-    gateway.register_platform_add_channel_callback(async_add_binary_sensor, BINARY_SENSOR_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_binary_sensor, BINARY_SENSOR_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
     """Representation of a Haus-Bus binary sensor."""
 
+    _coalesce_state_writes = False
+
     def __init__(self, channel: Taster, device: HausbusDevice) -> None:
         """Set up binary sensor."""
         super().__init__(channel, device)
@@ -88,13 +87,13 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
         """Covered binary sensor channel."""
         LOGGER.debug("BinarySensor covered %s %s", self._device.device_id, self._attr_name)
         params = {ATTR_ON_STATE: True}
-        self.async_update_callback(**params)
+        self.run_in_loop(self.async_update_callback, **params)
 
     def binary_sensor_free(self) -> None:
         """Freed binary sensor channel."""
         LOGGER.debug("BinarySensor free %s %s", self._device.device_id, self._attr_name)
         params = {ATTR_ON_STATE: False}
-        self.async_update_callback(**params)
+        self.run_in_loop(self.async_update_callback, **params)
 
     def handle_event(self, data: Any) -> None:
         """Handle binary sensor events."""
@@ -114,7 +113,7 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
           self._attr_extra_state_attributes["eventActivationStatus"] = ("DISABLED" if data.getEnabled() == 0 else "ENABLED")
                 
         elif isinstance(data, TasterConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             eventMask = data.getEventMask()
             self._attr_extra_state_attributes["hold_timeout"] = data.getHoldTimeout()
@@ -129,7 +128,7 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
             self._attr_extra_state_attributes["inverted"] = data.getOptionMask().isInverted()
             self._attr_extra_state_attributes["debounce_time"] = data.getDebounceTime()
 
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     def async_update_callback(self, **kwargs: Any) -> None:
@@ -139,12 +138,13 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
             self._attr_is_on = kwargs[ATTR_ON_STATE]
             state_changed = True
 
-        if state_changed:
-            self.schedule_update_ha_state()
+        # läuft im Loop, damit auch ein kurzes "on" geschrieben wird
+        if state_changed and self.platform is not None:
+            self.async_write_ha_state()
 
     async def async_push_button_configure_events(self, eventActivationStatus: str, disabled_duration:int):
         """Disables all events from this input for the given time or activates them again."""
-        LOGGER.debug(f"async_push_button_configure_events eventActivationStatus {eventActivationStatus}, disabled_duration {disabled_duration}")
+        LOGGER.debug("async_push_button_configure_events eventActivationStatus %s, disabled_duration %s", eventActivationStatus, disabled_duration)
 
         enable = {
               "DISABLED": EEnable.FALSE,
@@ -152,11 +152,11 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
               "INVERT": EEnable.INVERT
             }.get(eventActivationStatus, EEnable.TRUE)
 
-        self._channel.enableEvents(enable, disabled_duration)
+        self.send_command(self._channel.enableEvents, enable, disabled_duration)
 
     async def async_push_button_set_configuration(self, hold_timeout: int, double_click_timeout:int, event_button_pressed_active:bool, event_button_released_active:bool, event_button_hold_start_active:bool, event_button_hold_end_active:bool, event_button_clicked_active:bool, event_button_double_clicked_active:bool, led_feedback_active:bool, inverted:bool, debounce_time:int):
         """sets configuration for this input."""
-        LOGGER.debug(f"async_push_button_set_configuration hold_timeout {hold_timeout}, double_click_timeout {double_click_timeout}, event_button_pressed_active {event_button_pressed_active}, event_button_released_active {event_button_released_active}, event_button_hold_start_active {event_button_hold_start_active}, event_button_hold_end_active {event_button_hold_end_active}, event_button_clicked_active {event_button_clicked_active}, event_button_double_clicked_active {event_button_double_clicked_active}, led_feedback_active {led_feedback_active}, inverted {inverted}, debounce_time {debounce_time}")
+        LOGGER.debug("async_push_button_set_configuration hold_timeout %s, double_click_timeout %s, event_button_pressed_active %s, event_button_released_active %s, event_button_hold_start_active %s, event_button_hold_end_active %s, event_button_clicked_active %s, event_button_double_clicked_active %s, led_feedback_active %s, inverted %s, debounce_time %s", hold_timeout, double_click_timeout, event_button_pressed_active, event_button_released_active, event_button_hold_start_active, event_button_hold_end_active, event_button_clicked_active, event_button_double_clicked_active, led_feedback_active, inverted, debounce_time)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
@@ -175,5 +175,8 @@ class HausbusBinarySensor(HausbusEntity, BinarySensorEntity):
         optionMask.setPulldown(self._configuration.getOptionMask().isPulldown())
         optionMask.setInverted(inverted)
 
-        self._channel.setConfiguration(hold_timeout, double_click_timeout, eventMask, optionMask, debounce_time)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, hold_timeout, double_click_timeout, eventMask, optionMask, debounce_time)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Taster": HausbusBinarySensor}
@@ -0,0 +1,58 @@
+"""Opt-in trace of all bus messages to a rotating file."""
+
+from __future__ import annotations
+
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import time
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.ObjectId import ObjectId
+
+TRACE_LOGGER = logging.getLogger(f"{__package__}.bus_trace")
+
+
+def format_object_id(object_id: int) -> str:
+    """Compact representation device.class.instance of an object id."""
+    oid = ObjectId(object_id)
+    return f"{oid.getDeviceId()}.{oid.getClassId()}.{oid.getInstanceId()}"
+
+
+class HausbusBusTrace:
+    """Writes one JSON line per bus message.
+
+    The trace has its own logger that does not propagate, so it neither reaches
+    home-assistant.log nor costs anything while it is not configured. The file is
+    written by a listener thread, trace() may be called in the event loop.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int) -> None:
+        """Attach a rotating file handler to the trace logger, the file is opened with the first message."""
+        self._handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._queue_handler = QueueHandler(records)
+        self._listener = QueueListener(records, self._handler)
+        self._listener.start()
+        TRACE_LOGGER.addHandler(self._queue_handler)
+        TRACE_LOGGER.setLevel(logging.DEBUG)
+        TRACE_LOGGER.propagate = False
+
+    def trace(self, message: BusDataMessage) -> None:
+        """Write a record of a received message."""
+        data = message.getData()
+        TRACE_LOGGER.debug(json.dumps({
+            "ts": round(time.time(), 3),
+            "sender": format_object_id(message.getSenderObjectId()),
+            "receiver": format_object_id(message.getReceiverObjectId()),
+            "type": type(data).__name__,
+            "data": vars(data) if hasattr(data, "__dict__") else str(data),
+        }, default=str, separators=(",", ":")))
+
+    def close(self) -> None:
+        """Detach the trace, write the queued records and close the file handler."""
+        TRACE_LOGGER.removeHandler(self._queue_handler)
+        self._listener.stop()
+        self._handler.close()
@@ -20,9 +20,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
     """Set up a button from a config entry."""
     gateway = config_entry.runtime_data.gateway
 
-    async def async_add_button(channel: HausbusButton) -> None:
-        """Add button entity."""
-        async_add_entities([channel])
+    async def async_add_button(channels: list[HausbusButton]) -> None:
+        """Add button entities."""
+        async_add_entities(channels)
 
     gateway.register_platform_add_channel_callback(async_add_button, BUTTON_DOMAIN)
 
@@ -41,7 +41,7 @@ class HausbusButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Is called if a button is pressed."""
-        LOGGER.debug(f"button pressed {self._attr_name}")
+        LOGGER.debug("button pressed %s", self._attr_name)
         try:
           await self._callback()
         except Exception as err:  # noqa: BLE001
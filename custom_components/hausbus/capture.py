@@ -0,0 +1,298 @@
+"""Opt-in binary capture of all bus messages for offline replay."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import Enum
+import importlib
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, BinaryIO
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID, getDeviceId
+
+LOGGER = logging.getLogger(__name__)
+
+FILE_MAGIC = b"HBCAP\x02"
+RECORD_CLASS = 0x01
+RECORD_MESSAGE = 0x02
+# Klassen-Nummer, Länge der Beschreibung
+CLASS_HEADER = struct.Struct("<HH")
+# monotoner Zeitstempel, gesendet, Sender, Empfänger, Klassen-Nummer, Länge der Daten
+MESSAGE_HEADER = struct.Struct("<dBIIHH")
+
+VALUE_INT = 0x01
+VALUE_ENUM = 0x02
+VALUE_STR = 0x03
+VALUE_BYTES = 0x04
+VALUE_OBJECT = 0x05
+# nur Klassen aus pyhausbus werden geschrieben und beim Lesen angelegt
+CLASS_PACKAGE = "pyhausbus."
+# Meldungen, die auf den Schreib-Thread warten dürfen, weitere werden verworfen
+QUEUE_SIZE = 10000
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    # zigzag, damit auch negative Werte kurz bleiben
+    if not -(1 << 63) <= value < (1 << 63):
+        raise OverflowError
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (result >> 1) ^ -(result & 1), offset
+        shift += 7
+
+
+@dataclass
+class CaptureRecord:
+    """A captured message with its monotonic timestamp."""
+
+    timestamp: float
+    sent: bool
+    message: BusDataMessage
+
+
+class HausbusBusCapture:
+    """Writes every bus message to a compact binary file with size based rotation.
+
+    The data classes of pyhausbus can only be decoded, not encoded, so a record holds the
+    fields of the decoded object. Only ints, strings, bytes, enums and pyhausbus objects made
+    of these are written, other values raise a TypeError. Class and field names are written
+    once per file, a typical event takes about 25 bytes. Encoding, writing and rotation happen
+    in a writer thread, capture() only queues the message and may be called in the event loop.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int) -> None:
+        """Set up the capture, the file is opened with the first message."""
+        self._filename = filename
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._file: BinaryIO | None = None
+        self._size = 0
+        self._classes: dict[tuple[type, tuple[str, ...]], int] = {}
+        self._queue: queue.Queue[tuple[float, BusDataMessage] | None] = queue.Queue(QUEUE_SIZE)
+        self._dropped = 0
+        self._writer = threading.Thread(target=self._run, name="hausbus-bus-capture", daemon=True)
+        self._writer.start()
+
+    def capture(self, message: BusDataMessage) -> None:
+        """Queue a record of a received or echoed sent message, dropped if the writer falls behind."""
+        try:
+            self._queue.put_nowait((time.monotonic(), message))
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped == 1:
+                LOGGER.warning("bus capture cannot keep up, messages are dropped")
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            timestamp, message = item
+            try:
+                self._write(message, timestamp)
+            except Exception:  # noqa: BLE001
+                LOGGER.error("could not capture %s", message, exc_info=True)
+
+    def _write(self, message: BusDataMessage, timestamp: float) -> None:
+        if self._file is None:
+            self._rotate()
+        record = self._encode(message, timestamp)
+        if self._size + len(record) > self._max_bytes and self._size > len(FILE_MAGIC):
+            self._rotate()
+            # die Klassen sind in der neuen Datei noch nicht beschrieben
+            record = self._encode(message, timestamp)
+        self._file.write(record)
+        self._size += len(record)
+
+    def _encode(self, message: BusDataMessage, timestamp: float) -> bytearray:
+        buffer = bytearray()
+        payload = bytearray()
+        classes = len(self._classes)
+        try:
+            class_index = self._write_fields(buffer, payload, message.getData())
+        except Exception:
+            # die Beschreibungen der neuen Klassen landen nicht in der Datei
+            for key, index in list(self._classes.items()):
+                if index >= classes:
+                    del self._classes[key]
+            raise
+        sender = message.getSenderObjectId()
+        buffer.append(RECORD_MESSAGE)
+        buffer += MESSAGE_HEADER.pack(timestamp, getDeviceId(sender) == HOMESERVER_DEVICE_ID, sender, message.getReceiverObjectId(), class_index, len(payload))
+        buffer += payload
+        return buffer
+
+    def _write_fields(self, buffer: bytearray, payload: bytearray, data: Any) -> int:
+        """Write the fields of a pyhausbus object and return the index of its class."""
+        if not type(data).__module__.startswith(CLASS_PACKAGE):
+            raise TypeError(f"cannot capture {type(data).__qualname__}")
+        fields = tuple(vars(data)) if hasattr(data, "__dict__") else ()
+        class_index = self._class_index(buffer, type(data), fields)
+        for field in fields:
+            self._write_value(buffer, payload, getattr(data, field))
+        return class_index
+
+    def _class_index(self, buffer: bytearray, cls: type, fields: tuple[str, ...]) -> int:
+        key = (cls, fields)
+        index = self._classes.get(key)
+        if index is None:
+            index = self._classes[key] = len(self._classes)
+            description = json.dumps({"class": f"{cls.__module__}:{cls.__qualname__}", "fields": fields}).encode()
+            buffer.append(RECORD_CLASS)
+            buffer += CLASS_HEADER.pack(index, len(description))
+            buffer += description
+        return index
+
+    def _write_value(self, buffer: bytearray, payload: bytearray, value: Any) -> None:
+        if isinstance(value, Enum) and isinstance(value.value, int) and type(value).__module__.startswith(CLASS_PACKAGE):
+            payload.append(VALUE_ENUM)
+            _write_varint(payload, self._class_index(buffer, type(value), ()))
+            _write_varint(payload, value.value)
+            return
+        if type(value) is int:
+            try:
+                encoded = bytearray()
+                _write_varint(encoded, value)
+            except OverflowError:
+                pass
+            else:
+                payload.append(VALUE_INT)
+                payload += encoded
+                return
+        if type(value) is str:
+            encoded = value.encode()
+            payload.append(VALUE_STR)
+        elif isinstance(value, (bytes, bytearray)):
+            encoded = bytes(value)
+            payload.append(VALUE_BYTES)
+        elif hasattr(value, "__dict__"):
+            # z.B. Bitmasken und WeekTime
+            fields = bytearray()
+            class_index = self._write_fields(buffer, fields, value)
+            payload.append(VALUE_OBJECT)
+            _write_varint(payload, class_index)
+            payload += fields
+            return
+        else:
+            raise TypeError(f"cannot capture {type(value).__qualname__} {value!r}")
+        _write_varint(payload, len(encoded))
+        payload += encoded
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            if self._backup_count > 0:
+                for number in range(self._backup_count - 1, 0, -1):
+                    source = f"{self._filename}.{number}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{self._filename}.{number + 1}")
+                os.replace(self._filename, f"{self._filename}.1")
+        self._file = open(self._filename, "wb")  # noqa: SIM115
+        self._file.write(FILE_MAGIC)
+        self._size = len(FILE_MAGIC)
+        self._classes.clear()
+
+    def close(self) -> None:
+        """Write the queued records and close the capture file."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def capture_files(filename: str) -> list[str]:
+    """The existing files of a capture, oldest rotation first."""
+    backups = []
+    number = 1
+    while os.path.exists(f"{filename}.{number}"):
+        backups.append(f"{filename}.{number}")
+        number += 1
+    files = list(reversed(backups))
+    if os.path.exists(filename):
+        files.append(filename)
+    return files
+
+
+def _load_class(description: dict[str, Any]) -> type:
+    module_name, class_name = description["class"].split(":")
+    if not module_name.startswith(CLASS_PACKAGE):
+        raise ValueError(f"capture contains foreign class {description['class']}")
+    cls: Any = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        cls = getattr(cls, name)
+    return cls
+
+
+def _read_object(data: bytes, offset: int, classes: dict[int, tuple[type, list[str]]], class_index: int) -> tuple[Any, int]:
+    cls, fields = classes[class_index]
+    values = {}
+    for field in fields:
+        value_type = data[offset]
+        offset += 1
+        if value_type == VALUE_INT:
+            values[field], offset = _read_varint(data, offset)
+        elif value_type == VALUE_ENUM:
+            enum_index, offset = _read_varint(data, offset)
+            value, offset = _read_varint(data, offset)
+            values[field] = classes[enum_index][0](value)
+        elif value_type == VALUE_OBJECT:
+            object_index, offset = _read_varint(data, offset)
+            values[field], offset = _read_object(data, offset, classes, object_index)
+        elif value_type in (VALUE_STR, VALUE_BYTES):
+            size, offset = _read_varint(data, offset)
+            raw = data[offset:offset + size]
+            offset += size
+            values[field] = raw.decode() if value_type == VALUE_STR else bytearray(raw)
+        else:
+            raise ValueError(f"unknown value type {value_type}")
+    result = cls.__new__(cls)
+    result.__dict__.update(values)
+    return result, offset
+
+
+def read_capture(filename: str) -> Iterator[CaptureRecord]:
+    """Read the records of a capture file, only pyhausbus classes are loaded."""
+    with open(filename, "rb") as file:
+        data = file.read()
+    if not data.startswith(FILE_MAGIC):
+        raise ValueError(f"{filename} is no Haus-Bus capture")
+
+    classes: dict[int, tuple[type, list[str]]] = {}
+    offset = len(FILE_MAGIC)
+    while offset < len(data):
+        record_type = data[offset]
+        offset += 1
+        if record_type == RECORD_CLASS:
+            index, length = CLASS_HEADER.unpack_from(data, offset)
+            offset += CLASS_HEADER.size
+            description = json.loads(data[offset:offset + length])
+            offset += length
+            classes[index] = (_load_class(description), description["fields"])
+        elif record_type == RECORD_MESSAGE:
+            timestamp, sent, sender, receiver, class_index, length = MESSAGE_HEADER.unpack_from(data, offset)
+            offset += MESSAGE_HEADER.size
+            end = offset + length
+            message_data, _ = _read_object(data, offset, classes, class_index)
+            offset = end
+            yield CaptureRecord(timestamp, bool(sent), BusDataMessage(sender, receiver, message_data))
+        else:
+            raise ValueError(f"unknown record {record_type} in {filename}")
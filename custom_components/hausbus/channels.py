@@ -0,0 +1,52 @@
+"""Mapping of the pyhausbus channel classes to the platforms of their entities."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.const import Platform
+from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory
+
+# Name der pyhausbus-Klasse -> Plattformen der Entities, ohne Plattformen oder Proxies zu importieren.
+# Jedes Plattform-Modul hat ein CHANNEL_ENTITIES (Name der pyhausbus-Klasse -> Entity-Klasse) und meldet
+# es beim Setup mit register_platform_add_channel_callback im Gateway an. Das Gateway legt für einen
+# Channel die Entity der ersten Plattform hier an (bei Tastern zusätzlich die Event-Entity), die Klassen
+# in CHANNEL_ENTITIES müssen deshalb zu diesen Einträgen passen.
+CHANNEL_PLATFORMS: dict[str, tuple[Platform, ...]] = {
+    "Dimmer": (Platform.LIGHT,),
+    "Led": (Platform.LIGHT,),
+    "LogicalButton": (Platform.LIGHT,),
+    "RGBDimmer": (Platform.LIGHT,),
+    "Schalter": (Platform.SWITCH,),
+    "Rollladen": (Platform.COVER,),
+    "Temperatursensor": (Platform.SENSOR,),
+    "Helligkeitssensor": (Platform.SENSOR,),
+    "Feuchtesensor": (Platform.SENSOR,),
+    "AnalogEingang": (Platform.SENSOR,),
+    "PowerMeter": (Platform.SENSOR,),
+    "RFIDReader": (Platform.SENSOR,),
+    # Binärsensor und Event-Entity für jeden Eingang
+    "Taster": (Platform.BINARY_SENSOR, Platform.EVENT),
+}
+
+# immer geladen für den Discovery-Button und die Bus-Statistik
+BASE_PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.SENSOR]
+
+
+def channel_platforms(class_name: str, name: str, leistungs_regler: bool) -> tuple[Platform, ...]:
+    """Platforms of the entities of a channel, the first one for the channel entity. Empty if no entity is created."""
+    # Schalter der Leistungsregler werden außer der Modul-LED als Zahl gesteuert
+    if leistungs_regler and class_name == "Schalter" and "Rote Modul LED" not in name:
+        return (Platform.NUMBER,)
+    return CHANNEL_PLATFORMS.get(class_name, ())
+
+
+def platforms_from_cache(devices: dict[str, dict[str, Any]]) -> set[Platform]:
+    """Platforms needed for the channels of the cached topology."""
+    platforms: set[Platform] = set()
+    for entry in devices.values():
+        for class_id, _instance_id, name in entry["channels"]:
+            class_name = ProxyFactory.getBusClassNameForClass(class_id).rsplit(".", 1)[-1]
+            platforms.update(channel_platforms(class_name, name, entry["special_type"] == 1))
+    return platforms
+
@@ -17,12 +17,10 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from .const import CONF_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_TIMEOUT, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
-DEVICE_SEARCH_TIMEOUT = 5
-
 STEP_USER_SCHEMA = vol.Schema({})
 
 
@@ -31,7 +29,7 @@ class ConfigFlow(IBusDataListener, config_entries.ConfigFlow, domain=DOMAIN):  #
 
     def __init__(self) -> None:
         """Initialize the config flow."""
-        self._found_device = False
+        self._found_device = asyncio.Event()
         self._search_task: asyncio.Task | None = None
         self.home_server = HomeServer()
         self.home_server.addBusEventListener(self)
@@ -90,14 +88,9 @@ class ConfigFlow(IBusDataListener, config_entries.ConfigFlow, domain=DOMAIN):  #
     async def _async_wait_for_device(self) -> None:
         """Start searching for devices and wait until at least one device was found or timeout is reached."""
         self.hass.async_add_executor_job(self.home_server.searchDevices)
-        # wait for up to 5 seconds to find devices
-        await asyncio.wait_for(self._check_device_found(), DEVICE_SEARCH_TIMEOUT)
-
-    async def _check_device_found(self) -> bool:
-        """Check if a device was found periodically."""
-        while not self._found_device:
-            await asyncio.sleep(0.1)  # Poll every 0.1 seconds
-        return True
+        # wait until the first module ID is received
+        timeout = self.hass.data.get(DOMAIN, {}).get("options", {}).get(CONF_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_TIMEOUT)
+        await asyncio.wait_for(self._found_device.wait(), timeout)
 
     def busDataReceived(self, busDataMessage: BusDataMessage) -> None:
         """Handle Haus-Bus messages."""
@@ -110,4 +103,5 @@ class ConfigFlow(IBusDataListener, config_entries.ConfigFlow, domain=DOMAIN):  #
 
         if isinstance(data, ModuleId):
             # module ID of a Haus-Bus device was received
-            self._found_device = True
\ No newline at end of file
+            if self.hass is not None and not self._found_device.is_set():
+                self.hass.loop.call_soon_threadsafe(self._found_device.set)
\ No newline at end of file
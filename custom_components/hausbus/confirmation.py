@@ -0,0 +1,87 @@
+"""Commands that wait for the event confirming them on the bus."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+
+from pyhausbus.HausBusUtils import getDeviceId
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """A sent command that waits for one of its confirming events."""
+
+    replies: tuple[str, ...]
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future[float] = field(init=False)
+    sent: float | None = None
+
+    def __post_init__(self) -> None:
+        self.future = self.loop.create_future()
+
+
+class HausbusConfirmations:
+    """Sends commands and measures the time until the channel reports the matching event.
+
+    An event only confirms a command that was already handed to the bus, the time is measured
+    from sending the frame to receiving the event. Every result, also a missing confirmation,
+    is recorded per device with record(device_id, seconds or None).
+    """
+
+    def __init__(self, submit: Callable[[Callable[[], None]], Any], record: Callable[[int, float | None], None]) -> None:
+        """Set up the confirmations, submit hands a bus call to the sender."""
+        self._submit = submit
+        self._record = record
+        self._lock = threading.Lock()
+        self._waiters: dict[int, list[_Waiter]] = {}
+
+    async def async_send(self, object_id: int, replies: tuple[str, ...], send: Callable[[], None], timeout: float) -> float:
+        """Send a bus call and return the round-trip time in seconds, raises TimeoutError without confirmation."""
+        waiter = _Waiter(replies, asyncio.get_running_loop())
+        with self._lock:
+            self._waiters.setdefault(object_id, []).append(waiter)
+
+        def send_and_mark() -> None:
+            waiter.sent = time.monotonic()
+            send()
+
+        try:
+            self._submit(send_and_mark)
+            return await asyncio.wait_for(waiter.future, timeout)
+        except TimeoutError:
+            self._record(getDeviceId(object_id), None)
+            raise
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(object_id, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(object_id, None)
+
+    def reply_received(self, object_id: int, data: Any) -> None:
+        """Confirm the waiting commands of a channel with a received event, called from the receive thread."""
+        if object_id not in self._waiters:
+            return
+        now = time.monotonic()
+        reply = type(data).__name__
+        with self._lock:
+            waiters = self._waiters.get(object_id, [])
+            confirmed = [waiter for waiter in waiters if waiter.sent is not None and reply in waiter.replies]
+            for waiter in confirmed:
+                waiters.remove(waiter)
+
+        for waiter in confirmed:
+            round_trip = now - waiter.sent
+            self._record(getDeviceId(object_id), round_trip)
+            waiter.loop.call_soon_threadsafe(_resolve, waiter.future, round_trip)
+
+
+def _resolve(future: asyncio.Future[float], round_trip: float) -> None:
+    if not future.done():
+        future.set_result(round_trip)
@@ -4,3 +4,50 @@ from __future__ import annotations
 
 DOMAIN = "hausbus"
 ATTR_ON_STATE = "on_state"
+
+# hass.data[DOMAIN]-Schlüssel für den Index HA-Device-ID -> Entity-IDs der Haus-Bus Entities
+DEVICE_ENTITIES = "device_entities"
+BUS_TRANSPORT = "transport"
+
+# Optionen aus configuration.yaml
+CONF_REQUEST_RATE = "request_rate"
+CONF_REQUESTS_PER_DEVICE = "requests_per_device"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_REQUEST_RETRIES = "request_retries"
+CONF_CONFIGURATION_TIMEOUT = "configuration_timeout"
+CONF_DISCOVERY_TIMEOUT = "discovery_timeout"
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+CONF_BUS_TRACE = "bus_trace"
+CONF_BUS_CAPTURE = "bus_capture"
+CONF_COMMAND_QUEUE_SIZE = "command_queue_size"
+CONF_TRANSPORT = "transport"
+CONF_ENERGY_INTERVAL = "energy_interval"
+CONF_PROBE_AFTER = "probe_after"
+CONF_UNAVAILABLE_AFTER = "unavailable_after"
+CONF_INTERPOLATION_INTERVAL = "interpolation_interval"
+CONF_OPTIMISTIC = "optimistic"
+CONF_CONFIRMATION_TIMEOUT = "confirmation_timeout"
+CONF_MAX_BYTES = "max_bytes"
+CONF_BACKUP_COUNT = "backup_count"
+
+DEFAULT_REQUEST_RATE = 20.0
+DEFAULT_REQUESTS_PER_DEVICE = 2
+DEFAULT_REQUEST_TIMEOUT = 2.0
+DEFAULT_REQUEST_RETRIES = 2
+DEFAULT_CONFIGURATION_TIMEOUT = 5.0
+DEFAULT_DISCOVERY_TIMEOUT = 5.0
+DEFAULT_STATE_WRITE_INTERVAL = 0.05
+DEFAULT_COMMAND_QUEUE_SIZE = 256
+DEFAULT_ENERGY_INTERVAL = 60.0
+DEFAULT_PROBE_AFTER = 300.0
+DEFAULT_UNAVAILABLE_AFTER = 360.0
+DEFAULT_INTERPOLATION_INTERVAL = 1.0
+DEFAULT_OPTIMISTIC = False
+DEFAULT_CONFIRMATION_TIMEOUT = 5.0
+TRANSPORT_THREAD = "thread"
+TRANSPORT_ASYNCIO = "asyncio"
+DEFAULT_TRANSPORT = TRANSPORT_THREAD
+DEFAULT_BUS_TRACE_FILENAME = "hausbus_trace.log"
+DEFAULT_BUS_TRACE_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BUS_TRACE_BACKUP_COUNT = 3
+DEFAULT_BUS_CAPTURE_FILENAME = "hausbus_capture.bin"
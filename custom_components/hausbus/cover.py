@@ -15,14 +15,17 @@ from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.Configuration impor
 from homeassistant.helpers import entity_platform
 from homeassistant.components.cover import DOMAIN as COVER_DOMAIN, CoverEntity, CoverEntityFeature, CoverDeviceClass
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.exceptions import HomeAssistantError
 
 import voluptuous as vol
 
+from .const import CONF_INTERPOLATION_INTERVAL, DEFAULT_INTERPOLATION_INTERVAL
 from .device import HausbusDevice
 from .entity import HausbusEntity
+from .interpolation import HausbusInterpolation
+from .schemas import SERVICE_SCHEMAS
 
 if TYPE_CHECKING:
     from . import HausbusConfigEntry
@@ -40,9 +43,9 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
 
     platform.async_register_entity_service(
         "cover_toggle",
-        {
-        },
+        SERVICE_SCHEMAS["cover_toggle"],
         "async_cover_toggle",
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     platform.async_register_entity_service(
@@ -55,12 +58,11 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
         "async_cover_set_configuration",
     )
 
-    async def async_add_cover(channel: HausbusEntity) -> None:
-        """Add cover entity."""
-        if isinstance(channel, HausbusCover):
-            async_add_entities([channel])
+    async def async_add_cover(channels: list[HausbusEntity]) -> None:
+        """Add cover entities."""
+        async_add_entities([channel for channel in channels if isinstance(channel, HausbusCover)])
 
-    gateway.register_platform_add_channel_callback(async_add_cover, COVER_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_cover, COVER_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusCover(HausbusEntity, CoverEntity):
@@ -77,6 +79,9 @@ class HausbusCover(HausbusEntity, CoverEntity):
         self._is_opening: bool | None = None
         self._is_closing: bool | None = None
         self._attr_unit_of_measurement = "%"
+        # Position während der Fahrt aus den Fahrzeiten schätzen
+        self._interpolation = HausbusInterpolation(self._publish_estimate)
+        self._requested_position: int | None = None
 
     @property
     def current_cover_position(self) -> int | None:
@@ -102,23 +107,23 @@ class HausbusCover(HausbusEntity, CoverEntity):
 
     async def async_open_cover(self, **kwargs):
         """Opens the cover."""
-        LOGGER.debug(f"async_open_cover")
-        self._channel.start(EDirection.TO_OPEN)
+        LOGGER.debug("async_open_cover")
+        self.send_command(self._channel.start, EDirection.TO_OPEN)
 
     async def async_close_cover(self, **kwargs):
         """Closes the cover."""
-        LOGGER.debug(f"async_close_cover")
-        self._channel.start(EDirection.TO_CLOSE)
+        LOGGER.debug("async_close_cover")
+        self.send_command(self._channel.start, EDirection.TO_CLOSE)
 
     async def async_stop_cover(self, **kwargs):
         """Stops the actual cover movevent."""
-        LOGGER.debug(f"async_stop_cover")
-        self._channel.stop()
+        LOGGER.debug("async_stop_cover")
+        self.send_command(self._channel.stop)
 
     async def async_set_cover_position(self, **kwargs):
         """Moves cover to the given position."""
         position = kwargs.get("position")
-        LOGGER.debug(f"async_set_cover_position position {position}")
+        LOGGER.debug("async_set_cover_position position %s", position)
 
         if position is None:
             return
@@ -127,7 +132,8 @@ class HausbusCover(HausbusEntity, CoverEntity):
         if position < 0:
             position = 0
 
-        self._channel.moveToPosition(100 - position)
+        self._requested_position = position
+        self.send_command(self._channel.moveToPosition, 100 - position)
 
     def handle_event(self, data: Any) -> None:
         """Handle haus-bus cover events."""
@@ -140,40 +146,75 @@ class HausbusCover(HausbusEntity, CoverEntity):
               self._is_opening = False
               self._is_closing = True
             else:
-              LOGGER.debug(f"unexpected direction {direction}")
+              LOGGER.debug("unexpected direction %s", direction)
+            self._start_interpolation(direction)
             self.schedule_update_ha_state()
         elif isinstance(data, EvClosed):
+            self._interpolation.stop()
             self._is_opening = False
             self._is_closing = False
             self._position = 100 - data.getPosition()
             self.schedule_update_ha_state()
         elif isinstance(data, EvOpen):
+            self._interpolation.stop()
             self._is_opening = False
             self._is_closing = False
             self._position = 100
             self.schedule_update_ha_state()
         elif isinstance(data, Status):
+            self._interpolation.stop()
             self._position = 100 - data.getPosition()
             self.schedule_update_ha_state()
         elif isinstance(data, Configuration):
-            self._configuration = data
+            self.set_configuration(data)
             self._attr_extra_state_attributes["close_time"] = data.getCloseTime()
             self._attr_extra_state_attributes["open_time"] = data.getOpenTime()
             self._attr_extra_state_attributes["invert_direction"] = data.getOptions().isInvertDirection()
 
-    async def async_cover_toggle(self):
+    def _start_interpolation(self, direction: EDirection) -> None:
+        """Estimates the position from the travel times of the configuration until the cover reports it."""
+        self._interpolation.stop()
+        requested_position = self._requested_position
+        self._requested_position = None
+        if self._position is None or not self._configuration or self.hass is None:
+            return
+
+        if direction is EDirection.TO_OPEN:
+            target, travel_time = 100, self._configuration.getOpenTime()
+        elif direction is EDirection.TO_CLOSE:
+            target, travel_time = 0, self._configuration.getCloseTime()
+        else:
+            return
+        # bei moveToPosition hält der Rollladen an der angeforderten Position
+        if requested_position is not None and 0 < (requested_position - self._position) * (target - self._position):
+            target = requested_position
+
+        interval = self.gateway.options.get(CONF_INTERPOLATION_INTERVAL, DEFAULT_INTERPOLATION_INTERVAL)
+        self._interpolation.start(self.hass, interval, self._position, target, 100 / travel_time if travel_time else 0)
+
+    @callback
+    def _publish_estimate(self, value: float) -> None:
+        position = round(value)
+        if position != self._position:
+            self._position = position
+            self.async_write_ha_state()
+
+    async def async_cover_toggle(self, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Starts the cover in the opposite direction than last time"""
-        LOGGER.debug(f"async_cover_toggle")
-        self._channel.start(EDirection.TOGGLE)
+        LOGGER.debug("async_cover_toggle")
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvStart",), self._channel.start, EDirection.TOGGLE)
 
     async def async_cover_set_configuration(self, close_time:int, open_time:int, invert_direction:bool):
         """Set cover configuration."""
-        LOGGER.debug(f"async_cover_set_configuration close_time {close_time}, open_time {open_time}, invert_direction {invert_direction}")
+        LOGGER.debug("async_cover_set_configuration close_time %s, open_time %s, invert_direction %s", close_time, open_time, invert_direction)
         
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
 
         options = self._configuration.getOptions()
         options.setInvertDirection(invert_direction)
-        self._channel.setConfiguration(close_time, open_time, options)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, close_time, open_time, options)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Rollladen": HausbusCover}
@@ -33,7 +33,7 @@ class HausbusDevice:
         self.hass_device_entry_id = None
         self.special_type = 0
 
-        LOGGER.debug(f"new device {self.name}")
+        LOGGER.debug("new device %s", self.name)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -50,10 +50,16 @@ class HausbusDevice:
     def set_config(self, configuration: Configuration) -> None:
         """Sets electronic version to generate model_id and module name."""
 
-        self.fcke = configuration.getFCKE()
-        self.special_type = configuration.getStartupDelay()
+        LOGGER.debug("configuration = %s", configuration)
+        self.set_config_values(configuration.getFCKE(), configuration.getStartupDelay())
 
-        LOGGER.debug(f"fcke {self.fcke}, special_type {self.special_type}, isSpecialType {self.is_special_type()}, configuration = {configuration}")
+    def set_config_values(self, fcke: int, special_type: int) -> None:
+        """Sets electronic version and special type, e.g. from the topology cache."""
+
+        self.fcke = fcke
+        self.special_type = special_type
+
+        LOGGER.debug("fcke %s, special_type %s, isSpecialType %s", self.fcke, self.special_type, self.is_special_type())
 
         if not self.is_special_type():
           self.set_model_id(Templates.get_instance().getModuleName(self.firmware_id, self.fcke))
@@ -61,10 +67,10 @@ class HausbusDevice:
     def set_model_id(self, model_id:str) -> bool:
 
         if self.model_id != model_id:
-          LOGGER.debug(f"old model_id: {self.model_id}, new model_id: {model_id}")
+          LOGGER.debug("old model_id: %s, new model_id: %s", self.model_id, model_id)
           self.model_id = model_id
           self.name = f"{self.model_id} {self.device_id}"
-          LOGGER.debug(f"new name {self.name}")
+          LOGGER.debug("new name %s", self.name)
           return True
 
         return False
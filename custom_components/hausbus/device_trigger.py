@@ -1,7 +1,7 @@
 """ Defines device_trigger of the haus-bus integration """
 
 from typing import Any, Callable, Awaitable
-from homeassistant.core import HomeAssistant, CALLBACK_TYPE
+from homeassistant.core import Event, HomeAssistant, CALLBACK_TYPE, callback
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 import voluptuous as vol
@@ -16,6 +16,8 @@ DOMAIN = "hausbus"
 
 TRIGGER_TYPES = ["button_pressed", "button_released", "button_clicked", "button_double_clicked", "button_hold_start", "button_hold_end"]
 
+TRIGGER_INDEX = "trigger_index"
+
 TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
     {
         vol.Required("type"): vol.In(TRIGGER_TYPES),
@@ -37,7 +39,7 @@ async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[s
     if not isinstance(inputs, list) or not all(isinstance(i, str) for i in inputs):
       return []
 
-    LOGGER.debug(f"Device {device_id} report inputs: {inputs}")
+    LOGGER.debug("Device %s report inputs: %s", device_id, inputs)
 
     return [
         {
@@ -60,32 +62,62 @@ async def async_validate_trigger_config(hass: HomeAssistant, config: ConfigType)
         raise HomeAssistantError(f"Invalid trigger config: {err}") from err
 
 
+class HausbusTriggerIndex:
+    """Single listener for hausbus_button_event that only calls the automations attached to (device_id, type, subtype)."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Set up an empty index."""
+        self.hass = hass
+        self._actions: dict[tuple[str, str, str], list[Callable[[dict[str, Any]], Awaitable[None]]]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_attach(self, key: tuple[str, str, str], action: Callable[[dict[str, Any]], Awaitable[None]]) -> CALLBACK_TYPE:
+        """Add an automation action to the index and return the callback to remove it."""
+        self._actions.setdefault(key, []).append(action)
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(f"{DOMAIN}_button_event", self._async_handle_event)
+
+        @callback
+        def async_detach() -> None:
+            actions = self._actions.get(key, [])
+            if action in actions:
+                actions.remove(action)
+                if not actions:
+                    del self._actions[key]
+            # ohne Trigger wird auch der Listener nicht mehr gebraucht
+            if not self._actions and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return async_detach
+
+    @callback
+    def _async_handle_event(self, event: Event) -> None:
+        key = (event.data.get("device_id"), event.data.get("type"), event.data.get("subtype"))
+        actions = self._actions.get(key)
+        if not actions:
+            return
+
+        trigger = {"platform": "device", "domain": DOMAIN, "device_id": key[0], "type": key[1], "subtype": key[2]}
+        for action in list(actions):
+            self.hass.async_create_task(_async_run_action(action, trigger))
+
+
+async def _async_run_action(action: Callable[[dict[str, Any]], Awaitable[None]], trigger: dict[str, Any]) -> None:
+    try:
+        result = action(trigger)
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as e:
+        LOGGER.error("Error executing Haus-Bus action: %s", e)
+
+
 async def async_attach_trigger(hass: HomeAssistant,config: ConfigType,action: Callable[[dict[str, Any]], Awaitable[None]],trigger_info: dict[str, Any]) -> CALLBACK_TYPE:
-    """Connects event listener and automation."""
+    """Connects the automation to the trigger index."""
 
-    event_type = f"{DOMAIN}_button_event"
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if TRIGGER_INDEX not in domain_data:
+        domain_data[TRIGGER_INDEX] = HausbusTriggerIndex(hass)
 
-    async def handle_event(event):
-        if event.data.get("device_id") != config["device_id"]:
-            return
-        if event.data.get("type") != config["type"]:
-            return
-        if event.data.get("subtype") != config["subtype"]:
-            return
-        
-        try:
-            result = action(
-                {
-                    "platform": "device",
-                    "domain": DOMAIN,
-                    "device_id": config["device_id"],
-                    "type": config["type"],
-                    "subtype": config["subtype"],
-                }
-            )
-            if asyncio.iscoroutine(result):
-                await result
-        except Exception as e:
-            LOGGER.error("Error executing Haus-Bus action: %s", e)
-
-    return hass.bus.async_listen(event_type, handle_event)
+    return domain_data[TRIGGER_INDEX].async_attach((config["device_id"], config["type"], config["subtype"]), action)
@@ -0,0 +1,35 @@
+"""Diagnostics support for Haus-Bus."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import BUS_TRANSPORT, DOMAIN, TRANSPORT_ASYNCIO, TRANSPORT_THREAD
+
+if TYPE_CHECKING:
+    from . import HausbusConfigEntry
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: HausbusConfigEntry) -> dict[str, Any]:
+    """Return diagnostics of the gateway: bus traffic, queue depths and known devices."""
+    gateway = config_entry.runtime_data.gateway
+
+    return {
+        "options": dict(gateway.options),
+        "transport": TRANSPORT_ASYNCIO if BUS_TRANSPORT in hass.data.get(DOMAIN, {}) else TRANSPORT_THREAD,
+        "queues": gateway.queue_depths(),
+        "statistics": gateway.statistics.as_dict(),
+        "devices": {
+            device_id: {
+                "model": device.model_id,
+                "name": device.name,
+                "software_version": device.software_version,
+                "channels": len(gateway.channels.get(device_id, {})),
+                "available": gateway.availability.is_available(int(device_id)),
+                "silent_for": gateway.availability.silent_for(int(device_id)),
+            }
+            for device_id, device in gateway.devices.items()
+        },
+    }
@@ -1,25 +1,54 @@
 """Representation of a Haus-Bus Entity."""
 
 from __future__ import annotations
-from typing import Any
+from collections.abc import Callable
+from functools import partial
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 import asyncio
-from homeassistant.core import callback
+import time
+from homeassistant.core import ServiceResponse, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from .device import HausbusDevice
-from homeassistant.helpers import entity_registry as er
+from .const import (
+    CONF_CONFIGURATION_TIMEOUT,
+    CONF_CONFIRMATION_TIMEOUT,
+    CONF_OPTIMISTIC,
+    DEFAULT_CONFIGURATION_TIMEOUT,
+    DEFAULT_CONFIRMATION_TIMEOUT,
+    DEFAULT_OPTIMISTIC,
+    DEVICE_ENTITIES,
+)
+from homeassistant.helpers import entity_registry as er, issue_registry as ir
 from pyhausbus.ABusFeature import ABusFeature
 from pyhausbus.ObjectId import ObjectId
 
+if TYPE_CHECKING:
+    from .gateway import HausbusGateway
+
 DOMAIN = "hausbus"
 
 import logging
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(eq=False)
+class _PendingConfirmation:
+    """An optimistic state waiting for the hardware, with the state to roll back to."""
+
+    previous: dict[str, Any]
+    expected: dict[str, Any]
+    # monotone Zeit, zu der der letzte Befehl auf den Bus ging, None solange er noch wartet
+    sent: float | None = None
+
+
 class HausbusEntity(Entity):
     """Common base class for Haus-Bus entities."""
 
     _attr_has_entity_name = True
+    # Zustände, die nur kurz anliegen (Taster, Events), dürfen nicht zusammengefasst werden
+    _coalesce_state_writes = True
 
     def __init__(self, channel: ABusFeature, device: HausbusDevice, alternativeType: str | None = None) -> None:
         """Set up channel."""
@@ -44,17 +73,180 @@ class HausbusEntity(Entity):
         self._attr_translation_key = self._type
         self._attr_extra_state_attributes = {}
         self._configuration = {}
+        self._configuration_future: asyncio.Future[None] | None = None
         self._special_type = device.special_type
+        # Gerät sendet noch, unabhängig davon, ob der Channel selbst noch vorhanden ist
+        self._device_available = True
+        # optimistisch gesetzter Zustand bis zur Bestätigung durch die Hardware
+        self._pending_confirmation: _PendingConfirmation | None = None
+        self._unconfirmed = False
+
+    @property
+    def gateway(self) -> HausbusGateway:
+        """The gateway this entity was added by."""
+        return self.platform.config_entry.runtime_data.gateway
+
+    def request_from_hardware(self, reply: str, send: Callable[[], None], reread: bool = False) -> None:
+        """Queue a read request in the gateway that is answered by a message of class reply.
+
+        reread=True reads back a value just written, a reply to an earlier identical request does not count.
+        """
+        self.gateway.request_scheduler.request(self._channel.getObjectId(), reply, send, reread)
+
+    def send_command(self, method: Callable[..., None], *args: Any) -> None:
+        """Submit a bus call of this channel to the command sender of the gateway."""
+        self.gateway.command_sender.submit(partial(method, *args))
+
+    async def async_send_confirmed(self, wait_for_confirmation: bool, replies: tuple[str, ...], method: Callable[..., None], *args: Any) -> ServiceResponse:
+        """Submit a bus call of a service; with wait_for_confirmation wait for one of the reply events of the channel.
+
+        Returns the measured round-trip time as service response.
+        """
+        if not wait_for_confirmation:
+          self.send_command(method, *args)
+          return None
+
+        timeout = self.gateway.options.get(CONF_CONFIRMATION_TIMEOUT, DEFAULT_CONFIRMATION_TIMEOUT)
+        try:
+          round_trip = await self.gateway.confirmations.async_send(self._channel.getObjectId(), replies, partial(method, *args), timeout)
+        except TimeoutError:
+          raise HomeAssistantError(f"{self.entity_id} did not confirm the command within {timeout} seconds") from None
+        return {"round_trip_time": round(round_trip * 1000, 1)}
+
+    def send_optimistic(self, state: dict[str, Any], method: Callable[..., None], *args: Any) -> None:
+        """Submit a bus call and, in optimistic mode, show the expected state (attribute name -> value) at once.
+
+        The state is rolled back if the hardware does not report this state within the confirmation timeout.
+        """
+        options = self.gateway.options
+        if not options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC) or self.hass is None:
+          self.send_command(method, *args)
+          return
+
+        # bei mehreren offenen Befehlen gilt der zuletzt von der Hardware gemeldete Zustand
+        previous = {attribute: getattr(self, attribute) for attribute in state}
+        expected = dict(state)
+        if self._pending_confirmation is not None:
+          previous.update(self._pending_confirmation.previous)
+          expected = {**self._pending_confirmation.expected, **state}
+        pending = self._pending_confirmation = _PendingConfirmation(previous, expected)
+        for attribute, value in state.items():
+          setattr(self, attribute, value)
+
+        def send_and_mark() -> None:
+          pending.sent = time.monotonic()
+          method(*args)
+
+        self.gateway.command_sender.submit(send_and_mark)
+        timeout = options.get(CONF_CONFIRMATION_TIMEOUT, DEFAULT_CONFIRMATION_TIMEOUT)
+        self.hass.loop.call_soon_threadsafe(self._async_await_confirmation, pending, timeout)
+
+    def confirm_state(self) -> None:
+        """Called after the hardware reported the state of the channel; ends a waiting optimistic state.
+
+        A different report received before the command went out (sent is None) is older than the command, it becomes
+        the state to roll back to and the optimistic state stays until the timeout. Every later report
+        is the real state, e.g. a wall button or a refused command.
+        """
+        pending = self._pending_confirmation
+        if pending is not None:
+          stale = pending.sent is None
+          if stale and any(getattr(self, attribute) != value for attribute, value in pending.expected.items()):
+            for attribute, value in pending.expected.items():
+              pending.previous[attribute] = getattr(self, attribute)
+              setattr(self, attribute, value)
+            return
+          self._pending_confirmation = None
+        if self._unconfirmed and self.hass is not None:
+          self._unconfirmed = False
+          self.hass.loop.call_soon_threadsafe(ir.async_delete_issue, self.hass, DOMAIN, self._unconfirmed_issue_id)
+
+    @property
+    def _unconfirmed_issue_id(self) -> str:
+        return f"unconfirmed_command_{self._attr_unique_id}"
+
+    @callback
+    def _async_await_confirmation(self, pending: _PendingConfirmation, timeout: float) -> None:
+        if self._pending_confirmation is not pending:
+          return
+        self.async_write_ha_state()
+        self.hass.loop.call_later(timeout, self._async_rollback, pending, timeout)
+
+    @callback
+    def _async_rollback(self, pending: _PendingConfirmation, timeout: float) -> None:
+        if self._pending_confirmation is not pending:
+          return
+        self._pending_confirmation = None
+        for attribute, value in pending.previous.items():
+          setattr(self, attribute, value)
+        LOGGER.warning("%s did not confirm the command within %s seconds, state rolled back", self.entity_id, timeout)
+        self.async_write_ha_state()
+        self._unconfirmed = True
+        ir.async_create_issue(
+          self.hass,
+          DOMAIN,
+          self._unconfirmed_issue_id,
+          is_fixable=False,
+          severity=ir.IssueSeverity.WARNING,
+          translation_key="unconfirmed_command",
+          translation_placeholders={"entity_id": self.entity_id, "timeout": str(timeout)},
+        )
 
     def get_hardware_status(self) -> None:
         """Request status and configuration of this channel from hardware."""
         if self._channel is not None:
-          self._channel.getStatus()
-          self._channel.getConfiguration()
+          self.request_from_hardware("Status", self._channel.getStatus)
+          self.request_from_hardware("Configuration", self._channel.getConfiguration)
 
     def handle_event(self, data: Any) -> None:
         """Handle haus-bus events."""
 
+    def create_additional_entities(self) -> list[HausbusEntity]:
+        """Further entities of the same platform that are fed by the messages of this channel."""
+        return []
+
+    def bulk_command(self, state: str, brightness: int | None) -> Callable[[], None] | None:
+        """Returns the bus call that switches this channel "on" or "off" (brightness in percent), None if not supported."""
+        return None
+
+    def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Let the gateway write the state with the next flush instead of waking up the loop for every message.
+
+        Entities without coalescing write every state, their state changes must run in the loop (see run_in_loop).
+        """
+        if force_refresh:
+          super().schedule_update_ha_state(force_refresh)
+        elif self.platform is None:
+          return
+        elif self._coalesce_state_writes:
+          self.gateway.schedule_state_write(self)
+        else:
+          self.hass.loop.call_soon_threadsafe(self.async_write_ha_state)
+
+    def run_in_loop(self, target: Callable[..., None], **kwargs: Any) -> None:
+        """Run a state change from the bus thread in the event loop, directly as long as the entity is not added."""
+        if self.platform is None:
+          target(**kwargs)
+        else:
+          self.hass.loop.call_soon_threadsafe(partial(target, **kwargs))
+
+    def set_available(self, available: bool) -> None:
+        """Marks the channel as (un)available, e.g. if it vanished from its device."""
+        if self._attr_available != available:
+          self._attr_available = available
+          self.schedule_update_ha_state()
+
+    def set_device_available(self, available: bool) -> None:
+        """Marks the device of the channel as (un)available, e.g. if it stopped sending."""
+        if self._device_available != available:
+          self._device_available = available
+          self.schedule_update_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Available if the channel exists and its device is alive."""
+        return self._attr_available and self._device_available
+
     @callback
     def async_update_callback(self, **kwargs: Any) -> None:
         """State push update."""
@@ -63,26 +255,53 @@ class HausbusEntity(Entity):
     async def async_added_to_hass(self):
       """Called when entity is added to HA."""
       registry = er.async_get(self.hass)
-      registry.async_update_entity_options(self.entity_id, DOMAIN, {"hausbus_type": self.__class__.__name__})
-      if self._special_type!=0:
-        registry.async_update_entity_options(self.entity_id, DOMAIN, {"hausbus_special_type": self._special_type})
-      LOGGER.debug(f"added_to_hass {self._attr_name} type {self.__class__.__name__} special_type {self._special_type}")
+      entry = registry.async_get(self.entity_id)
+      if entry is not None:
+        # vorhandene Optionen (z.B. Sensor-Filter) beibehalten
+        options = {**entry.options.get(DOMAIN, {}), "hausbus_type": self.__class__.__name__}
+        if self._special_type!=0:
+          options["hausbus_special_type"] = self._special_type
+        registry.async_update_entity_options(self.entity_id, DOMAIN, options)
+
+        if entry.device_id is not None:
+          self.hass.data.setdefault(DOMAIN, {}).setdefault(DEVICE_ENTITIES, {}).setdefault(entry.device_id, set()).add(self.entity_id)
+      LOGGER.debug("added_to_hass %s type %s special_type %s", self._attr_name, self.__class__.__name__, self._special_type)
+
+    def set_configuration(self, configuration: Any) -> None:
+      """Stores a received configuration and wakes up all waiting ensure_configuration calls."""
+      self._configuration = configuration
+      if self._configuration_future is not None and self.hass is not None:
+        self.hass.loop.call_soon_threadsafe(self._async_resolve_configuration)
+
+    @callback
+    def _async_resolve_configuration(self) -> None:
+      if self._configuration_future is not None and not self._configuration_future.done():
+        self._configuration_future.set_result(None)
+
+    async def async_will_remove_from_hass(self) -> None:
+      """Called when entity is removed from HA."""
+      if self.registry_entry is not None and self.registry_entry.device_id is not None:
+        self.hass.data.get(DOMAIN, {}).get(DEVICE_ENTITIES, {}).get(self.registry_entry.device_id, set()).discard(self.entity_id)
 
     async def ensure_configuration(self) -> bool:
       """ensures that the channel configuration is known"""
       if self._configuration:
         return True
 
-      self._channel.getConfiguration()
+      # alle gleichzeitigen Aufrufe warten auf dieselbe Future
+      if self._configuration_future is None or self._configuration_future.done():
+        self._configuration_future = self.hass.loop.create_future()
+      future = self._configuration_future
+      # die Konfiguration kann inzwischen vom Bus-Thread gesetzt worden sein
+      if self._configuration:
+        return True
 
+      self.request_from_hardware("Configuration", self._channel.getConfiguration)
+
+      timeout = self.gateway.options.get(CONF_CONFIGURATION_TIMEOUT, DEFAULT_CONFIGURATION_TIMEOUT)
       try:
-        await asyncio.wait_for(self._wait_for_configuration(), timeout=5.0)
+        await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
         return True
       except asyncio.TimeoutError:
         LOGGER.warning("Timeout while waiting for configuration of %s", self.entity_id)
         return False
-
-    async def _wait_for_configuration(self):
-      """waits until configuration is received"""
-      while not self._configuration:
-        await asyncio.sleep(0.1)
\ No newline at end of file
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.event import EventEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.components.event import DOMAIN as EVENT_DOMAIN, EventEntity
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_platform
 from homeassistant.exceptions import HomeAssistantError
@@ -34,6 +34,16 @@ if TYPE_CHECKING:
 import logging
 LOGGER = logging.getLogger(__name__)
 
+# Taster-Events und ihre Event-Typen, gemeinsam für Event-Entities und Device-Trigger
+EVENT_TYPES: dict[type, str] = {
+    EvCovered: "button_pressed",
+    EvFree: "button_released",
+    EvHoldStart: "button_hold_start",
+    EvHoldEnd: "button_hold_end",
+    EvClicked: "button_clicked",
+    EvDoubleClick: "button_double_clicked",
+}
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up an event entity from a config entry."""
@@ -42,16 +52,18 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
     # Services gelten für alle HausbusLight-Entities, die die jeweilige Funktion implementieren
     platform = entity_platform.async_get_current_platform()
 
-    async def async_add_event(channel: HausBusEvent) -> None:
-        """Add event entity."""
-        async_add_entities([channel])
+    async def async_add_event(channels: list[HausBusEvent]) -> None:
+        """Add event entities."""
+        async_add_entities(channels)
 
-    gateway.register_platform_add_channel_callback(async_add_event, "EVENTS")
+    gateway.register_platform_add_channel_callback(async_add_event, EVENT_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausBusEvent(HausbusEntity, EventEntity):
     """Representation of a haus-bus event entity."""
 
+    _coalesce_state_writes = False
+
     def __init__(self, channel: Taster, device: HausbusDevice) -> None:
         """Set up event."""
         super().__init__(channel, device, "event")
@@ -61,36 +73,38 @@ class HausBusEvent(HausbusEntity, EventEntity):
     def get_hardware_status(self) -> None:
         """Request status and configuration of this channel from hardware."""
         super().get_hardware_status()
-        self._channel.getEnabled()
+        self.request_from_hardware("Enabled", self._channel.getEnabled)
 
     #@staticmethod
     #def is_relevant_event(data) -> bool:
     #    """Check if a event is relevant for an event channel."""
     #    return isinstance(data, (EvCovered, EvFree, EvHoldStart, EvHoldEnd, EvClicked, EvDoubleClick, TasterConfiguration, Enabled))
 
+    @staticmethod
+    def event_type(data: Any) -> str | None:
+        """Event type of a taster message, None for other messages."""
+        return EVENT_TYPES.get(type(data))
+
+    @callback
+    def _async_trigger_event(self, event_type: str) -> None:
+        """Trigger and write one event, every event of a press is written on its own."""
+        self._trigger_event(event_type)
+        if self.platform is not None:
+          self.async_write_ha_state()
+
     def handle_event(self, data: Any) -> None:
         """Handle taster events from Haus-Bus."""
 
-        if isinstance(data, (EvCovered, EvFree, EvHoldStart, EvHoldEnd, EvClicked, EvDoubleClick)):
-          eventType = {
-              EvCovered: "button_pressed",
-              EvFree: "button_released",
-              EvHoldStart: "button_hold_start",
-              EvHoldEnd: "button_hold_end",
-              EvClicked: "button_clicked",
-              EvDoubleClick: "button_double_clicked",
-            }.get(type(data), "unknown")
-
-          if eventType != "unknown":
-            LOGGER.debug(f"sending event {eventType}")
-            self._trigger_event(eventType)
-            self.schedule_update_ha_state()
+        eventType = self.event_type(data)
+        if eventType is not None:
+          LOGGER.debug("sending event %s", eventType)
+          self.run_in_loop(self._async_trigger_event, event_type=eventType)
 
         elif isinstance(data, Enabled):
           self._attr_extra_state_attributes["eventActivationStatus"] = ("DISABLED" if data.getEnabled() == 0 else "ENABLED")
 
         elif isinstance(data, TasterConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             eventMask = data.getEventMask()
             self._attr_extra_state_attributes["hold_timeout"] = data.getHoldTimeout()
@@ -105,4 +119,7 @@ class HausBusEvent(HausbusEntity, EventEntity):
             self._attr_extra_state_attributes["inverted"] = data.getOptionMask().isInverted()
             self._attr_extra_state_attributes["debounce_time"] = data.getDebounceTime()
 
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Taster": HausBusEvent}
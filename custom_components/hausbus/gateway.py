@@ -3,8 +3,10 @@
 from __future__ import annotations
 import logging
 import asyncio
+import threading
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
+from functools import partial
 from typing import Any, cast
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 from pyhausbus.ABusFeature import ABusFeature
@@ -13,54 +15,54 @@ from pyhausbus.de.hausbus.homeassistant.proxy.Controller import Controller, EInd
 from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Configuration import Configuration
 from pyhausbus.Templates import Templates
 from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
-from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.RemoteObjects import RemoteObjects
 
 import re
-from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID
+from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID, getDeviceId
 from pyhausbus.HomeServer import HomeServer
 from pyhausbus.IBusDataListener import IBusDataListener
 from pyhausbus.ObjectId import ObjectId
 
-from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
-from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
-from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
-from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
-from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.const import CONF_FILENAME, Platform
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers import device_registry as dr
 
 from .device import HausbusDevice
 from .entity import HausbusEntity
-from .light import (Dimmer, HausbusDimmerLight, HausbusLedLight, HausbusBackLight, HausbusRGBDimmerLight, Led, LogicalButton, RGBDimmer)
-from .switch import HausbusSwitch, Schalter
-from .cover import HausbusCover, Rollladen
-# from .number import HausBusNumber
-from .sensor import HausbusTemperaturSensor, Temperatursensor, HausbusBrightnessSensor, Helligkeitssensor, HausbusHumiditySensor, Feuchtesensor, HausbusAnalogEingang, AnalogEingang
-from .binary_sensor import HausbusBinarySensor
-from .event import HausBusEvent
-from .button import HausbusButton
-
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvFree import EvFree
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvHoldStart import EvHoldStart
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvHoldEnd import EvHoldEnd
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvClicked import EvClicked
-from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvDoubleClick import EvDoubleClick
-from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
-from pyhausbus.de.hausbus.homeassistant.proxy.PowerMeter import PowerMeter
+from .topology import HausbusTopologyStore, devices_channels_from_cache, module_id_from_cache
+from .scheduler import HausbusRequestScheduler
+from .sender import HausbusCommandSender
+from .statistics import HausbusBusStatistics
+from .bus_trace import HausbusBusTrace
+from .capture import HausbusBusCapture
+from .availability import HausbusAvailability
+from .confirmation import HausbusConfirmations
+from .channels import channel_platforms, platforms_from_cache
+from .const import (
+    CONF_BACKUP_COUNT,
+    CONF_BUS_CAPTURE,
+    CONF_BUS_TRACE,
+    CONF_COMMAND_QUEUE_SIZE,
+    CONF_MAX_BYTES,
+    CONF_PROBE_AFTER,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_RETRIES,
+    CONF_REQUEST_TIMEOUT,
+    CONF_REQUESTS_PER_DEVICE,
+    CONF_STATE_WRITE_INTERVAL,
+    CONF_UNAVAILABLE_AFTER,
+    DEFAULT_COMMAND_QUEUE_SIZE,
+    DEFAULT_PROBE_AFTER,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_RETRIES,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_REQUESTS_PER_DEVICE,
+    DEFAULT_STATE_WRITE_INTERVAL,
+    DEFAULT_UNAVAILABLE_AFTER,
+)
 from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.EvData import EvData as RfidEvData
 
-from custom_components.hausbus.sensor import HausbusPowerMeter, \
-  HausbusRfidSensor
-from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory, \
-  temperatursensor
-from custom_components.hausbus.number import HausbusControl
-from pyhausbus.de.hausbus.homeassistant.proxy.RFIDReader import RFIDReader
-
 DOMAIN = "hausbus"
 
 LOGGER = logging.getLogger(__name__)
@@ -73,23 +75,122 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
         """Initialize the system."""
         self.hass = hass
         self.config_entry = config_entry
+        self.options: dict[str, Any] = hass.data.get(DOMAIN, {}).get("options", {})
         self.devices: dict[str, HausbusDevice] = {}
         self.channels: dict[str, dict[tuple[str, str], HausbusEntity]] = {}
         self.events: dict[int, HausBusEvent] = {}
+        # aus dem Template aufgelöste Namen der Eingänge für die Device-Trigger
+        self._trigger_subtypes: dict[int, str] = {}
+        # weitere Entities eines Channels, z.B. die Energie eines PowerMeters
+        self.additional_entities: dict[int, list[HausbusEntity]] = {}
+        # Dispatch-Tabelle: rohe Sender-ObjectId -> vorab aufgelöste Handler für busDataReceived
+        self._dispatch: dict[int, list[Callable[[Any], None]]] = {}
         self.home_server = HomeServer()
         self.home_server.addBusEventListener(self)
         self.home_server.addBusDeviceListener(self)
         self._new_channel_listeners: dict[
-            str, Callable[[HausbusEntity], Coroutine[Any, Any, None]]
+            str, Callable[[list[HausbusEntity]], Coroutine[Any, Any, None]]
         ] = {}
+        # von den Plattformen beim Setup angemeldet: Plattform -> pyhausbus-Klassenname -> Entity-Klasse
+        self._channel_entities: dict[str, dict[str, Callable[[ABusFeature, HausbusDevice], HausbusEntity]]] = {}
+        # Plattformen werden nur für vorhandene Channels geladen
+        self.platforms: set[Platform] = set()
+        self._platform_lock = asyncio.Lock()
         # to prevent duplicate channels but to allow to add channels even if it was registered before
         self.registered_channels: set[int] = set()
+        # Topologie-Cache für den schnellen Start und alle je Gerät angelegten Channels für den Abgleich
+        self.topology = HausbusTopologyStore(hass)
+        self._device_channel_ids: dict[str, set[int]] = {}
+        # alle Befehle der Entities über einen Thread senden
+        self.command_sender = HausbusCommandSender(self.options.get(CONF_COMMAND_QUEUE_SIZE, DEFAULT_COMMAND_QUEUE_SIZE))
+        self.command_sender.start()
+        # Status- und Konfigurationsabfragen gebremst auf den Bus schicken, in Reihenfolge mit den Befehlen
+        self.request_scheduler = HausbusRequestScheduler(
+            self.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+            self.options.get(CONF_REQUESTS_PER_DEVICE, DEFAULT_REQUESTS_PER_DEVICE),
+            self.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+            self.options.get(CONF_REQUEST_RETRIES, DEFAULT_REQUEST_RETRIES),
+            self.command_sender.submit,
+        )
+        self.request_scheduler.start()
+        # Zustandsänderungen aus dem Bus-Thread sammeln und einmal pro Takt schreiben
+        self._state_write_interval = self.options.get(CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL)
+        self._dirty_entities: set[HausbusEntity] = set()
+        self._dirty_lock = threading.Lock()
+        self._state_write_scheduled = False
+        self.statistics = HausbusBusStatistics()
+        # Befehle, die auf ihr bestätigendes Event warten (wait_for_confirmation)
+        self.confirmations = HausbusConfirmations(self.command_sender.submit, self.statistics.record_round_trip)
+        self.availability = HausbusAvailability(
+            self.options.get(CONF_PROBE_AFTER, DEFAULT_PROBE_AFTER),
+            self.options.get(CONF_UNAVAILABLE_AFTER, DEFAULT_UNAVAILABLE_AFTER),
+            self.set_device_available,
+        )
+        self.bus_trace: HausbusBusTrace | None = None
+        if (trace_options := self.options.get(CONF_BUS_TRACE)) is not None:
+            self.bus_trace = HausbusBusTrace(hass.config.path(trace_options[CONF_FILENAME]), trace_options[CONF_MAX_BYTES], trace_options[CONF_BACKUP_COUNT])
+        self.bus_capture: HausbusBusCapture | None = None
+        if (capture_options := self.options.get(CONF_BUS_CAPTURE)) is not None:
+            self.bus_capture = HausbusBusCapture(hass.config.path(capture_options[CONF_FILENAME]), capture_options[CONF_MAX_BYTES], capture_options[CONF_BACKUP_COUNT])
 
         # Listener für state_changed registrieren
         # self.hass.bus.async_listen("state_changed", self._state_changed_listener)
 
         # asyncio.run_coroutine_threadsafe(self.async_delete_devices(), self.hass.loop)
 
+    def shutdown(self) -> None:
+        """Stop the worker threads of the gateway."""
+        self.request_scheduler.stop()
+        self.command_sender.stop()
+        if self.bus_trace is not None:
+            self.bus_trace.close()
+        if self.bus_capture is not None:
+            self.bus_capture.close()
+
+    def send_burst(self, sends: list[Callable[[], None]], gap: float) -> None:
+        """Send pre-resolved bus calls back to back, optionally with a gap in seconds between them."""
+        for index, send in enumerate(sends):
+            if gap and index:
+                time.sleep(gap)
+            send()
+
+    def get_entity(self, entity_id: str) -> HausbusEntity | None:
+        """Find a channel entity by its entity_id."""
+        for device_channels in self.channels.values():
+            for entity in device_channels.values():
+                if entity.entity_id == entity_id:
+                    return entity
+        return None
+
+    def queue_depths(self) -> dict[str, int]:
+        """Current lengths of the internal queues."""
+        return {
+            "pending_commands": self.command_sender.pending,
+            "pending_requests": self.request_scheduler.pending,
+            "in_flight_requests": self.request_scheduler.in_flight,
+            "dirty_entities": len(self._dirty_entities),
+        }
+
+    def schedule_state_write(self, entity: HausbusEntity) -> None:
+        """Mark an entity as changed; its state is written with the next flush."""
+        with self._dirty_lock:
+            self._dirty_entities.add(entity)
+            if self._state_write_scheduled:
+                return
+            self._state_write_scheduled = True
+        self.hass.loop.call_soon_threadsafe(self.hass.loop.call_later, self._state_write_interval, self._async_write_dirty_states)
+
+    @callback
+    def _async_write_dirty_states(self) -> None:
+        """Write the states of all entities changed since the last flush."""
+        with self._dirty_lock:
+            entities = self._dirty_entities
+            self._dirty_entities = set()
+            self._state_write_scheduled = False
+        for entity in entities:
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
     async def createDiscoveryButtonAndStartDiscovery(self):
       """Creates a Button to manually start device discovery and starts discovery"""
 
@@ -97,11 +198,17 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
         LOGGER.debug("Search devices")
         self.hass.async_add_executor_job(self.home_server.searchDevices)
 
+      # beide Plattformen sind immer geladen
+      from .sensor import create_statistics_sensors
+
       self.addStandaloneButton("hausbus_discovery_button", "Discover Haus-Bus Devices", discovery_callback)
+      await self._new_channel_listeners[Platform.SENSOR](create_statistics_sensors(self))
       await discovery_callback()
 
     def addStandaloneButton(self, uniqueId: str, name:str, callback: Callable[[], Coroutine[Any, Any, None]]):
-      asyncio.run_coroutine_threadsafe(self._new_channel_listeners[BUTTON_DOMAIN](HausbusButton(uniqueId, name, callback)), self.hass.loop)
+      from .button import HausbusButton
+
+      asyncio.run_coroutine_threadsafe(self._new_channel_listeners[Platform.BUTTON]([HausbusButton(uniqueId, name, callback)]), self.hass.loop)
 
     def add_device(self, device_id: str, module: ModuleId) -> None:
         """Add a new Haus-Bus Device to this gateway's device list."""
@@ -135,6 +242,40 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
             return channels.get(channel_id)
         return None
 
+    def add_dispatch_handler(self, object_id: int, handler: Callable[[Any], None]) -> None:
+        """Register a handler that is called for every message sent by the given object id."""
+        # copy on write, because busDataReceived iterates the list in the receive thread
+        self._dispatch[object_id] = [*self._dispatch.get(object_id, ()), handler]
+
+    def remove_dispatch_handlers(self, device_id: str) -> None:
+        """Remove all dispatch handlers of a device."""
+        to_delete = [object_id for object_id in self._dispatch if str(ObjectId(object_id).getDeviceId()) == device_id]
+        for object_id in to_delete:
+            del self._dispatch[object_id]
+
+    async def async_setup_platforms(self, platforms: Iterable[Platform]) -> None:
+        """Forward the config entry to the platforms that are not set up yet."""
+        async with self._platform_lock:
+            missing = sorted(set(platforms) - self.platforms - self._new_channel_listeners.keys())
+            if missing:
+                LOGGER.debug("setting up platforms %s", missing)
+                await self.hass.config_entries.async_forward_entry_setups(self.config_entry, missing)
+                self.platforms.update(missing)
+
+    async def async_setup_device_platforms(self, platforms: set[Platform], *device: Any) -> None:
+        """Set up platforms that were missing for the channels of a device and create these channels."""
+        await self.async_setup_platforms(platforms)
+        self.setup_device(*device)
+
+    async def async_restore_topology(self) -> None:
+        """Create devices and entities from the topology cache without waiting for the discovery."""
+        devices = await self.topology.async_load()
+        await self.async_setup_platforms(platforms_from_cache(devices))
+        # die Proxy-Klassen werden per import_module geladen, das blockiert den Loop
+        channels = await self.hass.async_add_executor_job(devices_channels_from_cache, devices)
+        for device_id, entry in devices.items():
+            self.setup_device(int(device_id), entry["model_type"], module_id_from_cache(entry), entry["fcke"], entry["special_type"], channels[device_id])
+
     def newDeviceDetected(
         self,
         device_id: int,
@@ -155,14 +296,30 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
             channels,
         )
 
+        self.setup_device(device_id, model_type, module_id, configuration.getFCKE(), configuration.getStartupDelay(), channels, discovered=True)
+
+    def setup_device(
+        self,
+        device_id: int,
+        model_type: str,
+        module_id: ModuleId,
+        fcke: int,
+        special_type: int,
+        channels: list[ABusFeature],
+        discovered: bool = False,
+    ) -> None:
+        """Create a Haus-Bus device and its entities from a live discovery or from the topology cache."""
+
+        discovered_model_type = model_type
         self.add_device(str(device_id), module_id)
+        self.availability.add_device(device_id)
         device = self.devices.get(str(device_id))
-        device.set_config(configuration)
+        device.set_config_values(fcke, special_type)
         
         if device.is_leistungs_regler():
             model_type = "SSR Leistungsregler"
         elif device.is_rollo_modul():
-            nr_schalter = sum(1 for instance in channels if isinstance(instance, Schalter))
+            nr_schalter = sum(1 for instance in channels if type(instance).__name__ == "Schalter")
             if nr_schalter > 6:
                 model_type="8-fach Rollos"
             else:
@@ -183,158 +340,234 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
             hw_version=module_id.getName(),
         )
 
-        asyncio.run_coroutine_threadsafe(
-            self.async_register_device(device_id, device_info, device), self.hass.loop
-        ).result()
+        # Neue Entities je Plattform sammeln und in einem Loop-Durchlauf anmelden
+        new_entities: dict[str, list[HausbusEntity]] = {}
+        handlers: dict[int, list[Callable[[Any], None]]] = {}
+        status_entities: list[HausbusEntity] = []
 
         # Inputs merken für die Trigger
         inputs = []
 
+        # Plattformen, die für Channels dieses Geräts noch geladen werden müssen
+        missing_platforms: set[Platform] = set()
+
         for channel in channels:
             object_id = channel.getObjectId()
             if object_id not in self.registered_channels:
+                class_name = type(channel).__name__
+                platforms = channel_platforms(class_name, channel.getName(), device.is_leistungs_regler())
+                if any(platform not in self._channel_entities and platform not in self.platforms for platform in platforms):
+                  LOGGER.debug("platforms %s for %s not set up yet", platforms, channel)
+                  missing_platforms.update(platforms)
+                  continue
+
                 self.registered_channels.add(object_id)
 
                 new_entity = None
-
-                # Specials
-                if device.is_leistungs_regler() and isinstance(channel, Schalter) and "Rote Modul LED" not in channel.getName():
-                  new_entity = HausbusControl(channel, device)
-                  new_domain = NUMBER_DOMAIN
-                # LIGHT
-                elif isinstance(channel, Dimmer):
-                  new_entity = HausbusDimmerLight(channel, device)
-                  new_domain = LIGHT_DOMAIN
-                elif isinstance(channel, Led):
-                  new_entity = HausbusLedLight(channel, device)
-                  new_domain = LIGHT_DOMAIN
-                elif isinstance(channel, LogicalButton):
-                  new_entity = HausbusBackLight(channel, device)
-                  new_domain = LIGHT_DOMAIN
-                elif isinstance(channel, RGBDimmer):
-                  new_entity = HausbusRGBDimmerLight(channel, device)
-                  new_domain = LIGHT_DOMAIN
-                # SWITCH
-                elif isinstance(channel, Schalter):
-                  new_entity = HausbusSwitch(channel, device)
-                  new_domain = SWITCH_DOMAIN
-                # COVER
-                elif isinstance(channel, Rollladen):
-                  new_entity = HausbusCover(channel, device)
-                  new_domain = COVER_DOMAIN
-                # SENSOR
-                elif isinstance(channel, Temperatursensor):
-                  new_entity = HausbusTemperaturSensor(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, Helligkeitssensor):
-                  new_entity = HausbusBrightnessSensor(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, Feuchtesensor):
-                  new_entity = HausbusHumiditySensor(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, AnalogEingang):
-                  new_entity = HausbusAnalogEingang(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, PowerMeter):
-                  new_entity = HausbusPowerMeter(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, RFIDReader):
-                  new_entity = HausbusRfidSensor(channel, device)
-                  new_domain = SENSOR_DOMAIN
-                elif isinstance(channel, Taster):
-                  # if not instance.getName().startswith("Taster"):
-                  new_entity = HausbusBinarySensor(channel, device)
-                  new_domain = BINARY_SENSOR_DOMAIN
+                if platforms and class_name in self._channel_entities.get(platforms[0], {}):
+                  new_domain = platforms[0]
+                  new_entity = self._channel_entities[new_domain][class_name](channel, device)
                 else:
                   LOGGER.debug("no entity created for %s", channel)
                   
                 if new_entity is not None:  
-                    LOGGER.debug(f"new channel {new_entity.__class__.__name__} for {channel}") 
+                    LOGGER.debug("new channel %s for %s", new_entity.__class__.__name__, channel) 
                     channel_list = self.get_channel_list(ObjectId(object_id))
                     channel_list[self.get_channel_id(ObjectId(object_id))] = new_entity
-                    asyncio.run_coroutine_threadsafe(self._new_channel_listeners[new_domain](new_entity), self.hass.loop).result()
-                    LOGGER.debug("registered. Reading status...") 
-                    new_entity.get_hardware_status()
-                    
+                    new_entities.setdefault(new_domain, []).append(new_entity)
+                    status_entities.append(new_entity)
+                    channel_handlers = handlers.setdefault(object_id, [])
+
                     # additional EventEnties for all binary inputs and pushbuttons
-                    if isinstance(channel, Taster) and self.get_event_entity(channel.getObjectId()) is None:
-                      LOGGER.debug(f"create event channel for {channel}")
-                      new_channel = HausBusEvent(channel, device)
-                      self.events[channel.getObjectId()] = new_channel
-                      asyncio.run_coroutine_threadsafe(self._new_channel_listeners["EVENTS"](new_channel), self.hass.loop).result()
+                    event_entity_class = self._channel_entities.get(Platform.EVENT, {}).get(class_name) if Platform.EVENT in platforms else None
+                    if event_entity_class is not None and self.get_event_entity(object_id) is None:
+                      LOGGER.debug("create event channel for %s", channel)
+                      new_channel = event_entity_class(channel, device)
+                      self.events[object_id] = new_channel
+                      new_entities.setdefault(Platform.EVENT, []).append(new_channel)
+                      # Events und Device_trigger vor dem Channel melden
+                      channel_handlers.append(new_channel.handle_event)
+                      # Name des Eingangs möglichst schon hier auflösen, sonst beim ersten Event
+                      self.trigger_subtype(device, object_id)
+                      channel_handlers.append(partial(self.generate_device_trigger, device=device, object_id=object_id, event_type=new_channel.event_type))
+
+                    channel_handlers.append(new_entity.handle_event)
+                    # z.B. die Energie eines PowerMeters direkt aus den Leistungswerten integrieren
+                    additional_entities = new_entity.create_additional_entities()
+                    if additional_entities:
+                      self.additional_entities[object_id] = additional_entities
+                      new_entities[new_domain].extend(additional_entities)
+                      channel_handlers.extend(entity.handle_event for entity in additional_entities)
+                    if class_name == "RFIDReader":
+                      channel_handlers.append(partial(self.fire_rfid_event, device))
                     
                     # Bei allen Taster Instanzen die Events anlegen, weil da auch ein Taster angeschlossen sein kann
-                    if isinstance(channel, Taster):
+                    if Platform.EVENT in platforms:
                       inputs.append(channel.getName())
             else:
-              LOGGER.debug(f"already registered {channel}")      
+              LOGGER.debug("already registered %s", channel)      
+
+        device_channel_ids = self._device_channel_ids.setdefault(str(device_id), set())
+        device_channel_ids.update(handlers)
+
+        # Der Bus-Thread wartet nicht auf den Event-Loop
+        self.hass.create_task(
+            self.async_add_device_entities(device_id, device_info, device, new_entities, handlers, status_entities, inputs),
+            f"hausbus add device {device_id}",
+        )
+
+        if discovered:
+            self.hass.loop.call_soon_threadsafe(self.topology.async_update_device, device_id, discovered_model_type, module_id, fcke, special_type, channels)
+            self.hass.loop.call_soon_threadsafe(self.reconcile_channels, str(device_id), {channel.getObjectId() for channel in channels})
+
+        if missing_platforms:
+            # die übrigen Channels nach dem Laden der Plattformen anlegen
+            self.hass.create_task(
+                self.async_setup_device_platforms(missing_platforms, device_id, model_type, module_id, fcke, special_type, channels),
+                f"hausbus set up platforms for device {device_id}",
+            )
+
+    @callback
+    def reconcile_channels(self, device_id: str, live_object_ids: set[int]) -> None:
+        """Mark channels that vanished from a discovered device as unavailable and returning ones as available."""
+        for object_id in self._device_channel_ids.get(device_id, ()):
+            available = object_id in live_object_ids
+            if not available:
+                LOGGER.debug("channel %s vanished from device %s", ObjectId(object_id), device_id)
+            for entity in (self.get_channel(ObjectId(object_id)), self.get_event_entity(object_id), *self.additional_entities.get(object_id, ())):
+                if entity is not None:
+                    entity.set_available(available)
+
+    def device_entities(self, device_id: str) -> list[HausbusEntity]:
+        """All entities of a device: channels, their event entities and additional entities."""
+        entities: list[HausbusEntity] = []
+        for entity in self.channels.get(device_id, {}).values():
+            object_id = entity._channel.getObjectId()
+            entities.append(entity)
+            if (event := self.events.get(object_id)) is not None:
+                entities.append(event)
+            entities.extend(self.additional_entities.get(object_id, ()))
+        return entities
+
+    def set_device_available(self, device_id: int, available: bool) -> None:
+        """Flip the availability of all entities of a device, they are written with one flush."""
+        for entity in self.device_entities(str(device_id)):
+            entity.set_device_available(available)
+
+    @callback
+    def async_check_availability(self, now: Any = None) -> None:
+        """Ping the devices that are silent for too long, spread over the checks."""
+        for device_id in self.availability.check():
+            LOGGER.debug("probing silent device %s", device_id)
+            controller = Controller.create(device_id, 1)
+            self.request_scheduler.request(controller.getObjectId(), "Pong", controller.ping)
+
+    async def async_add_device_entities(
+        self,
+        device_id: int,
+        device_info: DeviceInfo,
+        device: HausbusDevice,
+        new_entities: dict[str, list[HausbusEntity]],
+        handlers: dict[int, list[Callable[[Any], None]]],
+        status_entities: list[HausbusEntity],
+        inputs: list[str],
+    ) -> None:
+        """Register a device and add all its new entities with one call per platform."""
+        await self.async_register_device(device_id, device_info, device)
+
+        for domain, entities in new_entities.items():
+            LOGGER.debug("adding %s %s entities for device %s", len(entities), domain, device_id)
+            await self._new_channel_listeners[domain](entities)
+
+        for object_id, channel_handlers in handlers.items():
+            for handler in channel_handlers:
+                self.add_dispatch_handler(object_id, handler)
 
         if inputs:
-            self.hass.data.setdefault(DOMAIN, {})
-            self.hass.data[DOMAIN][device.hass_device_entry_id] = {"inputs": inputs}
-            LOGGER.debug(f"{inputs} inputs angemeldet {device.hass_device_entry_id} deviceId {device_id}")
+            # aus dem Topologie-Cache wiederhergestellte Eingänge bleiben erhalten
+            known_inputs = self.hass.data.setdefault(DOMAIN, {}).setdefault(device.hass_device_entry_id, {"inputs": []})["inputs"]
+            known_inputs.extend(name for name in inputs if name not in known_inputs)
+            LOGGER.debug("%s inputs angemeldet %s deviceId %s", inputs, device.hass_device_entry_id, device_id)
 
+        LOGGER.debug("registered. Reading status...")
+        for entity in status_entities:
+            # deaktivierte Entitäten werden nicht zur Plattform hinzugefügt
+            if entity.platform is not None:
+              entity.get_hardware_status()
 
     def busDataReceived(self, busDataMessage: BusDataMessage) -> None:
         """Handle Haus-Bus messages."""
 
-        object_id = ObjectId(busDataMessage.getSenderObjectId())
+        start = time.perf_counter()
+        if self.bus_trace is not None:
+          self.bus_trace.trace(busDataMessage)
+        if self.bus_capture is not None:
+          self.bus_capture.capture(busDataMessage)
+        sender_object_id = busDataMessage.getSenderObjectId()
         data = busDataMessage.getData()
-        device_id = object_id.getDeviceId()
-        device = self.get_device(object_id)
-        
-        # ignore messages from own server
+        device_id = getDeviceId(sender_object_id)
+        if device_id == HOMESERVER_DEVICE_ID:
+          # eigene Befehle kommen per Broadcast zurück
+          self.statistics.record_sent(getDeviceId(busDataMessage.getReceiverObjectId()))
+          return
+        # andere interne Geräte des Servers ignorieren
         if self.home_server.is_internal_device(device_id):
-            return
-
-
-        LOGGER.debug(f"busDataReceived with data = {data} from {object_id}")
-
-        # Device_trigger und Events melden
-        eventEntity = self.get_event_entity(object_id.getValue())
-        if eventEntity is not None:
-          LOGGER.debug(f"eventEntity is {eventEntity}")
-          eventEntity.handle_event(data)
-          self.generate_device_trigger(data, device, object_id)
-
-        # Alles andere wird an die jeweiligen Channel weitergeleitet
-        channel = self.get_channel(object_id)
+          return
 
-        # all channel events
-        if isinstance(channel, HausbusEntity):
-          LOGGER.debug(f" handle_event {channel} {data}")
-          channel.handle_event(data)
-
-        if isinstance(channel, HausbusRfidSensor) and isinstance(data, RfidEvData):
-          LOGGER.debug(f" rfid data {channel} {data}")
-          self.hass.loop.call_soon_threadsafe(lambda: self.hass.bus.async_fire("hausbus_rfid_event", {"device_id": device.hass_device_entry_id, "tag": data.getTagID()}))
+        self.availability.seen(device_id)
+        self.request_scheduler.reply_received(sender_object_id, data)
+        self.confirmations.reply_received(sender_object_id, data)
 
+        # Nachrichten von internen Geräten haben nie Handler
+        handlers = self._dispatch.get(sender_object_id)
+        if handlers is None:
+          LOGGER.debug("kein zugehöriger channel für %s", sender_object_id)
         else:
-          LOGGER.debug(f"kein zugehöriger channel")
-
-
-    def generate_device_trigger(self, data, device: HausbusDevice, object_id: ObjectId):
-
-        eventType = {
-              EvCovered: "button_pressed",
-              EvFree: "button_released",
-              EvHoldStart: "button_hold_start",
-              EvHoldEnd: "button_hold_end",
-              EvClicked: "button_clicked",
-              EvDoubleClick: "button_double_clicked",
-            }.get(type(data), "unknown")
-
-        if eventType != "unknown":
-          name = Templates.get_instance().get_feature_name_from_template(device.firmware_id, device.fcke, object_id.getClassId(), object_id.getInstanceId())
-          if name is not None:
-            LOGGER.debug(f"sending trigger {eventType} name {name} hass_device_id {device.hass_device_entry_id}")
-            self.hass.loop.call_soon_threadsafe(lambda: self.hass.bus.async_fire("hausbus_button_event", {"device_id": device.hass_device_entry_id, "type": eventType, "subtype": name}))
-          else:
-            LOGGER.debug(f"unknown name for event {data}")
-
-    def register_platform_add_channel_callback(self, add_channel_callback: Callable[[HausbusEntity], Coroutine[Any, Any, None]], platform: str,) -> None:
-        """Register add channel callbacks."""
+          for handler in handlers:
+            handler(data)
+
+        self.statistics.record_received(device_id, type(data).__name__, handlers is None, time.perf_counter() - start)
+
+    def fire_rfid_event(self, device: HausbusDevice, data: Any) -> None:
+        """Fire a hausbus_rfid_event for read rfid tags."""
+        if isinstance(data, RfidEvData):
+          LOGGER.debug("rfid data %s", data)
+          self.hass.loop.call_soon_threadsafe(self.hass.bus.async_fire, "hausbus_rfid_event", {"device_id": device.hass_device_entry_id, "tag": data.getTagID()})
+
+    def trigger_subtype(self, device: HausbusDevice, object_id: int) -> str | None:
+        """Name of an input from the module template, cached once known.
+
+        pyhausbus loads the templates in a background thread and returns None until they are loaded,
+        so an unknown name is looked up again with the next event.
+        """
+        subtype = self._trigger_subtypes.get(object_id)
+        if subtype is None:
+          subtype = Templates.get_instance().get_feature_name_from_template(device.firmware_id, device.fcke, ObjectId(object_id).getClassId(), ObjectId(object_id).getInstanceId())
+          if subtype is not None:
+            self._trigger_subtypes[object_id] = subtype
+        return subtype
+
+    def generate_device_trigger(self, data, device: HausbusDevice, object_id: int, event_type: Callable[[Any], str | None]):
+        """Fire a hausbus_button_event for the device trigger of a pushbutton input."""
+        eventType = event_type(data)
+        if eventType is not None:
+          subtype = self.trigger_subtype(device, object_id)
+          if subtype is None:
+            LOGGER.debug("unknown trigger name for %s", object_id)
+            return
+          LOGGER.debug("sending trigger %s name %s hass_device_id %s", eventType, subtype, device.hass_device_entry_id)
+          self.hass.loop.call_soon_threadsafe(self.hass.bus.async_fire, "hausbus_button_event", {"device_id": device.hass_device_entry_id, "type": eventType, "subtype": subtype})
+
+    def register_platform_add_channel_callback(
+        self,
+        add_channel_callback: Callable[[list[HausbusEntity]], Coroutine[Any, Any, None]],
+        platform: str,
+        channel_entities: dict[str, Callable[[ABusFeature, HausbusDevice], HausbusEntity]] | None = None,
+    ) -> None:
+        """Register add channel callbacks and the entity classes the platform creates for pyhausbus channel classes."""
         self._new_channel_listeners[platform] = add_channel_callback
+        if channel_entities is not None:
+            self._channel_entities[platform] = channel_entities
 
     def extract_final_number(self, text: str) -> int | None:
       match = re.search(r"(\d+)$", text.strip())
@@ -343,12 +576,17 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
       return None
 
     async def removeDevice(self, device_id:str):
-      LOGGER.debug(f"delete device {device_id}")
+      LOGGER.debug("delete device %s", device_id)
       for objectIdStr, hausBusDevice in self.devices.items():
         if hausBusDevice.device_id == device_id:
-          LOGGER.debug(f"found delete device {hausBusDevice}")
+          LOGGER.debug("found delete device %s", hausBusDevice)
           del self.devices[device_id]
           del self.channels[device_id]
+          self.hass.data.get(DOMAIN, {}).pop(hausBusDevice.hass_device_entry_id, None)
+          self.remove_dispatch_handlers(device_id)
+          self._device_channel_ids.pop(device_id, None)
+          self.availability.remove_device(int(device_id))
+          self.topology.async_remove_device(device_id)
           to_delete = [
             objectIdInt
             for objectIdInt, hausBusEntity in self.events.items()
@@ -357,27 +595,31 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
 
           for key in to_delete:
             del self.events[key]
+          for key in [objectIdInt for objectIdInt in self.additional_entities if str(ObjectId(objectIdInt).getDeviceId()) == device_id]:
+            del self.additional_entities[key]
+          for key in [objectIdInt for objectIdInt in self._trigger_subtypes if str(ObjectId(objectIdInt).getDeviceId()) == device_id]:
+            del self._trigger_subtypes[key]
           return True
 
       return True
 
     def resetDevice(self, device_id:str):
-      LOGGER.debug(f"reset device {device_id}")
+      LOGGER.debug("reset device %s", device_id)
 
       for objectIdStr, hausBusDevice in self.devices.items():
         if hausBusDevice.hass_device_entry_id == device_id:
           device_id_int = int(hausBusDevice.device_id)
-          LOGGER.debug(f"resetting device {device_id_int}")
+          LOGGER.debug("resetting device %s", device_id_int)
           Controller.create(device_id_int, 1).reset()
           return True
         else:
-          LOGGER.debug(f"passt nicht {hausBusDevice.hass_device_entry_id}")
+          LOGGER.debug("passt nicht %s", hausBusDevice.hass_device_entry_id)
       return False
 
     async def async_register_device(self, device_id: int, device_info: DeviceInfo, hausBusDevice: HausbusDevice):
         """Creates a device in the hass registry."""
 
-        LOGGER.debug(f"register_device: {device_info}")
+        LOGGER.debug("register_device: %s", device_info)
 
         device_registry = dr.async_get(self.hass)
 
@@ -385,7 +627,7 @@ class HausbusGateway(IBusDataListener):  # type: ignore[misc]
             identifiers={(DOMAIN, str(device_id))},
             connections=None,
         )
-        LOGGER.debug(f"read device from registry: {device}")
+        LOGGER.debug("read device from registry: %s", device)
         
         device_entry = device_registry.async_get_or_create(
             config_entry_id=self.config_entry.entry_id,
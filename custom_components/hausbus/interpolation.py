@@ -0,0 +1,74 @@
+"""Local estimate of values that move with a known speed, e.g. cover positions and dimmer ramps."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+
+@dataclass(frozen=True)
+class Movement:
+    """A linear movement from value to target with speed units per second, started at a monotonic time."""
+
+    value: float
+    target: float
+    speed: float
+    started: float
+
+    def value_at(self, now: float) -> float:
+        """Estimated value at a monotonic time, it stops at the target."""
+        moved = self.speed * max(now - self.started, 0.0)
+        if self.target >= self.value:
+            return min(self.value + moved, self.target)
+        return max(self.value - moved, self.target)
+
+
+class HausbusInterpolation:
+    """Publishes the estimated value of a running movement periodically in the event loop, without bus traffic.
+
+    start() and stop() may be called from the receive thread. A hardware value ends the estimate
+    with stop(), every tick belongs to one movement, so a restarted movement never runs twice.
+    """
+
+    def __init__(self, publish: Callable[[float], None]) -> None:
+        """Set up the interpolation, publish is called in the event loop with every estimate."""
+        self._publish = publish
+        self._movement: Movement | None = None
+
+    @property
+    def running(self) -> bool:
+        """True while a movement is estimated."""
+        return self._movement is not None
+
+    def start(self, hass: HomeAssistant, interval: float, value: float, target: float, speed: float) -> None:
+        """Start estimating a movement and publish it every interval seconds (0 = not at all)."""
+        if interval <= 0 or speed <= 0:
+            self._movement = None
+            return
+        movement = Movement(value, target, speed, time.monotonic())
+        self._movement = movement
+        hass.loop.call_soon_threadsafe(hass.loop.call_later, interval, self._async_tick, hass, interval, movement)
+
+    def stop(self) -> None:
+        """Stop the estimate, e.g. because the hardware reported the real value."""
+        self._movement = None
+
+    def value(self) -> float | None:
+        """Current estimate, None if no movement is running."""
+        movement = self._movement
+        return None if movement is None else movement.value_at(time.monotonic())
+
+    @callback
+    def _async_tick(self, hass: HomeAssistant, interval: float, movement: Movement) -> None:
+        if self._movement is not movement:
+            return
+        value = movement.value_at(time.monotonic())
+        if value == movement.target:
+            # am Ziel bleibt der Schätzwert stehen, bis die Hardware den echten Wert meldet
+            self._movement = None
+        else:
+            hass.loop.call_later(interval, self._async_tick, hass, interval, movement)
+        self._publish(value)
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import colorsys
+from collections.abc import Callable
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 # from .number import HausBusNumber
@@ -11,6 +13,7 @@ from pyhausbus.de.hausbus.homeassistant.proxy.Dimmer import Dimmer
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOff import EvOff as DimmerEvOff
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.Configuration import Configuration as DimmerConfiguration
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOn import EvOn as DimmerEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvStart import EvStart as DimmerEvStart
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.Status import Status as DimmerStatus
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.params.EDirection import EDirection
 from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.params.EMode import EMode as DimmerMode
@@ -32,12 +35,14 @@ import voluptuous as vol
 
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import ATTR_ON_STATE
+from .const import ATTR_ON_STATE, CONF_INTERPOLATION_INTERVAL, DEFAULT_INTERPOLATION_INTERVAL
 from .device import HausbusDevice
 from .entity import HausbusEntity
+from .interpolation import HausbusInterpolation
+from .schemas import SERVICE_SCHEMAS
 
 import logging
 from pyhausbus.de.hausbus.homeassistant.proxy.LogicalButton import LogicalButton
@@ -58,22 +63,19 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
     # Dimmer Services
     platform.async_register_entity_service(
         "dimmer_set_brightness",
-        {
-            vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["dimmer_set_brightness"],
         "async_dimmer_set_brightness",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "dimmer_start_ramp",
-        {
-            vol.Required("direction", default="up"): vol.In(["up", "down", "toggle"])
-        },
+        SERVICE_SCHEMAS["dimmer_start_ramp"],
         "async_dimmer_start_ramp",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "dimmer_stop_ramp",
-        {},
+        SERVICE_SCHEMAS["dimmer_stop_ramp"],
         "async_dimmer_stop_ramp",
     )
     platform.async_register_entity_service(
@@ -91,13 +93,9 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
     # RGB Services
     platform.async_register_entity_service(
         "rgb_set_color",
-        {
-            vol.Required("brightness_red", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Required("brightness_green", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Required("brightness_blue", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["rgb_set_color"],
         "async_rgb_set_color",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "rgb_set_configuration",
@@ -110,35 +108,25 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
     # LED Services
     platform.async_register_entity_service(
         "led_off",
-        {
-            vol.Optional("offDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["led_off"],
         "async_led_off",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "led_on",
-        {
-            vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-            vol.Optional("onDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["led_on"],
         "async_led_on",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "led_blink",
-        {
-            vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Required("offTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
-            vol.Required("onTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
-            vol.Optional("quantity", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
-        },
+        SERVICE_SCHEMAS["led_blink"],
         "async_led_blink",
+        supports_response=SupportsResponse.OPTIONAL,
     )
     platform.async_register_entity_service(
         "led_set_min_brightness",
-        {
-            vol.Required("minBrightness", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-        },
+        SERVICE_SCHEMAS["led_set_min_brightness"],
         "async_led_set_min_brightness",
     )
     platform.async_register_entity_service(
@@ -150,13 +138,11 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
     )
 
     # Registriere Callback für neue Light-Entities
-    async def async_add_light(channel: HausbusEntity) -> None:
-        """Add light from Haus-Bus."""
-
-        if isinstance(channel, HausbusLight):
-            async_add_entities([channel])
+    async def async_add_light(channels: list[HausbusEntity]) -> None:
+        """Add lights from Haus-Bus."""
+        async_add_entities([channel for channel in channels if isinstance(channel, HausbusLight)])
 
-    gateway.register_platform_add_channel_callback(async_add_light, LIGHT_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_light, LIGHT_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusLight(HausbusEntity, LightEntity):
@@ -182,20 +168,36 @@ class HausbusLight(HausbusEntity, LightEntity):
       brightness = max(0, min(255, brightness))  # clamp
       return round(brightness * 100 / 255)
 
-    def set_light_color(self, red: int, green: int, blue: int) -> None:
-        """Set the color of a light channel."""
+    @staticmethod
+    def color_params(red: int, green: int, blue: int) -> dict[str, Any]:
+        """Light state of a color in percent per channel."""
         hue, saturation, value = colorsys.rgb_to_hsv(
             red / 100.0,
             green / 100.0,
             blue / 100.0,
         )
-        params = {
+        return {
             ATTR_ON_STATE: True,
             ATTR_BRIGHTNESS_PCT: value,
             ATTR_HS_COLOR: (round(hue * 360), round(saturation * 100)),
         }
+
+    def set_light_color(self, red: int, green: int, blue: int) -> None:
+        """Set the color of a light channel."""
+        params = self.color_params(red, green, blue)
         self.async_update_callback(**params)
 
+    def color_state(self, red: int, green: int, blue: int) -> dict[str, Any]:
+        """Optimistic state of a color command, as the hardware will report it."""
+        params = self.color_params(red, green, blue)
+        return {"_attr_is_on": True, "_attr_brightness": params[ATTR_BRIGHTNESS_PCT] * 255, "_attr_hs_color": params[ATTR_HS_COLOR]}
+
+    def brightness_state(self, brightness: int) -> dict[str, Any]:
+        """Optimistic state of a brightness command in percent, as the hardware will report it."""
+        if brightness == 0:
+            return {"_attr_is_on": False}
+        return {"_attr_is_on": True, "_attr_brightness": brightness / 100 * 255}
+
     def set_light_brightness(self, brightness: int) -> None:
         """Set the brightness of a light channel."""
         params = {ATTR_ON_STATE: True, ATTR_BRIGHTNESS_PCT: brightness / 100}
@@ -231,6 +233,7 @@ class HausbusLight(HausbusEntity, LightEntity):
             self._attr_hs_color = kwargs[ATTR_HS_COLOR]
             state_changed = True
 
+        self.confirm_state()
         if state_changed:
             self.schedule_update_ha_state()
 
@@ -247,22 +250,35 @@ class HausbusDimmerLight(HausbusLight):
         # Falls später mal Konfigurationen in der DeviceInfo einstellbar sein sollen, hier welche erstellen
         # Dann noch eine generische Funktion in HausBusEntitiy erstellen, die alle Konfigurationen Number, Select, usw liefert, damit sie vom Gateway registriert werden können
         # self._configTest = HausBusNumber(self)
+        # Helligkeit während einer Dimmrampe aus der Konfiguration schätzen
+        self._interpolation = HausbusInterpolation(self._publish_estimate)
+        self._ramp_direction: EDirection | None = None
 
     def turn_off(self, **kwargs: Any) -> None:
         """Turn off action."""
-        self._channel.setBrightness(0, 0)
+        self.send_optimistic({"_attr_is_on": False}, self._channel.setBrightness, 0, 0)
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on action."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
         brightness = round(brightness * 100 // 255)
-        self._channel.setBrightness(brightness, 0)
+        self.send_optimistic(self.brightness_state(brightness), self._channel.setBrightness, brightness, 0)
+
+    def bulk_command(self, state: str, brightness: int | None) -> Callable[[], None] | None:
+        """Bus call for hausbus.bulk_command."""
+        if state == "off":
+          return partial(self._channel.setBrightness, 0, 0)
+        return partial(self._channel.setBrightness, brightness if brightness is not None else round(self._attr_brightness * 100 // 255), 0)
 
     def handle_event(self, data: Any) -> None:
         """Handle dimmer events from HausBus."""
+        if isinstance(data, (DimmerEvOff, DimmerEvOn, DimmerStatus)):
+            self._interpolation.stop()
         super().handle_event(data)
         # dimmer event handling
-        if isinstance(data, DimmerEvOn):
+        if isinstance(data, DimmerEvStart):
+            self._start_interpolation(data.getDirection())
+        elif isinstance(data, DimmerEvOn):
             self.set_light_brightness(data.getBrightness())
         elif isinstance(data, DimmerStatus):
             if data.getBrightness() > 0:
@@ -270,7 +286,7 @@ class HausbusDimmerLight(HausbusLight):
             else:
                 self.light_turn_off()
         elif isinstance(data, DimmerConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             hbDimmerMode = {
               DimmerMode.DIMM_CR: "dim_trailing_edge",
@@ -283,40 +299,73 @@ class HausbusDimmerLight(HausbusLight):
             self._attr_extra_state_attributes["ramp_time"] = data.getDimmingTime()
             self._attr_extra_state_attributes["dimming_start_brightness"] = data.getDimmingRangeStart()
             self._attr_extra_state_attributes["dimming_end_brightness"] = data.getDimmingRangeEnd()
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
+
+    def _start_interpolation(self, direction: EDirection) -> None:
+        """Estimates the brightness of a ramp from the configuration until the dimmer reports it."""
+        self._interpolation.stop()
+        # bei TOGGLE läuft die Rampe entgegengesetzt zur letzten
+        if direction is EDirection.TOGGLE:
+            direction = EDirection.TO_DARK if self._ramp_direction is EDirection.TO_LIGHT else EDirection.TO_LIGHT
+        self._ramp_direction = direction
+        if not self._configuration or self.hass is None:
+            return
+
+        start = self._configuration.getDimmingRangeStart()
+        end = self._configuration.getDimmingRangeEnd()
+        # Rampenzeit in 50 ms für 0-100 %, nicht nur für den Dimmbereich
+        ramp_time = self._configuration.getDimmingTime() * 0.05
+        # ausgeschaltet beginnt die Rampe am Anfang des Dimmbereichs
+        value = self.ha_brightness_to_percent(self._attr_brightness) if self._attr_is_on else start
+        value = max(start, min(end, value))
+        target = end if direction is EDirection.TO_LIGHT else start
+
+        interval = self.gateway.options.get(CONF_INTERPOLATION_INTERVAL, DEFAULT_INTERPOLATION_INTERVAL)
+        self._interpolation.start(self.hass, interval, value, target, 100 / ramp_time if ramp_time else 0)
 
-    async def async_dimmer_set_brightness(self, brightness: int, duration:int):
+    @callback
+    def _publish_estimate(self, value: float) -> None:
+        brightness = self.percent_to_ha_brightness(value)
+        if not self._attr_is_on or brightness != self._attr_brightness:
+            self._attr_is_on = True
+            self._attr_brightness = brightness
+            self.async_write_ha_state()
+
+    async def async_dimmer_set_brightness(self, brightness: int, duration:int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Setzt eine Helligkeit mit einer Dauer."""
-        LOGGER.debug(f"async_dimmer_set_brightness brightness {brightness}, duration {duration}")
-        self._channel.setBrightness(brightness, duration)
+        LOGGER.debug("async_dimmer_set_brightness brightness %s, duration %s", brightness, duration)
+        replies = ("EvOn",) if brightness > 0 else ("EvOff",)
+        return await self.async_send_confirmed(wait_for_confirmation, replies, self._channel.setBrightness, brightness, duration)
 
-    async def async_dimmer_start_ramp(self, direction: str):
+    async def async_dimmer_start_ramp(self, direction: str, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Starte eine Dimmrampe hoch, runter oder entgegengesetzt der letzten Richtung."""
-        LOGGER.debug(f"async_dimmer_start_ramp direction {direction}")
-        if direction == "up":
-          self._channel.start(EDirection.TO_LIGHT)
-        elif direction == "down":
-          self._channel.start(EDirection.TO_DARK)
-        elif direction == "toggle":
-          self._channel.start(EDirection.TOGGLE)
+        LOGGER.debug("async_dimmer_start_ramp direction %s", direction)
+        hbDirection = {
+          "up": EDirection.TO_LIGHT,
+          "down": EDirection.TO_DARK,
+          "toggle": EDirection.TOGGLE,
+        }.get(direction)
+        if hbDirection is None:
+          return None
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvStart",), self._channel.start, hbDirection)
 
     async def async_dimmer_stop_ramp(self):
         """Stoppt eine aktive Dimmrampe."""
-        LOGGER.debug(f"async_dimmer_stop_ramp")
-        self._channel.stop()
+        LOGGER.debug("async_dimmer_stop_ramp")
+        self.send_command(self._channel.stop)
 
     @callback
     async def async_dimmer_set_configuration(self, mode: str, dimming_time:int, ramp_time:int, dimming_start_brightness:int, dimming_end_brightness:int):
         """Setzt die Konfiguration eines Dimmers."""
-        LOGGER.debug(f"async_dimmer_set_configuration mode {mode}, dimming_time {dimming_time}, ramp_time {ramp_time}, dimming_start_brightness {dimming_start_brightness}, dimming_end_brightness {dimming_end_brightness}")
+        LOGGER.debug("async_dimmer_set_configuration mode %s, dimming_time %s, ramp_time %s, dimming_start_brightness %s, dimming_end_brightness %s", mode, dimming_time, ramp_time, dimming_start_brightness, dimming_end_brightness)
 
         hbDimmerMode = {
            "dim_trailing_edge": DimmerMode.DIMM_CR,
            "dim_leading_edge": DimmerMode.DIMM_L,
            "switch_only": DimmerMode.SWITCH,
         }.get(mode, DimmerMode.SWITCH)
-        self._channel.setConfiguration(hbDimmerMode, dimming_time, ramp_time, dimming_start_brightness, dimming_end_brightness)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, hbDimmerMode, dimming_time, ramp_time, dimming_start_brightness, dimming_end_brightness)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
 
 
 class HausbusRGBDimmerLight(HausbusLight):
@@ -331,7 +380,7 @@ class HausbusRGBDimmerLight(HausbusLight):
 
     def turn_off(self, **kwargs: Any) -> None:
         """Turn off action."""
-        self._channel.setColor(0, 0, 0, 0)
+        self.send_optimistic({"_attr_is_on": False}, self._channel.setColor, 0, 0, 0, 0)
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on action."""
@@ -340,7 +389,16 @@ class HausbusRGBDimmerLight(HausbusLight):
 
         rgb = colorsys.hsv_to_rgb(h_s[0] / 360, h_s[1] / 100, brightness / 255)
         red, green, blue = tuple(round(x * 100) for x in rgb)
-        self._channel.setColor(red, green, blue, 0)
+        self.send_optimistic(self.color_state(red, green, blue), self._channel.setColor, red, green, blue, 0)
+
+    def bulk_command(self, state: str, brightness: int | None) -> Callable[[], None] | None:
+        """Bus call for hausbus.bulk_command, keeps the current color."""
+        if state == "off":
+          return partial(self._channel.setColor, 0, 0, 0, 0)
+        value = brightness / 100 if brightness is not None else self._attr_brightness / 255
+        rgb = colorsys.hsv_to_rgb(self._attr_hs_color[0] / 360, self._attr_hs_color[1] / 100, value)
+        red, green, blue = tuple(round(x * 100) for x in rgb)
+        return partial(self._channel.setColor, red, green, blue, 0)
 
     def handle_event(self, data: Any) -> None:
         """Handle RGB dimmer events from HausBus."""
@@ -366,23 +424,24 @@ class HausbusRGBDimmerLight(HausbusLight):
             else:
                 self.light_turn_off()
         elif isinstance(data, rGBConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes = {}
             self._attr_extra_state_attributes["dimming_time"] = data.getFadingTime()
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
-    async def async_rgb_set_color(self, brightness_red: int, brightness_green: int, brightness_blue: int, duration: int):
+    async def async_rgb_set_color(self, brightness_red: int, brightness_green: int, brightness_blue: int, duration: int, wait_for_confirmation: bool = False) -> ServiceResponse:
       """Schaltet ein RGB Licht mit einer Dauer ein."""
-      LOGGER.debug(f"async_rgb_set_color brightnessRed {brightness_red}, brightnessGreen {brightness_green}, brightnessBlue {brightness_blue}, duration {duration}")
-      self._channel.setColor(brightness_red, brightness_green, brightness_blue, duration)
+      LOGGER.debug("async_rgb_set_color brightnessRed %s, brightnessGreen %s, brightnessBlue %s, duration %s", brightness_red, brightness_green, brightness_blue, duration)
+      replies = ("EvOn",) if brightness_red or brightness_green or brightness_blue else ("EvOff",)
+      return await self.async_send_confirmed(wait_for_confirmation, replies, self._channel.setColor, brightness_red, brightness_green, brightness_blue, duration)
 
     @callback
     async def async_rgb_set_configuration(self, dimming_time:int):
         """Setzt die Konfiguration eines RGB Dimmers."""
-        LOGGER.debug(f"async_rgb_set_configuration dimming_time {dimming_time}")
-        self._channel.setConfiguration(dimming_time)
-        self._channel.getConfiguration()
+        LOGGER.debug("async_rgb_set_configuration dimming_time %s", dimming_time)
+        self.send_command(self._channel.setConfiguration, dimming_time)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
 
 
 class HausbusLedLight(HausbusLight):
@@ -397,13 +456,19 @@ class HausbusLedLight(HausbusLight):
 
     def turn_off(self, **kwargs: Any) -> None:
         """Turn off action."""
-        self._channel.off(0)
+        self.send_optimistic({"_attr_is_on": False}, self._channel.off, 0)
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on action."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
         brightness = round(brightness * 100 // 255)
-        self._channel.on(brightness, 0, 0)
+        self.send_optimistic(self.brightness_state(brightness), self._channel.on, brightness, 0, 0)
+
+    def bulk_command(self, state: str, brightness: int | None) -> Callable[[], None] | None:
+        """Bus call for hausbus.bulk_command."""
+        if state == "off":
+          return partial(self._channel.off, 0)
+        return partial(self._channel.on, brightness if brightness is not None else round(self._attr_brightness * 100 // 255), 0, 0)
 
     def handle_event(self, data: Any) -> None:
         """Handle led events from HausBus."""
@@ -417,43 +482,44 @@ class HausbusLedLight(HausbusLight):
             else:
                 self.light_turn_off()
         elif isinstance(data, LedConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
             # self._extra_state_attributes["dimm_offset"] = data.getDimmOffset()
             # self._extra_state_attributes["min_brightness"] = data.getMinBrightness()
             self._attr_extra_state_attributes["time_base"] = data.getTimeBase()
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     # SERVICES
-    async def async_led_off(self, offDelay: int):
+    async def async_led_off(self, offDelay: int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Schaltet eine LED mit Ausschaltverzögerung aus."""
-        LOGGER.debug(f"async_led_off offDelay {offDelay}")
-        self._channel.off(offDelay)
+        LOGGER.debug("async_led_off offDelay %s", offDelay)
+        # mit Verzögerung bestätigt die LED zuerst mit EvCmdDelay
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvOff", "EvCmdDelay"), self._channel.off, offDelay)
 
-    async def async_led_on(self, brightness: int, duration: int, onDelay: int):
+    async def async_led_on(self, brightness: int, duration: int, onDelay: int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Schaltet eine LED mit Einschaltverzögerung ein."""
-        LOGGER.debug(f"async_led_on brightness {brightness}, duration {duration}, onDelay {onDelay}")
-        self._channel.on(brightness, duration, onDelay)
+        LOGGER.debug("async_led_on brightness %s, duration %s, onDelay %s", brightness, duration, onDelay)
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvOn", "EvCmdDelay"), self._channel.on, brightness, duration, onDelay)
 
-    async def async_led_blink(self, brightness: int, offTime: int, onTime: int, quantity: int):
+    async def async_led_blink(self, brightness: int, offTime: int, onTime: int, quantity: int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Lässt eine LED blinken."""
-        LOGGER.debug(f"async_led_blink brightness {brightness} offTime {offTime} onTime {onTime} quantity {quantity}")
-        self._channel.blink(brightness, offTime, onTime, quantity)
+        LOGGER.debug("async_led_blink brightness %s offTime %s onTime %s quantity %s", brightness, offTime, onTime, quantity)
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvBlink",), self._channel.blink, brightness, offTime, onTime, quantity)
 
     async def async_led_set_min_brightness(self, minBrightness: int):
         """Setzt eine Mindesthelligkeit, die auch dann erhalten bleibt, wenn die LED per off ausgeschaltet wird."""
-        LOGGER.debug(f"async_led_min_brightness minBrightness {minBrightness}")
-        self._channel.setMinBrightness(minBrightness)
+        LOGGER.debug("async_led_min_brightness minBrightness %s", minBrightness)
+        self.send_command(self._channel.setMinBrightness, minBrightness)
 
     @callback
     async def async_led_set_configuration(self, time_base:int):
         """Setzt die Konfiguration einer Led."""
-        LOGGER.debug(f"async_led_set_configuration time_base {time_base}")
+        LOGGER.debug("async_led_set_configuration time_base %s", time_base)
         
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
 
-        self._channel.setConfiguration(self._configuration.getDimmOffset(), self._configuration.getMinBrightness(), time_base, self._configuration.getOptions())
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getDimmOffset(), self._configuration.getMinBrightness(), time_base, self._configuration.getOptions())
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
 
 
 class HausbusBackLight(HausbusLight):
@@ -468,12 +534,15 @@ class HausbusBackLight(HausbusLight):
 
     def turn_off(self, **kwargs: Any) -> None:
         """Turn off action."""
-        self._channel.setMinBrightness(0)
+        self.send_command(self._channel.setMinBrightness, 0)
         self.light_turn_off()
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on action."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
         brightness = round(brightness * 100 // 255)
-        self._channel.setMinBrightness(brightness)
+        self.send_command(self._channel.setMinBrightness, brightness)
         self.set_light_brightness(brightness)
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Dimmer": HausbusDimmerLight, "Led": HausbusLedLight, "LogicalButton": HausbusBackLight, "RGBDimmer": HausbusRGBDimmerLight}
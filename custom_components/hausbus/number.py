@@ -43,11 +43,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
     #    "async_switch_off",
     # )
 
-    async def async_add_number(channel: HausbusEntity) -> None:
-        """Add number from Haus-Bus."""
-        async_add_entities([channel])
+    async def async_add_number(channels: list[HausbusEntity]) -> None:
+        """Add numbers from Haus-Bus."""
+        async_add_entities(channels)
 
-    gateway.register_platform_add_channel_callback(async_add_number, NUMBER_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_number, NUMBER_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusControl(HausbusEntity, NumberEntity):
@@ -62,27 +62,27 @@ class HausbusControl(HausbusEntity, NumberEntity):
         self._attr_native_step = 1.0
         self._attr_native_unit_of_measurement = "%"
         self._value = 0
-        LOGGER.debug(f"HausBusControl created {self._attr_name}")
+        LOGGER.debug("HausBusControl created %s", self._attr_name)
 
     def set_native_value_internal(self, native_value: float):
       self._value = native_value
-      self.hass.loop.call_soon_threadsafe(self.async_write_ha_state)
+      self.schedule_update_ha_state()
 
     @property
     def native_value(self):
       return self._value
 
     async def async_set_native_value(self, value: float):
-        LOGGER.debug(f"async_set_native_value value {value}")
+        LOGGER.debug("async_set_native_value value %s", value)
         value = int(value)
-        self._channel.toggleByDuty(value, 0)
+        self.send_command(self._channel.toggleByDuty, value, 0)
         self.set_native_value_internal(value);
 
     def handle_event(self, data: Any) -> None:
         """Handle control events from Haus-Bus."""
         if isinstance(data, SchalterEvToggleByDuty):
           newValue = data.getDuty()
-          LOGGER.debug(f"new value by event {newValue}")
+          LOGGER.debug("new value by event %s", newValue)
           self.set_native_value_internal(newValue);
         elif isinstance(data, SchalterEvOn):
           self.set_native_value_internal(100);
@@ -96,7 +96,10 @@ class HausbusControl(HausbusEntity, NumberEntity):
                 if newValue > 100:
                   newValue = 100
 
-                LOGGER.debug(f"new value by event {newValue}")
+                LOGGER.debug("new value by event %s", newValue)
                 self.set_native_value_internal(newValue);
         elif isinstance(data, (SchalterEvOff)):
             self.set_native_value_internal(0);
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Schalter": HausbusControl}
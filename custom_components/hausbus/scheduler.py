@@ -0,0 +1,168 @@
+"""Paced scheduler for status and configuration reads of Haus-Bus channels."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any
+
+from pyhausbus.HausBusUtils import getDeviceId
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Request:
+    """A read request that waits for its reply."""
+
+    send: Callable[[], None]
+    attempts: int = 0
+    deadline: float = 0.0
+    # nach der Antwort noch einmal lesen, weil sie vor einem Schreibbefehl angefordert wurde
+    reread: bool = False
+
+
+class HausbusRequestScheduler(threading.Thread):
+    """Sends read requests with a global rate budget, a per device in-flight limit and retries.
+
+    A request is identified by the object id it is sent to and the class name of the expected
+    reply (e.g. "Status" for getStatus). Identical requests are only queued once, a reread
+    after a write is sent again once the reply of an identical request in flight arrived.
+    """
+
+    def __init__(self, rate: float, max_in_flight: int, timeout: float, retries: int, submit: Callable[[Callable[[], None]], Any] | None = None) -> None:
+        """Set up the scheduler, submit hands a request to the sender (default: send directly)."""
+        super().__init__(name="hausbus-request-scheduler", daemon=True)
+        self._submit = submit if submit is not None else lambda send: send()
+        self._interval = 1.0 / rate
+        self._max_in_flight = max_in_flight
+        self._timeout = timeout
+        self._retries = retries
+        self._condition = threading.Condition()
+        self._pending: OrderedDict[tuple[int, str], _Request] = OrderedDict()
+        # object id -> reply name -> request, damit busDataReceived mit einem dict.get auskommt
+        self._in_flight: dict[int, dict[str, _Request]] = {}
+        self._in_flight_per_device: dict[int, int] = {}
+        self._next_send = 0.0
+        self._running = True
+
+    @property
+    def pending(self) -> int:
+        """Number of requests waiting to be sent."""
+        return len(self._pending)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of sent requests waiting for their reply."""
+        return sum(self._in_flight_per_device.values())
+
+    def request(self, object_id: int, reply: str, send: Callable[[], None], reread: bool = False) -> None:
+        """Queue a read request that is answered by a message of class reply sent by object_id.
+
+        With reread the reply must be requested after this call, e.g. to read back a written configuration.
+        """
+        key = (object_id, reply)
+        with self._condition:
+            if key in self._pending:
+                LOGGER.debug("request %s for %s already pending", reply, object_id)
+                return
+            in_flight = self._in_flight.get(object_id, {}).get(reply)
+            if in_flight is not None:
+                # die Antwort auf die laufende Anfrage kann noch den alten Stand enthalten
+                in_flight.reread = in_flight.reread or reread
+                LOGGER.debug("request %s for %s already in flight", reply, object_id)
+                return
+            self._pending[key] = _Request(send)
+            self._condition.notify()
+
+    def reply_received(self, object_id: int, data: Any) -> None:
+        """Complete the in-flight request answered by a received message."""
+        if object_id not in self._in_flight:
+            return
+
+        with self._condition:
+            requests = self._in_flight.get(object_id)
+            reply = type(data).__name__
+            request = None if requests is None else requests.pop(reply, None)
+            if request is None:
+                return
+            if not requests:
+                del self._in_flight[object_id]
+            self._release(object_id)
+            if request.reread:
+                self._pending[(object_id, reply)] = _Request(request.send)
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def run(self) -> None:
+        """Send queued requests as the budget allows."""
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                wait = self._expire(now)
+                request = None
+                if now < self._next_send:
+                    wait = min(wait, self._next_send - now)
+                else:
+                    request = self._next_request(now)
+                if request is None:
+                    self._condition.wait(wait)
+                    continue
+                self._next_send = now + self._interval
+
+            try:
+                self._submit(request.send)
+            except Exception as err:  # noqa: BLE001
+                LOGGER.error("sending request failed: %s", err, exc_info=True)
+
+    def _next_request(self, now: float) -> _Request | None:
+        """Move the first pending request of a device below its in-flight limit to in-flight."""
+        for key in self._pending:
+            object_id, reply = key
+            device_id = getDeviceId(object_id)
+            if self._in_flight_per_device.get(device_id, 0) < self._max_in_flight:
+                request = self._pending.pop(key)
+                request.attempts += 1
+                request.deadline = now + self._timeout
+                self._in_flight.setdefault(object_id, {})[reply] = request
+                self._in_flight_per_device[device_id] = self._in_flight_per_device.get(device_id, 0) + 1
+                return request
+        return None
+
+    def _expire(self, now: float) -> float:
+        """Retry or drop unanswered requests and return the time until the next deadline."""
+        next_deadline = self._timeout
+        for object_id, requests in list(self._in_flight.items()):
+            for reply, request in list(requests.items()):
+                if request.deadline > now:
+                    next_deadline = min(next_deadline, request.deadline - now)
+                    continue
+
+                del requests[reply]
+                self._release(object_id)
+                if request.attempts <= self._retries:
+                    LOGGER.debug("no %s from %s, retry %s", reply, object_id, request.attempts)
+                    self._pending[(object_id, reply)] = request
+                    self._pending.move_to_end((object_id, reply), last=False)
+                else:
+                    LOGGER.warning("no %s received from %s after %s attempts", reply, object_id, request.attempts)
+            if not requests:
+                del self._in_flight[object_id]
+        return next_deadline
+
+    def _release(self, object_id: int) -> None:
+        device_id = getDeviceId(object_id)
+        self._in_flight_per_device[device_id] -= 1
+        if self._in_flight_per_device[device_id] == 0:
+            del self._in_flight_per_device[device_id]
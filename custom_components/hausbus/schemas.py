@@ -0,0 +1,85 @@
+"""Field schemas of the Haus-Bus services that are also offered as device actions."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+# optionales Feld der Befehls-Services, die auf das bestätigende Event des Moduls warten können
+WAIT_FOR_CONFIRMATION: dict[vol.Marker, object] = {
+    vol.Optional("wait_for_confirmation", default=False): vol.Boolean(),
+}
+
+# Service -> Felder, verwendet von async_register_entity_service und den Device-Actions
+SERVICE_SCHEMAS: dict[str, dict[vol.Marker, object]] = {
+    "dimmer_set_brightness": {
+        vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "dimmer_start_ramp": {
+        vol.Required("direction", default="up"): vol.In(["up", "down", "toggle"]),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "dimmer_stop_ramp": {},
+    "rgb_set_color": {
+        vol.Required("brightness_red", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Required("brightness_green", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Required("brightness_blue", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "led_off": {
+        vol.Optional("offDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "led_on": {
+        vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        vol.Optional("onDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "led_blink": {
+        vol.Required("brightness", default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Required("offTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
+        vol.Required("onTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
+        vol.Optional("quantity", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "led_set_min_brightness": {
+        vol.Required("minBrightness", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    },
+    "switch_off": {
+        vol.Required("offDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "switch_on": {
+        vol.Required("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        vol.Optional("onDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "switch_toggle": {
+        vol.Required("offTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
+        vol.Required("onTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
+        vol.Optional("quantity", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        **WAIT_FOR_CONFIRMATION,
+    },
+    "cover_toggle": {**WAIT_FOR_CONFIRMATION},
+    "push_button_configure_events": {
+        vol.Required("eventActivationStatus", default="ENABLED"): vol.In(["DISABLED", "ENABLED", "INVERT"]),
+        vol.Optional("disabled_duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    },
+}
+
+# Entity-Klasse -> Services, die als Device-Action angeboten werden
+DEVICE_ACTIONS: dict[str, tuple[str, ...]] = {
+    "HausbusDimmerLight": ("dimmer_set_brightness", "dimmer_start_ramp", "dimmer_stop_ramp"),
+    "HausbusRGBDimmerLight": ("rgb_set_color",),
+    "HausbusLedLight": ("led_off", "led_on", "led_blink", "led_set_min_brightness"),
+    "HausbusSwitch": ("switch_off", "switch_on", "switch_toggle"),
+    "HausbusCover": ("cover_toggle",),
+    "HausbusEvent": ("push_button_configure_events",),
+    "HausbusBinarySensor": ("push_button_configure_events",),
+}
+
+# Capability-Schemas werden nur einmal beim Import gebaut
+ACTION_SCHEMAS: dict[str, vol.Schema] = {service: vol.Schema(SERVICE_SCHEMAS[service]) for actions in DEVICE_ACTIONS.values() for service in actions}
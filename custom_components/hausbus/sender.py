@@ -0,0 +1,68 @@
+"""Outbound command sender of the Haus-Bus gateway."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future
+import logging
+import queue
+import threading
+
+from homeassistant.exceptions import HomeAssistantError
+
+LOGGER = logging.getLogger(__name__)
+
+
+class HausbusCommandSender(threading.Thread):
+    """Sends all entity commands from one worker thread in the order they were submitted.
+
+    pyhausbus sends synchronously on the socket, so neither the event loop nor the
+    executor pool wait for the network. A single thread also keeps the order of
+    commands to the same device.
+    """
+
+    def __init__(self, max_queue: int) -> None:
+        """Set up the sender with a bounded queue."""
+        super().__init__(name="hausbus-command-sender", daemon=True)
+        self._queue: queue.Queue[tuple[Callable[[], None], Future[None]] | None] = queue.Queue(max_queue)
+        self._running = True
+
+    @property
+    def pending(self) -> int:
+        """Number of commands waiting to be sent."""
+        return self._queue.qsize()
+
+    def submit(self, send: Callable[[], None]) -> Future[None]:
+        """Queue a bus call, the returned future is done after it was sent."""
+        future: Future[None] = Future()
+        try:
+            self._queue.put_nowait((send, future))
+        except queue.Full:
+            raise HomeAssistantError("Haus-Bus command queue is full") from None
+        return future
+
+    def stop(self) -> None:
+        """Stop the sender thread, queued commands are discarded."""
+        self._running = False
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def run(self) -> None:
+        """Send queued commands."""
+        while True:
+            item = self._queue.get()
+            if item is None or not self._running:
+                return
+
+            send, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                send()
+            except Exception as err:  # noqa: BLE001
+                LOGGER.error("sending command failed: %s", err, exc_info=True)
+                future.set_exception(err)
+            else:
+                future.set_result(None)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any, TYPE_CHECKING
 from pyhausbus.ABusFeature import ABusFeature
+from pyhausbus.ObjectId import ObjectId
 
 from pyhausbus.de.hausbus.homeassistant.proxy.Temperatursensor import Temperatursensor
 from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.EvStatus import EvStatus as TemperatursensorEvStatus
@@ -28,16 +30,20 @@ from pyhausbus.de.hausbus.homeassistant.proxy.analogEingang.data.Configuration i
 from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.EvData import EvData as RfidEvData
 from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.EvError import EvError as RfidEvError
 
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN, SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN, RestoreSensor, SensorEntity, SensorDeviceClass, SensorExtraStoredData, SensorStateClass
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_platform
-from datetime import datetime
+from homeassistant.helpers import entity_registry as er
+from datetime import datetime, timedelta
+import time
 
-from homeassistant.const import LIGHT_LUX, PERCENTAGE, UnitOfTemperature, UnitOfPower
+from homeassistant.const import LIGHT_LUX, PERCENTAGE, EntityCategory, UnitOfEnergy, UnitOfTemperature, UnitOfPower
 import voluptuous as vol
 
+from .const import CONF_ENERGY_INTERVAL, DEFAULT_ENERGY_INTERVAL, DOMAIN
 from .device import HausbusDevice
 from .entity import HausbusEntity
 
@@ -47,6 +53,7 @@ LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from . import HausbusConfigEntry
+    from .gateway import HausbusGateway
 
 
 async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry,async_add_entities: AddEntitiesCallback) -> None:
@@ -107,13 +114,23 @@ async def async_setup_entry(hass: HomeAssistant,config_entry: HausbusConfigEntry
       "async_analog_eingang_set_configuration",
     )
 
+    platform.async_register_entity_service(
+      "sensor_set_filter",
+      {
+        vol.Required("deadband", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Required("deadband_percent", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+        vol.Required("min_interval", default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+        vol.Required("heartbeat", default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+      },
+      "async_sensor_set_filter",
+    )
+
     # Registriere Callback für neue Sensor-Entities
-    async def async_add_sensor(channel: HausbusEntity) -> None:
-        """Add temperatur sensor from Haus-Bus."""
-        if isinstance(channel, HausbusSensor):
-            async_add_entities([channel])
+    async def async_add_sensor(channels: list[HausbusEntity]) -> None:
+        """Add sensors from Haus-Bus."""
+        async_add_entities([channel for channel in channels if isinstance(channel, (HausbusSensor, HausbusEnergySensor, HausbusStatisticsSensor))])
 
-    gateway.register_platform_add_channel_callback(async_add_sensor, SENSOR_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_sensor, SENSOR_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusSensor(HausbusEntity, SensorEntity):
@@ -126,6 +143,75 @@ class HausbusSensor(HausbusEntity, SensorEntity):
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_value = None
 
+        # Filter gegen unveränderte oder unwesentliche Messwerte, 0 = aus
+        self._deadband = 0.0
+        self._deadband_percent = 0.0
+        self._min_interval = 0.0
+        self._heartbeat = 0.0
+        self._last_published: float | None = None
+        self._last_publish_time = 0.0
+        self._pending_value: float | None = None
+
+    async def async_added_to_hass(self):
+      """Called when entity is added to HA."""
+      await super().async_added_to_hass()
+      entry = er.async_get(self.hass).async_get(self.entity_id)
+      if entry is not None:
+        self._apply_filter(entry.options.get(DOMAIN, {}).get("filter", {}))
+
+    def _apply_filter(self, options: dict[str, float]) -> None:
+      self._deadband = options.get("deadband", 0.0)
+      self._deadband_percent = options.get("deadband_percent", 0.0)
+      self._min_interval = options.get("min_interval", 0.0)
+      self._heartbeat = options.get("heartbeat", 0.0)
+
+    @callback
+    async def async_sensor_set_filter(self, deadband: float, deadband_percent: float, min_interval: float, heartbeat: float):
+        """Sets the host side filter of a sensor."""
+        LOGGER.debug("async_sensor_set_filter deadband %s, deadband_percent %s, min_interval %s, heartbeat %s", deadband, deadband_percent, min_interval, heartbeat)
+        options = {"deadband": deadband, "deadband_percent": deadband_percent, "min_interval": min_interval, "heartbeat": heartbeat}
+        self._apply_filter(options)
+
+        registry = er.async_get(self.hass)
+        entry = registry.async_get(self.entity_id)
+        if entry is not None:
+          registry.async_update_entity_options(self.entity_id, DOMAIN, {**entry.options.get(DOMAIN, {}), "filter": options})
+
+    def publish_value(self, value: float) -> None:
+        """Write a received value to the state machine unless it is filtered."""
+        now = time.monotonic()
+        elapsed = now - self._last_publish_time
+        heartbeat = self._last_published is not None and self._heartbeat and elapsed >= self._heartbeat
+        if self._last_published is not None and not heartbeat:
+          change = abs(value - self._last_published)
+          if change == 0 or change < self._deadband or change < abs(self._last_published) * self._deadband_percent / 100:
+            LOGGER.debug("%s: %s unterdrückt", self._attr_name, value)
+            self._pending_value = None
+            return
+
+          if elapsed < self._min_interval:
+            # wesentliche Änderung am Ende des Mindestabstands nachliefern
+            if self._pending_value is None and self.hass is not None:
+              self.hass.loop.call_soon_threadsafe(self.hass.loop.call_later, self._min_interval - elapsed, self._async_publish_pending)
+            self._pending_value = value
+            return
+
+        self._publish(value, now, bool(heartbeat))
+
+    def _publish(self, value: float, now: float, heartbeat: bool = False) -> None:
+        # HA verwirft sonst das Schreiben eines unveränderten Werts, der Heartbeat soll aber ankommen
+        self._attr_force_update = heartbeat
+        self._pending_value = None
+        self._last_published = value
+        self._last_publish_time = now
+        self._attr_native_value = value
+        self.schedule_update_ha_state()
+
+    @callback
+    def _async_publish_pending(self) -> None:
+      if self._pending_value is not None:
+        self._publish(self._pending_value, time.monotonic())
+
     @staticmethod
     def getTimeIntervalMapping(key):
         """Lookup-Funktion, die zu einem Internal Base und Value liefert oder zum Tupel den Value"""
@@ -151,7 +237,7 @@ class HausbusSensor(HausbusEntity, SensorEntity):
         if result == "Unknown":
           for front, (a, b) in mapping.items():
             produkt = a * b
-            LOGGER.debug(f"{key} {front}: {produkt}")
+            LOGGER.debug("%s %s: %s", key, front, produkt)
         return result
 
 class HausbusTemperaturSensor(HausbusSensor):
@@ -170,28 +256,27 @@ class HausbusTemperaturSensor(HausbusSensor):
         
         if isinstance(data, (TemperatursensorEvStatus,TemperatursensorStatus)):
           value = float(data.getCelsius()) + float(data.getCentiCelsius()) / 100
-          LOGGER.debug(f"Temperatur empfangen: {value} °C")
-          self._attr_native_value = value
-          self.schedule_update_ha_state() 
+          LOGGER.debug("Temperatur empfangen: %s °C", value)
+          self.publish_value(value)
         elif isinstance(data, TemperaturSensorConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes["correction"] = data.getCalibration()/10
             self._attr_extra_state_attributes["auto_event_diff"] = data.getHysteresis()/10
             self._attr_extra_state_attributes["manual_event_interval"] = HausbusSensor.getTimeIntervalMapping(data.getReportTimeBase()*data.getMaxReportTime())
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     async def async_temperatur_sensor_set_configuration(self, correction: float, auto_event_diff:float, manual_event_interval:str):
         """Setzt die Konfiguration eines Temperatursensors."""
-        LOGGER.debug(f"async_temperatur_sensor_set_configuration correction {correction}, auto_event_diff {auto_event_diff}, manual_event_interval {manual_event_interval}")
+        LOGGER.debug("async_temperatur_sensor_set_configuration correction %s, auto_event_diff %s, manual_event_interval %s", correction, auto_event_diff, manual_event_interval)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
         
         reportTimeBase, maxReportTime = HausbusSensor.getTimeIntervalMapping(manual_event_interval)
-        self._channel.setConfiguration(self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
 
 class HausbusPowerMeter(HausbusSensor):
     """Representation of a Haus-Bus PowerMeter."""
@@ -204,33 +289,108 @@ class HausbusPowerMeter(HausbusSensor):
         self._attr_device_class = SensorDeviceClass.POWER
         self._attr_native_value = None
 
+    def create_additional_entities(self) -> list[HausbusEntity]:
+        """The energy is integrated natively from the power values."""
+        return [HausbusEnergySensor(self._channel, self._device)]
+
     def handle_event(self, data: Any) -> None:
         """Handle PowerMeter events from Haus-Bus."""
         
         if isinstance(data, (PowerMeterEvStatus,PowerMeterStatus)):
           value = float(data.getPower()) + float(data.getCentiPower()) / 100
-          LOGGER.debug(f"Power empfangen: {value} kW")
-          self._attr_native_value = value
-          self.schedule_update_ha_state() 
+          LOGGER.debug("Power empfangen: %s kW", value)
+          self.publish_value(value)
         elif isinstance(data, PowerMeterConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes["correction"] = data.getCalibration()/10
             self._attr_extra_state_attributes["auto_event_diff"] = data.getHysteresis()/10
             self._attr_extra_state_attributes["manual_event_interval"] = HausbusSensor.getTimeIntervalMapping(data.getReportTimeBase()*data.getMaxReportTime())
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     async def async_power_meter_set_configuration(self, correction: float, auto_event_diff:float, manual_event_interval:str):
         """Setzt die Konfiguration eines LogicalButton."""
-        LOGGER.debug(f"async_power_meter_set_configuration correction {correction}, auto_event_diff {auto_event_diff}, manual_event_interval {manual_event_interval}")
+        LOGGER.debug("async_power_meter_set_configuration correction %s, auto_event_diff %s, manual_event_interval %s", correction, auto_event_diff, manual_event_interval)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
 
         reportTimeBase, maxReportTime = HausbusSensor.getTimeIntervalMapping(manual_event_interval)
-        self._channel.setConfiguration(self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
+
+
+class HausbusEnergySensor(HausbusEntity, RestoreSensor):
+    """Energy of a Haus-Bus PowerMeter, integrated from its power values."""
+
+    def __init__(self, channel: PowerMeter, device: HausbusDevice) -> None:
+        """Set up sensor."""
+        super().__init__(channel, device, "energy")
+
+        self._attr_name = f"{channel.getName()} Energy"
+        self._attr_unique_id = f"{self._device.device_id}-powermeter-energy-{ObjectId(channel.getObjectId()).getInstanceId()}"
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_native_value = None
+
+        self._energy = 0.0
+        self._last_power: float | None = None
+        self._last_time = 0.0
+
+    async def async_added_to_hass(self):
+      """Restores the energy and starts publishing it periodically."""
+      await super().async_added_to_hass()
+      last_data = await self.async_get_last_sensor_data()
+      if last_data is not None and last_data.native_value is not None:
+        self._energy += float(last_data.native_value)
+        self._attr_native_value = round(self._energy, 3)
+
+      interval = self.gateway.options.get(CONF_ENERGY_INTERVAL, DEFAULT_ENERGY_INTERVAL)
+      self.async_on_remove(async_track_time_interval(self.hass, self._async_publish, timedelta(seconds=interval)))
+
+    def get_hardware_status(self) -> None:
+        """the status is already requested by the power sensor of the channel"""
+        pass
+
+    def handle_event(self, data: Any) -> None:
+        """Integrates the power values of the PowerMeter, written only by the publish interval.
+
+        The meter only reports changes, so the last value holds until the next one (left Riemann sum).
+        """
+        if isinstance(data, (PowerMeterEvStatus, PowerMeterStatus)):
+          # Einspeisung wird nicht gezählt, total_increasing darf nicht fallen
+          power = max(float(data.getPower()) + float(data.getCentiPower()) / 100, 0.0)
+          now = time.monotonic()
+          if self._last_power is not None:
+            self._energy += self._last_power * (now - self._last_time) / 3600
+          self._last_power = power
+          self._last_time = now
+
+    def set_available(self, available: bool) -> None:
+        """Marks the channel as (un)available, no energy is integrated across the outage."""
+        super().set_available(available)
+        if not self.available:
+          self._last_power = None
+
+    def set_device_available(self, available: bool) -> None:
+        """Marks the device as (un)available, no energy is integrated across the outage."""
+        super().set_device_available(available)
+        if not self.available:
+          self._last_power = None
+
+    @callback
+    def _async_publish(self, now: datetime | None = None) -> None:
+      value = round(self._energy, 3)
+      if value != self._attr_native_value:
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+    @property
+    def extra_restore_state_data(self) -> SensorExtraStoredData:
+        """Stores the integrated energy, not only the last published value."""
+        return SensorExtraStoredData(self._energy, self._attr_native_unit_of_measurement)
 
 
 class HausbusBrightnessSensor(HausbusSensor):
@@ -249,28 +409,27 @@ class HausbusBrightnessSensor(HausbusSensor):
         
         if isinstance(data, (HelligkeitssensorEvStatus,HelligkeitssensorStatus)):
           value = float(data.getBrightness())
-          LOGGER.debug(f"Helligkeit empfangen: {value} lx")
-          self._attr_native_value = value
-          self.schedule_update_ha_state() 
+          LOGGER.debug("Helligkeit empfangen: %s lx", value)
+          self.publish_value(value)
         elif isinstance(data, HelligkeitsSensorConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes["correction"] = data.getCalibration()*10
             self._attr_extra_state_attributes["auto_event_diff"] = data.getHysteresis()*10
             self._attr_extra_state_attributes["manual_event_interval"] = HausbusSensor.getTimeIntervalMapping(data.getReportTimeBase()*data.getMaxReportTime())
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     async def async_brightness_sensor_set_configuration(self, correction: float, auto_event_diff:float, manual_event_interval:str):
         """Setzt die Konfiguration eines Helligkeitssensors."""
-        LOGGER.debug(f"async_brightness_sensor_set_configuration correction {correction}, auto_event_diff {auto_event_diff}, manual_event_interval {manual_event_interval}")
+        LOGGER.debug("async_brightness_sensor_set_configuration correction %s, auto_event_diff %s, manual_event_interval %s", correction, auto_event_diff, manual_event_interval)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
 
         reportTimeBase, maxReportTime = HausbusSensor.getTimeIntervalMapping(manual_event_interval)
-        self._channel.setConfiguration(self._configuration.getLowerThreshold(), self._configuration.getUpperThreshold(), reportTimeBase,1,maxReportTime, int(auto_event_diff/10),int(correction/10),0)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getLowerThreshold(), self._configuration.getUpperThreshold(), reportTimeBase,1,maxReportTime, int(auto_event_diff/10),int(correction/10),0)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
           
 
 class HausbusHumiditySensor(HausbusSensor):
@@ -289,28 +448,27 @@ class HausbusHumiditySensor(HausbusSensor):
         
         if isinstance(data, (FeuchtesensorEvStatus, FeuchtesensorStatus)):
           value = float(data.getRelativeHumidity()) + float(data.getCentiHumidity()) / 100
-          LOGGER.debug(f"Feuchtigkeit empfangen: {value} %")
-          self._attr_native_value = value
-          self.schedule_update_ha_state() 
+          LOGGER.debug("Feuchtigkeit empfangen: %s %%", value)
+          self.publish_value(value)
         elif isinstance(data, FeuchteSensorConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes["correction"] = data.getCalibration()/10
             self._attr_extra_state_attributes["auto_event_diff"] = data.getHysteresis()/10
             self._attr_extra_state_attributes["manual_event_interval"] = HausbusSensor.getTimeIntervalMapping(data.getReportTimeBase()*data.getMaxReportTime())
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     async def async_humidity_sensor_set_configuration(self, correction: float, auto_event_diff:float, manual_event_interval:str):
         """sets configuration of a humidity sensor"""
-        LOGGER.debug(f"async_humidity_sensor_set_configuration correction {correction}, auto_event_diff {auto_event_diff}, manual_event_interval {manual_event_interval}")
+        LOGGER.debug("async_humidity_sensor_set_configuration correction %s, auto_event_diff %s, manual_event_interval %s", correction, auto_event_diff, manual_event_interval)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
         
         reportTimeBase, maxReportTime = HausbusSensor.getTimeIntervalMapping(manual_event_interval)
-        self._channel.setConfiguration(self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getLowerThreshold(), self._configuration.getLowerThresholdFraction(), self._configuration.getUpperThreshold(), self._configuration.getUpperThresholdFraction(),reportTimeBase,1,maxReportTime, int(auto_event_diff*10),int(correction*10),0)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
           
 class HausbusAnalogEingang(HausbusSensor):
     """Representation of a Haus-Bus analog input."""
@@ -328,28 +486,27 @@ class HausbusAnalogEingang(HausbusSensor):
         
         if isinstance(data, (AnalogEingangEvStatus, AnalogEingangStatus)):
           value = data.getValue()
-          LOGGER.debug(f"Analogwert empfangen: {value}")
-          self._attr_native_value = value
-          self.schedule_update_ha_state() 
+          LOGGER.debug("Analogwert empfangen: %s", value)
+          self.publish_value(value)
         elif isinstance(data, AnalogEingangConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
 
             self._attr_extra_state_attributes["correction"] = data.getCalibration()
             self._attr_extra_state_attributes["auto_event_diff"] = data.getHysteresis()
             self._attr_extra_state_attributes["manual_event_interval"] = HausbusSensor.getTimeIntervalMapping(data.getReportTimeBase()*data.getMaxReportTime())
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     async def async_analog_eingang_set_configuration(self, correction: float, auto_event_diff:float, manual_event_interval:str):
         """Setzt die Konfiguration eines Analogeingangs."""
-        LOGGER.debug(f"async_analog_eingang_set_configuration correction {correction}, auto_event_diff {auto_event_diff}, manual_event_interval {manual_event_interval}")
+        LOGGER.debug("async_analog_eingang_set_configuration correction %s, auto_event_diff %s, manual_event_interval %s", correction, auto_event_diff, manual_event_interval)
 
         if not await self.ensure_configuration():
           raise HomeAssistantError("Configuration could not be read. Please repeat command.")
         
         reportTimeBase, maxReportTime = HausbusSensor.getTimeIntervalMapping(manual_event_interval)
-        self._channel.setConfiguration(self._configuration.getLowerThreshold(), self._configuration.getUpperThreshold(), reportTimeBase,1,maxReportTime, auto_event_diff,correction,0)
-        self._channel.getConfiguration()
+        self.send_command(self._channel.setConfiguration, self._configuration.getLowerThreshold(), self._configuration.getUpperThreshold(), reportTimeBase,1,maxReportTime, auto_event_diff,correction,0)
+        self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
 
 class HausbusRfidSensor(HausbusSensor):
     """Representation of a Haus-Bus RFID reader."""
@@ -370,7 +527,7 @@ class HausbusRfidSensor(HausbusSensor):
         """Handle rfid events from Haus-Bus."""
         
         if isinstance(data, RfidEvData):
-          LOGGER.debug(f"rfid data: {data}")
+          LOGGER.debug("rfid data: %s", data)
           self._attr_native_value = data.getTagID();
           
           self._attr_extra_state_attributes["last_tag"] = self._attr_native_value
@@ -379,7 +536,49 @@ class HausbusRfidSensor(HausbusSensor):
           self.schedule_update_ha_state()
            
         elif isinstance(data, RfidEvError):
-          LOGGER.debug(f"rfid error: {data}")
+          LOGGER.debug("rfid error: %s", data)
           self._attr_extra_state_attributes["last_tag"] = ""
           self._attr_extra_state_attributes["last_time"] = datetime.now().isoformat()
           self._attr_extra_state_attributes["last_error"] = data.getErrorCode()
+
+
+class HausbusStatisticsSensor(SensorEntity):
+    """Diagnostic sensor for the bus traffic of the gateway."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, key: str, name: str, unit: str | None, state_class: SensorStateClass | None, value: Callable[[], Any]) -> None:
+        """Set up sensor."""
+        super().__init__()
+
+        self._attr_unique_id = f"hausbus_statistics_{key}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._value = value
+
+    async def async_update(self) -> None:
+        """Read the current value from the gateway statistics."""
+        self._attr_native_value = self._value()
+
+
+def create_statistics_sensors(gateway: HausbusGateway) -> list[HausbusStatisticsSensor]:
+    """Create the diagnostic sensors of the gateway, they are disabled by default."""
+    statistics = gateway.statistics
+
+    def busiest_device() -> str | None:
+        busiest = statistics.busiest_device()
+        return str(busiest[0]) if busiest is not None else None
+
+    return [
+      HausbusStatisticsSensor("received_per_second", "Received messages", "msg/s", SensorStateClass.MEASUREMENT, lambda: round(statistics.received_rate, 2)),
+      HausbusStatisticsSensor("sent_per_second", "Sent commands", "msg/s", SensorStateClass.MEASUREMENT, lambda: round(statistics.sent_rate, 2)),
+      HausbusStatisticsSensor("unknown_messages", "Unknown messages", None, SensorStateClass.TOTAL_INCREASING, lambda: statistics.unknown),
+      HausbusStatisticsSensor("pending_requests", "Pending requests", None, SensorStateClass.MEASUREMENT, lambda: gateway.request_scheduler.pending),
+      HausbusStatisticsSensor("busiest_device", "Busiest device", None, None, busiest_device),
+    ]
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Temperatursensor": HausbusTemperaturSensor, "Helligkeitssensor": HausbusBrightnessSensor, "Feuchtesensor": HausbusHumiditySensor, "AnalogEingang": HausbusAnalogEingang, "PowerMeter": HausbusPowerMeter, "RFIDReader": HausbusRfidSensor}
@@ -0,0 +1,149 @@
+"""Traffic statistics of the Haus-Bus gateway."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+import threading
+import time
+from typing import Any
+
+# Obergrenzen der Latenz-Klassen in Millisekunden, die letzte Klasse ist offen
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100)
+RATE_WINDOW = 10.0
+
+
+class HausbusBusStatistics:
+    """Counts the messages seen by the gateway.
+
+    Recording happens in the receive thread of pyhausbus, reading in the event loop,
+    so both sides share a lock that is only held for a few counter updates.
+    """
+
+    def __init__(self) -> None:
+        """Set up empty statistics."""
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.received = 0
+        self.sent = 0
+        self.unknown = 0
+        self.received_per_device: Counter[int] = Counter()
+        self.sent_per_device: Counter[int] = Counter()
+        self.received_per_type: Counter[str] = Counter()
+        self.handler_latency = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._window_start = self._started
+        self._window_received: Counter[int] = Counter()
+        self._window_sent = 0
+        self._received_rates: dict[int, float] = {}
+        self._sent_rate = 0.0
+        # bestätigte Befehle je Gerät: Anzahl, Summe und Maximum der Umlaufzeit, ohne Bestätigung
+        self.confirmed_per_device: Counter[int] = Counter()
+        self.unconfirmed_per_device: Counter[int] = Counter()
+        self._round_trip_sum: Counter[int] = Counter()
+        self._round_trip_max: dict[int, float] = {}
+
+    def record_received(self, device_id: int, message_type: str, unknown: bool, latency: float) -> None:
+        """Record a message of a device and the time its handlers took in seconds."""
+        bucket = bisect_left(LATENCY_BUCKETS_MS, latency * 1000)
+        with self._lock:
+            self.received += 1
+            self.received_per_device[device_id] += 1
+            self.received_per_type[message_type] += 1
+            self._window_received[device_id] += 1
+            self.handler_latency[bucket] += 1
+            if unknown:
+                self.unknown += 1
+            self._roll_window(time.monotonic())
+
+    def record_sent(self, device_id: int) -> None:
+        """Record a command sent to a device."""
+        with self._lock:
+            self.sent += 1
+            self.sent_per_device[device_id] += 1
+            self._window_sent += 1
+            self._roll_window(time.monotonic())
+
+    def record_round_trip(self, device_id: int, round_trip: float | None) -> None:
+        """Record the round-trip time of a confirmed command in seconds, None if it was not confirmed."""
+        with self._lock:
+            if round_trip is None:
+                self.unconfirmed_per_device[device_id] += 1
+                return
+            self.confirmed_per_device[device_id] += 1
+            self._round_trip_sum[device_id] += round_trip
+            self._round_trip_max[device_id] = max(round_trip, self._round_trip_max.get(device_id, 0.0))
+
+    def round_trip(self, device_id: int) -> dict[str, Any]:
+        """Round-trip statistics of the confirmed commands of a device."""
+        with self._lock:
+            return self._round_trip(device_id)
+
+    def _round_trip(self, device_id: int) -> dict[str, Any]:
+        confirmed = self.confirmed_per_device[device_id]
+        return {
+            "confirmed": confirmed,
+            "unconfirmed": self.unconfirmed_per_device[device_id],
+            "round_trip_ms_avg": round(self._round_trip_sum[device_id] / confirmed * 1000, 1) if confirmed else None,
+            "round_trip_ms_max": round(self._round_trip_max.get(device_id, 0.0) * 1000, 1) if confirmed else None,
+        }
+
+    def _roll_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < RATE_WINDOW:
+            return
+        self._received_rates = {device_id: count / elapsed for device_id, count in self._window_received.items()}
+        self._sent_rate = self._window_sent / elapsed
+        self._window_received = Counter()
+        self._window_sent = 0
+        self._window_start = now
+
+    @property
+    def received_rate(self) -> float:
+        """Received messages per second in the last complete window."""
+        with self._lock:
+            self._roll_window(time.monotonic())
+            return sum(self._received_rates.values())
+
+    @property
+    def sent_rate(self) -> float:
+        """Sent commands per second in the last complete window."""
+        with self._lock:
+            self._roll_window(time.monotonic())
+            return self._sent_rate
+
+    def busiest_device(self) -> tuple[int, float] | None:
+        """The device that sent the most messages per second in the last complete window."""
+        with self._lock:
+            self._roll_window(time.monotonic())
+            if not self._received_rates:
+                return None
+            return max(self._received_rates.items(), key=lambda item: item[1])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Snapshot of all statistics for diagnostics."""
+        with self._lock:
+            now = time.monotonic()
+            self._roll_window(now)
+            devices = set(self.received_per_device) | set(self.sent_per_device) | set(self.confirmed_per_device) | set(self.unconfirmed_per_device)
+            return {
+                "uptime": round(now - self._started, 1),
+                "received": self.received,
+                "sent": self.sent,
+                "unknown": self.unknown,
+                "received_per_second": round(sum(self._received_rates.values()), 2),
+                "sent_per_second": round(self._sent_rate, 2),
+                "devices": {
+                    str(device_id): {
+                        "received": self.received_per_device[device_id],
+                        "sent": self.sent_per_device[device_id],
+                        "received_per_second": round(self._received_rates.get(device_id, 0.0), 2),
+                        **self._round_trip(device_id),
+                    }
+                    for device_id in sorted(devices)
+                },
+                "message_types": dict(self.received_per_type.most_common()),
+                "handler_latency_ms": {
+                    **{f"<={limit}": count for limit, count in zip(LATENCY_BUCKETS_MS, self.handler_latency)},
+                    f">{LATENCY_BUCKETS_MS[-1]}": self.handler_latency[-1],
+                },
+            }
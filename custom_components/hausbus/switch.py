@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
@@ -13,7 +15,7 @@ from pyhausbus.de.hausbus.homeassistant.proxy.schalter.params.EState import ESta
 
 from homeassistant.helpers import entity_platform
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN, SwitchEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.exceptions import HomeAssistantError
 
@@ -22,6 +24,7 @@ import voluptuous as vol
 from .const import ATTR_ON_STATE
 from .device import HausbusDevice
 from .entity import HausbusEntity
+from .schemas import SERVICE_SCHEMAS
 
 if TYPE_CHECKING:
     from . import HausbusConfigEntry
@@ -39,29 +42,23 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
 
     platform.async_register_entity_service(
         "switch_off",
-        {
-            vol.Required("offDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["switch_off"],
         "async_switch_off",
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     platform.async_register_entity_service(
         "switch_on",
-        {
-            vol.Required("duration", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-            vol.Optional("onDelay", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
-        },
+        SERVICE_SCHEMAS["switch_on"],
         "async_switch_on",
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     platform.async_register_entity_service(
         "switch_toggle",
-        {
-            vol.Required("offTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
-            vol.Required("onTime", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=255)),
-            vol.Optional("quantity", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
-        },
+        SERVICE_SCHEMAS["switch_toggle"],
         "async_switch_toggle",
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     platform.async_register_entity_service(
@@ -75,12 +72,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: HausbusConfigEntr
     )
 
 
-    async def async_add_switch(channel: HausbusEntity) -> None:
-        """Add switch from Haus-Bus."""
-        if isinstance(channel, HausbusSwitch):
-            async_add_entities([channel])
+    async def async_add_switch(channels: list[HausbusEntity]) -> None:
+        """Add switches from Haus-Bus."""
+        async_add_entities([channel for channel in channels if isinstance(channel, HausbusSwitch)])
 
-    gateway.register_platform_add_channel_callback(async_add_switch, SWITCH_DOMAIN)
+    gateway.register_platform_add_channel_callback(async_add_switch, SWITCH_DOMAIN, CHANNEL_ENTITIES)
 
 
 class HausbusSwitch(HausbusEntity, SwitchEntity):
@@ -94,11 +90,15 @@ class HausbusSwitch(HausbusEntity, SwitchEntity):
 
     def turn_off(self, **kwargs: Any) -> None:
         """Turn off action."""
-        self._channel.off(0)
+        self.send_optimistic({"_attr_is_on": False}, self._channel.off, 0)
 
     def turn_on(self, **kwargs: Any) -> None:
         """Turn on action."""
-        self._channel.on(0, 0)
+        self.send_optimistic({"_attr_is_on": True}, self._channel.on, 0, 0)
+
+    def bulk_command(self, state: str, brightness: int | None) -> Callable[[], None] | None:
+        """Bus call for hausbus.bulk_command."""
+        return partial(self._channel.on, 0, 0) if state == "on" else partial(self._channel.off, 0)
 
     def switch_turn_on(self) -> None:
         """Turn off a switch channel."""
@@ -122,11 +122,11 @@ class HausbusSwitch(HausbusEntity, SwitchEntity):
         elif isinstance(data, (SchalterEvOff)):
             self.switch_turn_off()
         elif isinstance(data, SchalterConfiguration):
-            self._configuration = data
+            self.set_configuration(data)
             self._attr_extra_state_attributes["max_on_time"] = data.getMaxOnTime()
             self._attr_extra_state_attributes["off_delay_time"] = data.getOffDelayTime()
             self._attr_extra_state_attributes["time_base"] = data.getTimeBase()
-            LOGGER.debug(f"_attr_extra_state_attributes {self._attr_extra_state_attributes}")
+            LOGGER.debug("_attr_extra_state_attributes %s", self._attr_extra_state_attributes)
 
     @callback
     def async_update_callback(self, **kwargs: Any) -> None:
@@ -136,35 +136,40 @@ class HausbusSwitch(HausbusEntity, SwitchEntity):
             self._attr_is_on = kwargs[ATTR_ON_STATE]
             state_changed = True
 
+        self.confirm_state()
         if state_changed:
             self.schedule_update_ha_state()
 
     @callback
-    async def async_switch_off(self, offDelay:int):
+    async def async_switch_off(self, offDelay:int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Switches a relay with the given off delay time"""
-        LOGGER.debug(f"async_switch_off offDelay {offDelay}")
-        self._channel.off(offDelay)
+        LOGGER.debug("async_switch_off offDelay %s", offDelay)
+        # mit Verzögerung bestätigt das Relais zuerst mit EvCmdDelay
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvOff", "EvCmdDelay"), self._channel.off, offDelay)
 
     @callback
-    async def async_switch_on(self, duration:int, onDelay:int):
+    async def async_switch_on(self, duration:int, onDelay:int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Switches a relay for given duration and on delay time"""
-        LOGGER.debug(f"async_switch_on duration {duration}, onDelay {onDelay}")
-        self._channel.on(duration, onDelay)
+        LOGGER.debug("async_switch_on duration %s, onDelay %s", duration, onDelay)
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvOn", "EvCmdDelay"), self._channel.on, duration, onDelay)
 
     @callback
-    async def async_switch_toggle(self, offTime:int, onTime:int, quantity:int):
+    async def async_switch_toggle(self, offTime:int, onTime:int, quantity:int, wait_for_confirmation: bool = False) -> ServiceResponse:
         """Toggels a relay with interval with given off and on time and quantity"""
-        LOGGER.debug(f"async_switch_toggle offTime {offTime}, onTime {onTime}, quantity {quantity}")
-        self._channel.toggle(offTime, onTime, quantity)
+        LOGGER.debug("async_switch_toggle offTime %s, onTime %s, quantity %s", offTime, onTime, quantity)
+        return await self.async_send_confirmed(wait_for_confirmation, ("EvToggle", "EvOn", "EvOff"), self._channel.toggle, offTime, onTime, quantity)
 
     @callback
     async def async_switch_set_configuration(self, max_on_time:int, off_delay_time:int, time_base:int):
         """Setzt die Konfiguration eines Relais."""
-        LOGGER.debug(f"async_switch_set_configuration max_on_time {max_on_time}, off_delay_time {off_delay_time}, time_base {time_base}")
+        LOGGER.debug("async_switch_set_configuration max_on_time %s, off_delay_time %s, time_base %s", max_on_time, off_delay_time, time_base)
         if not self._configuration:
-          LOGGER.debug(f"reading missing configuration")
-          self._channel.getConfiguration()
+          LOGGER.debug("reading missing configuration")
+          self.request_from_hardware("Configuration", self._channel.getConfiguration)
           raise HomeAssistantError(f"Configuration needed update. Please repeat configuration")
         else:
-          self._channel.setConfiguration(max_on_time, off_delay_time, time_base, self._configuration.getOptions(), self._configuration.getDisableBitIndex())
-          self._channel.getConfiguration()
\ No newline at end of file
+          self.send_command(self._channel.setConfiguration, max_on_time, off_delay_time, time_base, self._configuration.getOptions(), self._configuration.getDisableBitIndex())
+          self.request_from_hardware("Configuration", self._channel.getConfiguration, reread=True)
+
+
+CHANNEL_ENTITIES: dict[str, type[HausbusEntity]] = {"Schalter": HausbusSwitch}
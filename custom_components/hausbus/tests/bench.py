@@ -0,0 +1,261 @@
+"""Replay harness that drives HausbusGateway.busDataReceived without hardware."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass
+import importlib
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID, getClassId, getDeviceId, getInstanceId, getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory
+from pyhausbus.de.hausbus.homeassistant.proxy.Controller import Controller
+from pyhausbus.de.hausbus.homeassistant.proxy.Dimmer import Dimmer
+from pyhausbus.de.hausbus.homeassistant.proxy.Rollladen import Rollladen
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
+from pyhausbus.de.hausbus.homeassistant.proxy.Temperatursensor import Temperatursensor
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EFirmwareId import EFirmwareId
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOff import EvOff as DimmerEvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOn import EvOn as DimmerEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvClosed import EvClosed
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvOpen import EvOpen
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOff import EvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvFree import EvFree
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.EState import EState
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.EvStatus import EvStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.params.ELastEvent import ELastEvent
+
+from hausbus.gateway import HausbusGateway
+
+CHANNEL_TYPES = (Schalter, Dimmer, Taster, Temperatursensor, Rollladen)
+
+# Meldungen, die ein Kanal des jeweiligen Typs im Betrieb sendet
+MESSAGES = {
+    Schalter: lambda rnd: EvOn(0) if rnd.random() < 0.5 else EvOff(),
+    Dimmer: lambda rnd: DimmerEvOn(rnd.randint(1, 100), 0) if rnd.random() < 0.5 else DimmerEvOff(),
+    Taster: lambda rnd: EvCovered(EState.PRESSED) if rnd.random() < 0.5 else EvFree(EState.RELEASED),
+    Temperatursensor: lambda rnd: EvStatus(rnd.randint(15, 25), rnd.randint(0, 99), ELastEvent.WARM),
+    Rollladen: lambda rnd: EvClosed(rnd.randint(0, 100)) if rnd.random() < 0.5 else EvOpen(),
+}
+
+
+class StubSender:
+    """Command sender that records the commands instead of sending them to the bus."""
+
+    def __init__(self, max_queue: int) -> None:
+        self.sent: list[Any] = []
+        self.pending = 0
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def submit(self, send: Any) -> Future[None]:
+        self.sent.append(send)
+        future: Future[None] = Future()
+        future.set_result(None)
+        return future
+
+
+class CountingLoop:
+    """Wraps the event loop and counts the wakeups requested from the bus thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self.wakeups = 0
+
+    def call_soon_threadsafe(self, callback: Any, *args: Any) -> Any:
+        self.wakeups += 1
+        return self._loop.call_soon_threadsafe(callback, *args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loop, name)
+
+
+@dataclass
+class ReplayResult:
+    """Result of a replay run."""
+
+    messages: int
+    duration: float
+    latencies: list[float]
+    wakeups: int
+    state_writes: int
+    peak_memory: int | None = None
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.duration if self.duration else 0.0
+
+    def percentile(self, percent: int) -> float:
+        """Latency percentile in microseconds."""
+        return statistics.quantiles(self.latencies, n=100)[percent - 1] * 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "messages_per_second": round(self.messages_per_second),
+            "p50_us": round(self.percentile(50), 1),
+            "p95_us": round(self.percentile(95), 1),
+            "p99_us": round(self.percentile(99), 1),
+            "loop_wakeups": self.wakeups,
+            "state_writes": self.state_writes,
+            "peak_memory_kb": None if self.peak_memory is None else self.peak_memory // 1024,
+        }
+
+
+class BenchGateway:
+    """A HausbusGateway with stub HomeServer and sender whose event loop runs in its own thread.
+
+    The thread calling replay plays the role of the pyhausbus receive thread.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="bench-loop", daemon=True)
+        self._thread.start()
+        self.hass = MagicMock()
+        self.hass.data = {}
+        self.hass.loop = CountingLoop(self.loop)
+        self._tasks: list[Future[Any]] = []
+        self.hass.create_task = lambda coro, name=None: self._tasks.append(asyncio.run_coroutine_threadsafe(coro, self.loop))
+        self.state_writes = 0
+        with patch("hausbus.gateway.HomeServer", return_value=MagicMock(**{"is_internal_device.return_value": False})), patch("hausbus.gateway.HausbusCommandSender", StubSender):
+            self.gateway = HausbusGateway(self.hass, MagicMock())
+        self.gateway.topology = MagicMock()
+        self.gateway.async_register_device = self._async_register_device
+        for domain in ("switch", "light", "binary_sensor", "sensor", "cover", "number", "event"):
+            platform = importlib.import_module(f"hausbus.{domain}")
+            self.gateway.register_platform_add_channel_callback(self._async_add_entities, domain, platform.CHANNEL_ENTITIES)
+        self.channels: list[Any] = []
+
+    async def _async_register_device(self, device_id: int, device_info: Any, device: Any) -> None:
+        device.hass_device_entry_id = f"device-{device_id}"
+
+    async def _async_add_entities(self, entities: list[Any]) -> None:
+        # wie von der Plattform hinzugefügt, geschrieben wird nur gezählt
+        platform = MagicMock()
+        platform.config_entry.runtime_data.gateway = self.gateway
+        for entity in entities:
+            entity.hass = self.hass
+            entity.platform = platform
+            entity.async_write_ha_state = self._count_state_write
+
+    def _count_state_write(self) -> None:
+        self.state_writes += 1
+
+    def discover(self, devices: int, channels_per_type: int) -> None:
+        """Announce devices with channels_per_type channels of every type through newDeviceDetected."""
+        self._announce({
+            device_id: [channel_type.create(device_id, instance) for channel_type in CHANNEL_TYPES for instance in range(1, channels_per_type + 1)]
+            for device_id in range(1000, 1000 + devices)
+        })
+
+    def discover_senders(self, object_ids: Iterable[int]) -> None:
+        """Announce the devices and channels that sent the given object ids, e.g. from a capture."""
+        devices: dict[int, list[Any]] = {}
+        for object_id in sorted(set(object_ids)):
+            device_id, class_id, instance = getDeviceId(object_id), getClassId(object_id), getInstanceId(object_id)
+            if device_id == HOMESERVER_DEVICE_ID or class_id == Controller.CLASS_ID:
+                continue
+            class_name = ProxyFactory.getBusClassNameForClass(class_id)
+            channel_type = getattr(importlib.import_module(class_name), class_name.rsplit(".", 1)[1], None)
+            if channel_type is None or not hasattr(channel_type, "create"):
+                continue
+            devices.setdefault(device_id, []).append(channel_type.create(device_id, instance))
+        self._announce(devices)
+
+    def _announce(self, devices: dict[int, list[Any]]) -> None:
+        with patch("hausbus.gateway.Templates.get_instance") as templates:
+            templates.return_value.get_feature_name_from_template.return_value = "Taster"
+            for device_id, channels in devices.items():
+                for channel in channels:
+                    channel.setName(f"{type(channel).__name__} {getInstanceId(channel.getObjectId())}")
+                configuration = Configuration(0, None, device_id, 0, None, None, None, None, None, None, None, None, 0, 0, 0, 0x30)
+                self.gateway.newDeviceDetected(device_id, "bench", ModuleId("bench", 0, 1, 0, EFirmwareId.ESP32), configuration, channels)
+                self.channels.extend(channels)
+        # warten, bis der Loop alle Entities angemeldet hat
+        for task in self._tasks:
+            task.result(10)
+        self._tasks.clear()
+        self.flush()
+
+    def generate(self, count: int, unknown_share: float = 0.05, seed: int = 0) -> list[BusDataMessage]:
+        """Random event stream of the discovered channels, with some messages of unknown senders."""
+        rnd = random.Random(seed)
+        messages = []
+        for _ in range(count):
+            if rnd.random() < unknown_share:
+                messages.append(BusDataMessage(getObjectId(rnd.randint(20000, 30000), 19, 1), 0, EvOn(0)))
+                continue
+            channel = rnd.choice(self.channels)
+            messages.append(BusDataMessage(channel.getObjectId(), 0, MESSAGES[type(channel)](rnd)))
+        return messages
+
+    def replay(
+        self,
+        messages: list[BusDataMessage],
+        rate: float | None = None,
+        trace_memory: bool = False,
+        flush: bool = True,
+        offsets: list[float] | None = None,
+    ) -> ReplayResult:
+        """Feed messages through busDataReceived, at rate messages per second, at the given offsets in seconds or as fast as possible.
+
+        With flush the state writes of the loop are awaited before and after the run, without
+        (for the timing of benchmarks) state_writes only counts what the loop managed meanwhile.
+        """
+        if flush:
+            self.flush()
+        wakeups = self.hass.loop.wakeups
+        state_writes = self.state_writes
+        latencies = []
+        receive = self.gateway.busDataReceived
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        if offsets is None and rate is not None:
+            offsets = [index / rate for index in range(len(messages))]
+        for index, message in enumerate(messages):
+            if offsets is not None:
+                delay = start + offsets[index] - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            before = time.perf_counter()
+            receive(message)
+            latencies.append(time.perf_counter() - before)
+        duration = time.perf_counter() - start
+        peak_memory = None
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if flush:
+            self.flush()
+        return ReplayResult(len(messages), duration, latencies, self.hass.loop.wakeups - wakeups, self.state_writes - state_writes, peak_memory)
+
+    def flush(self) -> None:
+        """Wait until the loop processed the pending state writes."""
+        time.sleep(self.gateway._state_write_interval * 2)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result(10)
+
+    def close(self) -> None:
+        self.gateway.shutdown()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
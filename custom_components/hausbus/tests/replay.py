@@ -0,0 +1,55 @@
+"""Replay a bus capture through HausbusGateway.busDataReceived without hardware.
+
+Start in custom_components directory:
+    python -m hausbus.tests.replay /config/hausbus_capture.bin --speed 1
+--speed 1 replays at the original timing, 10 ten times faster and 0 as fast as possible.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from hausbus.capture import CaptureRecord, capture_files, read_capture
+from hausbus.tests.bench import BenchGateway, ReplayResult
+
+
+def load_capture(filename: str) -> list[CaptureRecord]:
+    """All records of a capture including its rotated files."""
+    return [record for path in capture_files(filename) for record in read_capture(path)]
+
+
+def replay_capture(records: list[CaptureRecord], speed: float) -> ReplayResult:
+    """Announce the senders of the capture to a bench gateway and replay the messages."""
+    bench = BenchGateway()
+    try:
+        bench.discover_senders(record.message.getSenderObjectId() for record in records)
+        offsets = None
+        if speed > 0 and records:
+            start = records[0].timestamp
+            offsets = [(record.timestamp - start) / speed for record in records]
+        return bench.replay([record.message for record in records], offsets=offsets)
+    finally:
+        bench.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a Haus-Bus capture")
+    parser.add_argument("capture", help="capture file, rotated files are read as well")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale, 0 for maximum speed")
+    args = parser.parse_args()
+
+    records = load_capture(args.capture)
+    if not records:
+        parser.error(f"no records in {args.capture}")
+    result = replay_capture(records, args.speed)
+    print(json.dumps({"sent": sum(record.sent for record in records), **result.as_dict()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
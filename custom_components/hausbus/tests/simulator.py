@@ -0,0 +1,516 @@
+"""Local Haus-Bus device simulator speaking the UDP protocol.
+
+Start in custom_components directory:
+    python -m hausbus.tests.simulator --modules 250 --latency 5 --loss 0.01 --event-interval 10
+and point the integration at it with "hausbus: host: 127.0.0.2" in configuration.yaml.
+
+The simulator binds 127.0.0.2, so it can share port 5855 with Home Assistant on the same
+machine, answers to 127.0.0.1 and echoes every received frame like the broadcast of a real
+bus does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import functools
+import importlib
+import inspect
+import logging
+import random
+import re
+import socket
+import struct
+import sys
+import os
+from typing import Any
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from pyhausbus.HausBusUtils import UDP_PORT, getClassId, getDeviceId, getInstanceId, getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory
+from pyhausbus.de.hausbus.homeassistant.proxy.Controller import Controller
+from pyhausbus.de.hausbus.homeassistant.proxy.Dimmer import Dimmer
+from pyhausbus.de.hausbus.homeassistant.proxy.PowerMeter import PowerMeter
+from pyhausbus.de.hausbus.homeassistant.proxy.RFIDReader import RFIDReader
+from pyhausbus.de.hausbus.homeassistant.proxy.Rollladen import Rollladen
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
+from pyhausbus.de.hausbus.homeassistant.proxy.Temperatursensor import Temperatursensor
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Configuration import Configuration as ControllerConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Pong import Pong
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.RemoteObjects import RemoteObjects
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EFirmwareId import EFirmwareId
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.Configuration import Configuration as DimmerConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOff import EvOff as DimmerEvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOn import EvOn as DimmerEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.Status import Status as DimmerStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.params.EDirection import EDirection as DimmerDirection
+from pyhausbus.de.hausbus.homeassistant.proxy.powerMeter.data.Configuration import Configuration as PowerMeterConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.powerMeter.data.EvStatus import EvStatus as PowerMeterEvStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.powerMeter.data.Status import Status as PowerMeterStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.powerMeter.params.ELastEvent import ELastEvent as PowerMeterLastEvent
+from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.Configuration import Configuration as RfidConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.EvData import EvData as RfidEvData
+from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.data.State import State as RfidState
+from pyhausbus.de.hausbus.homeassistant.proxy.rFIDReader.params.EState import EState as RfidEState
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.Configuration import Configuration as RollladenConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvClosed import EvClosed
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvOpen import EvOpen
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvStart import EvStart as RollladenEvStart
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.Status import Status as RollladenStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.params.EDirection import EDirection as RollladenDirection
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Configuration import Configuration as SchalterConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOff import EvOff as SchalterEvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn as SchalterEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Status import Status as SchalterStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.params.EState import EState as SchalterState
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.Configuration import Configuration as TasterConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvFree import EvFree
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.Status import Status as TasterStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.EState import EState as TasterState
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.Configuration import Configuration as TemperaturConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.EvStatus import EvStatus as TemperaturEvStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.Status import Status as TemperaturStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.params.ELastEvent import ELastEvent as TemperaturLastEvent
+
+from hausbus.transport import parse_frame
+
+LOGGER = logging.getLogger(__name__)
+
+SIMULATOR_HOST = "127.0.0.2"
+TARGET_HOST = "127.0.0.1"
+FRAME_HEADER = struct.Struct("<2sBBIIH")
+
+# Reihenfolge der Felder aus dem generierten _fromBytes der pyhausbus-Klassen
+_READER = re.compile(r"(?:HausBusUtils\.bytesTo(\w+)|(\w+)\._fromBytes)\(")
+
+
+def _write_field(kind: str, value: Any, out: bytearray) -> None:
+    if kind in ("Int", "SInt", "Param"):
+        out.append(int(getattr(value, "value", value)) & 0xFF)
+    elif kind == "Word":
+        out += struct.pack("<H", value & 0xFFFF)
+    elif kind == "DWord":
+        out += struct.pack("<I", value & 0xFFFFFFFF)
+    elif kind == "String":
+        out += value.encode("latin-1") + b"\0"
+    elif kind in ("List", "Blob"):
+        out += bytes(value)
+    else:
+        raise ValueError(f"unknown field type {kind}")
+
+
+@functools.cache
+def _field_kinds(cls: type) -> tuple[str, ...]:
+    source = inspect.getsource(cls._fromBytes).split("return", 1)[1]
+    return tuple(reader or "Param" for reader, _param in _READER.findall(source))
+
+
+def encode_data(data: Any) -> bytes:
+    """Encode a pyhausbus data or command object as the parameters of a frame."""
+    out = bytearray([type(data).FUNCTION_ID])
+    for kind, value in zip(_field_kinds(type(data)), vars(data).values(), strict=True):
+        _write_field(kind, value, out)
+    return bytes(out)
+
+
+def build_frame(sender: int, receiver: int, data: Any, counter: int = 0) -> bytes:
+    """A complete UDP frame with data sent from sender to receiver."""
+    params = encode_data(data)
+    return FRAME_HEADER.pack(b"\xef\xef", 0, counter & 0xFF, sender, receiver, len(params)) + params
+
+
+def decode_frame(frame: bytes) -> tuple[int, int, Any] | None:
+    """Sender, receiver and decoded object of a frame."""
+    parsed = parse_frame(frame)
+    if parsed is None:
+        return None
+    sender, receiver, function_id, function_data = parsed
+    class_id = getClassId(receiver if function_id < 128 else sender)
+    class_name = ProxyFactory.getBusClassNameFor(class_id, function_id)
+    cls = getattr(importlib.import_module(class_name), class_name.rsplit(".", 1)[1])
+    return sender, receiver, cls._fromBytes(function_data, [0])
+
+
+def default_data(cls: type, **fields: Any) -> Any:
+    """An instance of a data class decoded from zeros with some fields set."""
+    data = cls._fromBytes(bytes(64), [0])
+    for name, value in fields.items():
+        setattr(data, name, value)
+    return data
+
+
+# (Verzögerung in Sekunden, Meldung)
+Reply = tuple[float, Any]
+
+
+class SimulatedChannel:
+    """A channel of a simulated module."""
+
+    feature: type
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        self.object_id = getObjectId(device_id, self.feature.CLASS_ID, instance)
+
+    def status(self) -> Any | None:
+        return None
+
+    def configuration(self) -> Any | None:
+        return None
+
+    def command(self, name: str, command: Any) -> list[Reply]:
+        """Events caused by a command, getStatus and getConfiguration are handled by the module."""
+        return []
+
+    def periodic(self, rnd: random.Random) -> Any | None:
+        """Event sent without a command."""
+        return None
+
+
+class SimulatedRelay(SimulatedChannel):
+    feature = Schalter
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        super().__init__(device_id, instance)
+        self.on = False
+
+    def status(self) -> Any:
+        return SchalterStatus(SchalterState.ON if self.on else SchalterState.OFF, 0, 0, 0)
+
+    def configuration(self) -> Any:
+        return default_data(SchalterConfiguration, timeBase=1000)
+
+    def command(self, name: str, command: Any) -> list[Reply]:
+        if name == "On":
+            self.on = True
+        elif name == "Off":
+            self.on = False
+        elif name == "Toggle":
+            self.on = not self.on
+        else:
+            return []
+        return [(0, SchalterEvOn(0) if self.on else SchalterEvOff())]
+
+
+class SimulatedDimmer(SimulatedChannel):
+    feature = Dimmer
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        super().__init__(device_id, instance)
+        self.brightness = 0
+
+    def status(self) -> Any:
+        return DimmerStatus(self.brightness, 0)
+
+    def configuration(self) -> Any:
+        return default_data(DimmerConfiguration, fadingTime=10, dimmingTime=10, dimmingRangeEnd=100)
+
+    def command(self, name: str, command: Any) -> list[Reply]:
+        if name == "SetBrightness":
+            self.brightness = command.brightness
+        elif name == "Start":
+            self.brightness = 0 if command.direction is DimmerDirection.TO_DARK or (command.direction is DimmerDirection.TOGGLE and self.brightness) else 100
+        else:
+            return []
+        return [(0, DimmerEvOn(self.brightness, 0) if self.brightness else DimmerEvOff())]
+
+
+class SimulatedCover(SimulatedChannel):
+    """Rollladen, position 0 is open and 100 closed as on the bus."""
+
+    feature = Rollladen
+    # Sekunden für den ganzen Weg
+    travel_time = 0.0
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        super().__init__(device_id, instance)
+        self.position = 0
+
+    def status(self) -> Any:
+        return RollladenStatus(self.position)
+
+    def configuration(self) -> Any:
+        return default_data(RollladenConfiguration, closeTime=int(self.travel_time), openTime=int(self.travel_time))
+
+    def command(self, name: str, command: Any) -> list[Reply]:
+        if name in ("MoveToPosition", "SetPosition"):
+            target = command.position
+        elif name == "Start":
+            target = 100 if command.direction is RollladenDirection.TO_CLOSE or (command.direction is RollladenDirection.TOGGLE and self.position < 50) else 0
+        elif name == "Stop":
+            return [(0, EvClosed(self.position))]
+        else:
+            return []
+        if name == "SetPosition" or target == self.position:
+            self.position = target
+            return [(0, self.status())]
+        direction = RollladenDirection.TO_CLOSE if target > self.position else RollladenDirection.TO_OPEN
+        travel = abs(target - self.position) / 100 * self.travel_time
+        self.position = target
+        return [(0, RollladenEvStart(direction)), (travel, EvOpen() if target == 0 else EvClosed(target))]
+
+
+class SimulatedButton(SimulatedChannel):
+    feature = Taster
+
+    def status(self) -> Any:
+        return TasterStatus(TasterState.RELEASED)
+
+    def configuration(self) -> Any:
+        return default_data(TasterConfiguration, holdTimeout=100, waitForDoubleClickTimeout=50, debounceTime=5)
+
+    def periodic(self, rnd: random.Random) -> Any:
+        return EvCovered(TasterState.PRESSED) if rnd.random() < 0.5 else EvFree(TasterState.RELEASED)
+
+
+class SimulatedTemperatureSensor(SimulatedChannel):
+    feature = Temperatursensor
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        super().__init__(device_id, instance)
+        self.centi_celsius = 2100
+
+    def status(self) -> Any:
+        return TemperaturStatus(self.centi_celsius // 100, self.centi_celsius % 100, TemperaturLastEvent.WARM)
+
+    def configuration(self) -> Any:
+        return default_data(TemperaturConfiguration, reportTimeBase=1, maxReportTime=60)
+
+    def periodic(self, rnd: random.Random) -> Any:
+        self.centi_celsius += rnd.randint(-20, 20)
+        return TemperaturEvStatus(self.centi_celsius // 100, self.centi_celsius % 100, TemperaturLastEvent.WARM)
+
+
+class SimulatedPowerMeter(SimulatedChannel):
+    feature = PowerMeter
+
+    def __init__(self, device_id: int, instance: int) -> None:
+        super().__init__(device_id, instance)
+        self.centi_power = 150
+
+    def status(self) -> Any:
+        return PowerMeterStatus(self.centi_power // 100, self.centi_power % 100, PowerMeterLastEvent.MEDIUM)
+
+    def configuration(self) -> Any:
+        return default_data(PowerMeterConfiguration, reportTimeBase=1, maxReportTime=60)
+
+    def periodic(self, rnd: random.Random) -> Any:
+        self.centi_power = max(0, self.centi_power + rnd.randint(-30, 30))
+        return PowerMeterEvStatus(self.centi_power // 100, self.centi_power % 100, PowerMeterLastEvent.MEDIUM)
+
+
+class SimulatedRfidReader(SimulatedChannel):
+    feature = RFIDReader
+
+    def status(self) -> Any:
+        return RfidState(RfidEState.IDLE)
+
+    def configuration(self) -> Any:
+        return RfidConfiguration(0)
+
+    def periodic(self, rnd: random.Random) -> Any:
+        return RfidEvData(rnd.randint(1, 0xFFFFFFFF))
+
+
+# Kanäle der simulierten Modultypen
+MODULE_TYPES: dict[str, list[tuple[type[SimulatedChannel], int]]] = {
+    "relays": [(SimulatedRelay, 8), (SimulatedButton, 8)],
+    "dimmers": [(SimulatedDimmer, 4), (SimulatedButton, 4)],
+    "covers": [(SimulatedCover, 4), (SimulatedButton, 4)],
+    "sensors": [(SimulatedTemperatureSensor, 1), (SimulatedPowerMeter, 1), (SimulatedRfidReader, 1), (SimulatedButton, 2)],
+}
+
+
+class SimulatedModule:
+    """A Haus-Bus module with its controller and channels."""
+
+    def __init__(self, device_id: int, module_type: str) -> None:
+        self.device_id = device_id
+        self.module_type = module_type
+        self.channels: dict[int, SimulatedChannel] = {}
+        for channel_type, count in MODULE_TYPES[module_type]:
+            for instance in range(1, count + 1):
+                channel = channel_type(device_id, instance)
+                self.channels[channel.object_id] = channel
+        self.controller_id = getObjectId(device_id, Controller.CLASS_ID, 1)
+        # Gerätegruppe 1-8 für die Suche per Broadcast
+        self.group = device_id % 8
+
+    def controller_command(self, name: str, command: Any, broadcast: bool) -> list[Reply]:
+        if name == "GetModuleId":
+            if broadcast and command.groupMask.getValue() and not command.groupMask.getValue() & (1 << self.group):
+                return []
+            return [(0, ModuleId(f"sim {self.module_type}", 0, 1, 0, EFirmwareId.ESP32))]
+        if name == "GetConfiguration":
+            return [(0, default_data(ControllerConfiguration, deviceId=self.device_id, FCKE=0, startupDelay=0))]
+        if name == "GetRemoteObjects":
+            object_list = bytearray()
+            for object_id in self.channels:
+                object_list += bytes((getInstanceId(object_id), getClassId(object_id)))
+            return [(0, RemoteObjects(object_list))]
+        if name == "Ping":
+            return [(0, Pong(0))]
+        return []
+
+    def command(self, receiver: int, command: Any) -> list[tuple[int, float, Any]]:
+        """Replies to a command as (sender, delay, data)."""
+        name = type(command).__name__
+        broadcast = getDeviceId(receiver) == 0
+        if broadcast or receiver == self.controller_id:
+            return [(self.controller_id, delay, data) for delay, data in self.controller_command(name, command, broadcast)]
+        channel = self.channels.get(receiver)
+        if channel is None:
+            return []
+        if name == "GetStatus":
+            replies = [(0.0, channel.status())]
+        elif name == "GetConfiguration":
+            replies = [(0.0, channel.configuration())]
+        else:
+            replies = channel.command(name, command)
+        return [(channel.object_id, delay, data) for delay, data in replies if data is not None]
+
+
+def create_modules(count: int, first_device_id: int = 10000) -> list[SimulatedModule]:
+    """Modules of all types in turn."""
+    module_types = list(MODULE_TYPES)
+    return [SimulatedModule(first_device_id + index, module_types[index % len(module_types)]) for index in range(count)]
+
+
+@dataclass
+class SimulatorStatistics:
+    received: int = 0
+    dropped: int = 0
+    sent: int = 0
+
+
+class HausbusSimulator(asyncio.DatagramProtocol):
+    """Answers Haus-Bus commands of the modules with configurable latency and packet loss."""
+
+    def __init__(
+        self,
+        modules: list[SimulatedModule],
+        target: tuple[str, int] = (TARGET_HOST, UDP_PORT),
+        latency: float = 0.0,
+        loss: float = 0.0,
+        event_interval: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.modules = {module.device_id: module for module in modules}
+        self.target = target
+        self.latency = latency
+        self.loss = loss
+        self.event_interval = event_interval
+        self.statistics = SimulatorStatistics()
+        self._random = random.Random(seed)
+        self._transport: asyncio.DatagramTransport | None = None
+        self._events: asyncio.Task | None = None
+        self._counter = 0
+
+    async def start(self, host: str = SIMULATOR_HOST, port: int = UDP_PORT) -> None:
+        """Listen on host:port and start the periodic events."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, sock=sock)
+        if self.event_interval:
+            self._events = loop.create_task(self._send_events())
+        LOGGER.info("simulating %s modules on %s:%s", len(self.modules), host, port)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The address the simulator listens on."""
+        return self._transport.get_extra_info("sockname")
+
+    def close(self) -> None:
+        if self._events is not None:
+            self._events.cancel()
+        if self._transport is not None:
+            self._transport.close()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.statistics.received += 1
+        if self._lost():
+            return
+        # der echte Bus ist ein Broadcast, der Absender sieht seine Befehle wieder
+        self._transport.sendto(data, self.target)
+        try:
+            decoded = decode_frame(data)
+        except Exception:  # noqa: BLE001
+            LOGGER.debug("could not decode frame from %s", addr, exc_info=True)
+            return
+        if decoded is None:
+            return
+        _sender, receiver, command = decoded
+        device_id = getDeviceId(receiver)
+        modules = self.modules.values() if device_id == 0 else filter(None, [self.modules.get(device_id)])
+        loop = asyncio.get_running_loop()
+        for module in modules:
+            for sender, delay, reply in module.command(receiver, command):
+                loop.call_later(self.latency + delay, self._send, sender, reply)
+
+    def _lost(self) -> bool:
+        if self.loss and self._random.random() < self.loss:
+            self.statistics.dropped += 1
+            return True
+        return False
+
+    def _send(self, sender: int, data: Any) -> None:
+        if self._transport is None or self._transport.is_closing() or self._lost():
+            return
+        self._counter += 1
+        self._transport.sendto(build_frame(sender, 0, data, self._counter), self.target)
+        self.statistics.sent += 1
+
+    async def _send_events(self) -> None:
+        channels = [channel for module in self.modules.values() for channel in module.channels.values() if type(channel).periodic is not SimulatedChannel.periodic]
+        if not channels:
+            return
+        # Ereignisse gleichmäßig über das Intervall verteilen
+        pause = self.event_interval / len(channels)
+        while True:
+            for channel in channels:
+                await asyncio.sleep(pause)
+                self._send(channel.object_id, channel.periodic(self._random))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate Haus-Bus modules on localhost")
+    parser.add_argument("--modules", type=int, default=250)
+    parser.add_argument("--host", default=SIMULATOR_HOST, help="address the simulator listens on")
+    parser.add_argument("--target", default=TARGET_HOST, help="address of Home Assistant")
+    parser.add_argument("--latency", type=float, default=0.0, help="reply latency in ms")
+    parser.add_argument("--loss", type=float, default=0.0, help="share of lost frames, 0-1")
+    parser.add_argument("--event-interval", type=float, default=None, help="seconds in which every sensor and button sends one event")
+    parser.add_argument("--cover-travel-time", type=float, default=SimulatedCover.travel_time, help="seconds for a full cover travel")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    SimulatedCover.travel_time = args.cover_travel_time
+    simulator = HausbusSimulator(create_modules(args.modules), (args.target, UDP_PORT), args.latency / 1000, args.loss, args.event_interval)
+
+    async def run() -> None:
+        await simulator.start(args.host)
+        try:
+            while True:
+                await asyncio.sleep(10)
+                LOGGER.info("%s", simulator.statistics)
+        finally:
+            simulator.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from unittest.mock import MagicMock, patch
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.HausBusUtils import getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+
+from hausbus.availability import HausbusAvailability
+from hausbus.gateway import HausbusGateway
+from hausbus.switch import HausbusSwitch
+
+
+def check_at(availability: HausbusAvailability, now: float) -> list[int]:
+    with patch("hausbus.availability.time.monotonic", return_value=now):
+        return availability.check()
+
+
+def test_silent_devices_are_probed_spread_over_the_checks():
+    availability = HausbusAvailability(100, 1000, MagicMock())
+    with patch("hausbus.availability.time.monotonic", return_value=0):
+        for device_id in range(100):
+            availability.add_device(device_id)
+    # Gerät 0 meldet sich später noch einmal
+    with patch("hausbus.availability.time.monotonic", return_value=50):
+        availability.seen(0)
+
+    # 100 Geräte, alle 10 s geprüft: 10 Pings je Prüfung reichen für einen Durchlauf in 100 s
+    assert check_at(availability, 99) == []
+    assert check_at(availability, 100) == list(range(1, 11))
+    assert check_at(availability, 110) == list(range(11, 21))
+
+    probed = set()
+    for now in range(120, 200, 10):
+        probed.update(check_at(availability, now))
+    assert probed == set(range(21, 100)) | {0}
+
+
+def test_devices_become_unavailable_and_come_back_with_their_next_message():
+    on_change = MagicMock()
+    availability = HausbusAvailability(100, 300, on_change)
+    with patch("hausbus.availability.time.monotonic", return_value=0):
+        availability.add_device(1234)
+
+    check_at(availability, 299)
+    on_change.assert_not_called()
+    check_at(availability, 300)
+    check_at(availability, 310)
+    on_change.assert_called_once_with(1234, False)
+    assert not availability.is_available(1234)
+
+    with patch("hausbus.availability.time.monotonic", return_value=320):
+        availability.seen(1234)
+        availability.seen(1234)
+    on_change.assert_called_with(1234, True)
+    assert on_change.call_count == 2
+
+
+def test_gateway_flips_all_entities_of_a_device_with_one_flush():
+    hass = MagicMock()
+    hass.data = {}
+    with patch("hausbus.gateway.HomeServer", return_value=MagicMock(**{"is_internal_device.return_value": False})):
+        gateway = HausbusGateway(hass, MagicMock())
+    try:
+        switches = [HausbusSwitch(Schalter.create(1234, instance), MagicMock(device_id="1234", special_type=0)) for instance in (1, 2)]
+        gateway.channels["1234"] = {(str(19), str(instance)): switch for instance, switch in enumerate(switches)}
+        for switch in switches:
+            switch.platform = MagicMock()
+            switch.platform.config_entry.runtime_data.gateway = gateway
+        gateway.availability.add_device(1234)
+
+        check_at(gateway.availability, 10**6)
+        assert [switch.available for switch in switches] == [False, False]
+        # beide Entities werden in einem Takt geschrieben
+        hass.loop.call_soon_threadsafe.assert_called_once()
+
+        gateway.busDataReceived(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(0)))
+        assert [switch.available for switch in switches] == [True, True]
+    finally:
+        gateway.shutdown()
@@ -0,0 +1,85 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+# nur die Benchmarks: pytest hausbus/tests/test_benchmark.py --benchmark-only
+import sys
+import os
+import subprocess
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+
+from pyhausbus.HausBusUtils import getClassId
+from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
+
+from hausbus.channels import CHANNEL_PLATFORMS
+from hausbus.tests.bench import BenchGateway
+
+DEVICES = 20
+CHANNELS_PER_TYPE = 4
+MESSAGES = 5000
+
+
+@pytest.fixture(scope="module")
+def bench():
+    bench = BenchGateway()
+    bench.discover(DEVICES, CHANNELS_PER_TYPE)
+    yield bench
+    bench.close()
+
+
+def test_dispatch_at_maximum_speed(benchmark, bench):
+    messages = bench.generate(MESSAGES)
+
+    def setup():
+        bench.flush()
+        return (messages,), {"flush": False}
+
+    result = benchmark.pedantic(bench.replay, setup=setup, rounds=5)
+
+    benchmark.extra_info.update(result.as_dict())
+    assert result.messages == MESSAGES
+    # Zustände werden gesammelt geschrieben, nur Taster wecken den Loop je Meldung (Event, Binary-Sensor, Trigger)
+    buttons = sum(getClassId(message.getSenderObjectId()) == Taster.CLASS_ID for message in messages)
+    assert result.wakeups - 3 * buttons < (MESSAGES - buttons) / 2
+
+
+@pytest.mark.parametrize("rate", [500, 2000])
+def test_dispatch_at_bus_rate(benchmark, bench, rate):
+    messages = bench.generate(rate // 2, seed=rate)
+
+    result = benchmark.pedantic(bench.replay, args=(messages, rate), kwargs={"trace_memory": True}, rounds=1, iterations=1)
+
+    benchmark.extra_info.update(result.as_dict())
+    assert result.state_writes > 0
+    assert result.peak_memory is not None
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import times in microseconds of the modules loaded by importing module in a fresh interpreter.
+
+    Home Assistant itself is imported before, so only the integration is measured.
+    """
+    code = f"import homeassistant.config_entries, homeassistant.helpers.config_validation; import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _self, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_integration_import_time(benchmark):
+    times = benchmark.pedantic(import_times, args=("hausbus",), rounds=3, iterations=1)
+
+    benchmark.extra_info["hausbus_import_ms"] = times["hausbus"] / 1000
+    # Plattformen und Proxies der Channels werden erst mit der ersten Plattform geladen
+    assert not {f"hausbus.{platform}" for platform in ("light", "switch", "cover", "binary_sensor", "event", "number", "sensor", "button")} & times.keys()
+    assert not {f"pyhausbus.de.hausbus.homeassistant.proxy.{name}" for name in CHANNEL_PLATFORMS} & times.keys()
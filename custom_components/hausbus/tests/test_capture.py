@@ -0,0 +1,72 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID, getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.EState import EState
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.MEventMask import MEventMask
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.MOptionMask import MOptionMask
+
+from hausbus.capture import HausbusBusCapture, capture_files, read_capture
+from hausbus.tests.replay import load_capture, replay_capture
+
+
+def test_capture_round_trip_and_rotation(tmp_path):
+    filename = str(tmp_path / "capture.bin")
+    capture = HausbusBusCapture(filename, 400, 2)
+    try:
+        for duration in range(20):
+            capture.capture(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(duration)))
+        capture.capture(BusDataMessage(getObjectId(1234, 16, 1), 0, EvCovered(EState.PRESSED)))
+        capture.capture(BusDataMessage(getObjectId(HOMESERVER_DEVICE_ID, 0, 1), getObjectId(1234, 19, 1), EvOn(7)))
+    finally:
+        capture.close()
+
+    files = capture_files(filename)
+    assert files == [f"{filename}.2", f"{filename}.1", filename]
+    assert all(os.path.getsize(path) <= 400 for path in files)
+
+    records = [record for path in files for record in read_capture(path)]
+    # die älteste Datei ist weggefallen, die Reihenfolge bleibt
+    durations = [record.message.getData().getDuration() for record in records if isinstance(record.message.getData(), EvOn)]
+    assert durations == sorted(durations[:-1]) + [7]
+    assert [record.timestamp for record in records] == sorted(record.timestamp for record in records)
+    covered, echo = records[-2:]
+    assert covered.message.getData().getState() is EState.PRESSED
+    assert (covered.sent, echo.sent) == (False, True)
+
+
+def test_replay_of_a_capture_reaches_the_entities(tmp_path):
+    filename = str(tmp_path / "capture.bin")
+    capture = HausbusBusCapture(filename, 1024 * 1024, 1)
+    for duration in range(10):
+        capture.capture(BusDataMessage(getObjectId(1234, 19, duration % 2 + 1), 0, EvOn(duration)))
+    capture.close()
+
+    result = replay_capture(load_capture(filename), 0)
+
+    assert result.messages == 10
+    assert result.state_writes >= 2
+
+
+def test_capture_writes_only_known_value_types(tmp_path, caplog):
+    filename = str(tmp_path / "capture.bin")
+    capture = HausbusBusCapture(filename, 1024 * 1024, 1)
+    capture.capture(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(1.5)))
+    capture.capture(BusDataMessage(getObjectId(1234, 16, 1), 0, Configuration(100, 50, MEventMask(0x21), MOptionMask(1), 40)))
+    capture.close()
+
+    # der Schreib-Thread läuft nach dem Fehler weiter
+    assert "could not capture" in caplog.text
+    (record,) = read_capture(filename)
+    configuration = record.message.getData()
+    assert configuration.getEventMask().isNotifyOnFree()
+    assert configuration.getOptionMask().isInverted()
+    assert configuration.getDebounceTime() == 40
@@ -0,0 +1,78 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from homeassistant.exceptions import HomeAssistantError
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOff import EvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+
+from hausbus.confirmation import HausbusConfirmations
+from hausbus.statistics import HausbusBusStatistics
+from hausbus.switch import HausbusSwitch
+
+
+def create_switch(submit) -> HausbusSwitch:
+    statistics = HausbusBusStatistics()
+    channel = Schalter.create(1234, 1)
+    # keine echten Bus-Aufrufe
+    channel.on = MagicMock()
+    channel.off = MagicMock()
+    switch = HausbusSwitch(channel, MagicMock(device_id="1234", special_type=0))
+    switch.hass = MagicMock(loop=asyncio.get_running_loop())
+    switch.platform = MagicMock()
+    gateway = switch.platform.config_entry.runtime_data.gateway
+    gateway.options = {"confirmation_timeout": 0.5}
+    gateway.statistics = statistics
+    gateway.confirmations = HausbusConfirmations(submit, statistics.record_round_trip)
+    return switch
+
+
+@pytest.mark.asyncio
+async def test_service_waits_for_the_confirming_event():
+    sent = []
+    switch = create_switch(sent.append)
+    object_id = switch._channel.getObjectId()
+    confirmations = switch.gateway.confirmations
+
+    call = asyncio.ensure_future(switch.async_switch_on(0, 0, wait_for_confirmation=True))
+    await asyncio.sleep(0)
+    # Events vor dem Senden und andere Events bestätigen den Befehl nicht
+    confirmations.reply_received(object_id, EvOn(0))
+    sent.pop()()
+    switch._channel.on.assert_called_once_with(0, 0)
+    confirmations.reply_received(object_id, EvOff())
+    assert not call.done()
+
+    # die Bestätigung kommt im Bus-Thread an
+    thread = threading.Thread(target=confirmations.reply_received, args=(object_id, EvOn(0)))
+    thread.start()
+    thread.join()
+
+    response = await call
+    assert response["round_trip_time"] >= 0
+    statistics = switch.gateway.statistics.round_trip(1234)
+    assert statistics["confirmed"] == 1
+    assert statistics["unconfirmed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_service_call_fails_and_is_counted():
+    switch = create_switch(lambda send: send())
+    switch.gateway.options = {"confirmation_timeout": 0.05}
+
+    with pytest.raises(HomeAssistantError):
+        await switch.async_switch_off(0, wait_for_confirmation=True)
+    assert switch.gateway.statistics.as_dict()["devices"]["1234"]["unconfirmed"] == 1
+
+    # ohne wait_for_confirmation gibt es keine Antwort
+    assert await switch.async_switch_off(0) is None
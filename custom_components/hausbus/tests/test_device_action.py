@@ -0,0 +1,41 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from hausbus.device_action import async_get_action_capabilities, async_get_actions
+from hausbus.schemas import ACTION_SCHEMAS
+
+
+def registry_entry(entity_id: str, hausbus_type: str) -> MagicMock:
+    entry = MagicMock(entity_id=entity_id, options={"hausbus": {"hausbus_type": hausbus_type}}, original_name=entity_id)
+    entry.name = None
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_actions_are_read_from_the_device_index():
+    entries = {"switch.relais_1": registry_entry("switch.relais_1", "HausbusSwitch"), "cover.rollo": registry_entry("cover.rollo", "HausbusCover")}
+    registry = MagicMock()
+    registry.async_get = entries.get
+    hass = MagicMock()
+    hass.data = {"hausbus": {"device_entities": {"dev1": {"switch.relais_1"}}}}
+
+    with patch("hausbus.device_action.er.async_get", return_value=registry), patch("hausbus.device_action.er.async_entries_for_device") as entries_for_device:
+        actions = await async_get_actions(hass, "dev1")
+
+    entries_for_device.assert_not_called()
+    assert [action["type"] for action in actions] == ["switch_off switch.relais_1", "switch_on switch.relais_1", "switch_toggle switch.relais_1"]
+
+
+@pytest.mark.asyncio
+async def test_action_capabilities_use_prebuilt_schemas():
+    capabilities = await async_get_action_capabilities(MagicMock(), {"type": "dimmer_start_ramp Dimmer 1"})
+
+    assert capabilities["extra_fields"] is ACTION_SCHEMAS["dimmer_start_ramp"]
+    assert await async_get_action_capabilities(MagicMock(), {"type": "unknown Dimmer 1"}) == {}
@@ -0,0 +1,46 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import Event
+
+from hausbus.device_trigger import async_attach_trigger
+
+
+def trigger_config(device_id: str, trigger_type: str, subtype: str) -> dict:
+    return {"platform": "device", "domain": "hausbus", "device_id": device_id, "type": trigger_type, "subtype": subtype}
+
+
+@pytest.mark.asyncio
+async def test_one_listener_calls_only_matching_actions():
+    hass = MagicMock()
+    hass.data = {}
+    tasks = []
+    hass.async_create_task = lambda coro: tasks.append(coro)
+    actions = [AsyncMock() for _ in range(3)]
+
+    detach = [
+        await async_attach_trigger(hass, trigger_config("dev1", "button_pressed", "Taster 1"), actions[0], {}),
+        await async_attach_trigger(hass, trigger_config("dev1", "button_pressed", "Taster 2"), actions[1], {}),
+        await async_attach_trigger(hass, trigger_config("dev2", "button_pressed", "Taster 1"), actions[2], {}),
+    ]
+    hass.bus.async_listen.assert_called_once()
+    listener = hass.bus.async_listen.call_args.args[1]
+
+    listener(Event("hausbus_button_event", {"device_id": "dev1", "type": "button_pressed", "subtype": "Taster 2"}))
+    for task in tasks:
+        await task
+
+    actions[0].assert_not_called()
+    actions[1].assert_awaited_once_with(trigger_config("dev1", "button_pressed", "Taster 2"))
+    actions[2].assert_not_called()
+
+    for unsub in detach:
+        unsub()
+    hass.bus.async_listen.return_value.assert_called_once()
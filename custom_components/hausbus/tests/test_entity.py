@@ -0,0 +1,167 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOff import EvOff as SchalterEvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn as SchalterEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvClicked import EvClicked
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvFree import EvFree
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.params.EState import EState
+
+from hausbus.binary_sensor import HausbusBinarySensor
+from hausbus.entity import HausbusEntity
+from hausbus.event import HausBusEvent
+from hausbus.switch import HausbusSwitch
+
+
+def create_entity() -> HausbusEntity:
+    channel = Schalter.create(1234, 1)
+    channel.setName("Relais 1")
+    entity = HausbusEntity(channel, MagicMock(device_id="1234", special_type=0))
+    entity.hass = MagicMock(loop=asyncio.get_running_loop())
+    entity.platform = MagicMock()
+    entity.platform.config_entry.runtime_data.gateway.options = {"configuration_timeout": 1.0}
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_are_woken_by_configuration():
+    entity = create_entity()
+    scheduler = entity.gateway.request_scheduler
+
+    waiters = [asyncio.ensure_future(entity.ensure_configuration()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert not any(waiter.done() for waiter in waiters)
+
+    # die Konfiguration kommt im Bus-Thread an
+    thread = threading.Thread(target=entity.set_configuration, args=(Configuration(0, 0, 0, 0, 0),))
+    thread.start()
+    thread.join()
+
+    assert await asyncio.gather(*waiters) == [True, True, True]
+    assert scheduler.request.call_count == 3
+    assert await entity.ensure_configuration()
+
+
+@pytest.mark.asyncio
+async def test_configuration_wait_times_out():
+    entity = create_entity()
+    entity.platform.config_entry.runtime_data.gateway.options = {"configuration_timeout": 0.05}
+
+    assert not await entity.ensure_configuration()
+
+
+def create_switch(hass: MagicMock) -> HausbusSwitch:
+    switch = HausbusSwitch(Schalter.create(1234, 1), MagicMock(device_id="1234", special_type=0))
+    switch.hass = hass
+    switch.platform = MagicMock()
+    switch.platform.config_entry.runtime_data.gateway.options = {"optimistic": True, "confirmation_timeout": 0.05}
+    switch.async_write_ha_state = MagicMock()
+    switch.schedule_update_ha_state = MagicMock()
+    return switch
+
+
+@pytest.mark.asyncio
+async def test_optimistic_state_is_confirmed_by_hardware():
+    switch = create_switch(MagicMock(loop=asyncio.get_running_loop()))
+
+    await asyncio.get_running_loop().run_in_executor(None, switch.turn_on)
+    assert switch.is_on
+    switch.gateway.command_sender.submit.assert_called_once()
+    await asyncio.sleep(0)
+    switch.async_write_ha_state.assert_called_once()
+
+    switch.handle_event(SchalterEvOn(0))
+    await asyncio.sleep(0.1)
+    assert switch.is_on
+    switch.async_write_ha_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_optimistic_state_is_rolled_back():
+    switch = create_switch(MagicMock(loop=asyncio.get_running_loop()))
+
+    with patch("hausbus.entity.ir") as issue_registry:
+        switch.turn_on()
+        await asyncio.sleep(0.1)
+        assert not switch.is_on
+        assert switch.async_write_ha_state.call_count == 2
+        issue_registry.async_create_issue.assert_called_once()
+
+        # meldet sich der Kanal wieder, verschwindet das Problem
+        switch.handle_event(SchalterEvOn(0))
+        await asyncio.sleep(0)
+        issue_registry.async_delete_issue.assert_called_once()
+    assert switch.is_on
+
+
+@pytest.mark.asyncio
+async def test_stale_report_does_not_confirm_optimistic_state():
+    switch = create_switch(MagicMock(loop=asyncio.get_running_loop()))
+
+    with patch("hausbus.entity.ir") as issue_registry:
+        switch.turn_on()
+        # ein vor dem Befehl gesendetes EvOff bestätigt das Einschalten nicht
+        switch.handle_event(SchalterEvOff())
+        assert switch.is_on
+        await asyncio.sleep(0.1)
+
+        assert not switch.is_on
+        issue_registry.async_create_issue.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_report_after_the_command_is_the_real_state():
+    switch = create_switch(MagicMock(loop=asyncio.get_running_loop()))
+    switch._channel.on = MagicMock()
+    switch.gateway.command_sender.submit.side_effect = lambda send: send()
+
+    with patch("hausbus.entity.ir") as issue_registry:
+        switch.turn_on()
+        switch._channel.on.assert_called_once_with(0, 0)
+        # z.B. ein Wandtaster schaltet nach dem Befehl wieder aus
+        switch.handle_event(SchalterEvOff())
+        assert not switch.is_on
+        await asyncio.sleep(0.1)
+
+        assert not switch.is_on
+        issue_registry.async_create_issue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_every_event_of_a_press_is_written():
+    loop = asyncio.get_running_loop()
+    device = MagicMock(device_id="1234", special_type=0)
+    event = HausBusEvent(Taster.create(1234, 17), device)
+    binary_sensor = HausbusBinarySensor(Taster.create(1234, 18), device)
+    written = []
+    for entity in (event, binary_sensor):
+        entity.hass = MagicMock(loop=loop)
+        entity.platform = MagicMock()
+    event.async_write_ha_state = lambda: written.append(event.state_attributes["event_type"])
+    binary_sensor.async_write_ha_state = lambda: written.append(binary_sensor.is_on)
+
+    # ein Tastendruck innerhalb eines Ticks aus dem Bus-Thread
+    def press():
+        for data in (EvCovered(EState.PRESSED), EvClicked(EState.PRESSED), EvFree(EState.RELEASED)):
+            event.handle_event(data)
+        binary_sensor.handle_event(EvCovered(EState.PRESSED))
+        binary_sensor.handle_event(EvFree(EState.RELEASED))
+
+    await loop.run_in_executor(None, press)
+    await asyncio.sleep(0)
+
+    assert written == ["button_pressed", "button_clicked", "button_released", True, False]
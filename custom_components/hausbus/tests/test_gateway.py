@@ -0,0 +1,279 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.HausBusUtils import HOMESERVER_DEVICE_ID, getObjectId
+from pyhausbus.ObjectId import ObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy.Schalter import Schalter
+from pyhausbus.de.hausbus.homeassistant.proxy.Taster import Taster
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EFirmwareId import EFirmwareId
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.taster.data.EvCovered import EvCovered
+
+from hausbus import binary_sensor, event, switch
+from hausbus.bus_trace import HausbusBusTrace
+from hausbus.gateway import HausbusGateway
+from hausbus.switch import HausbusSwitch
+
+CHANNEL_ENTITIES = {"switch": switch.CHANNEL_ENTITIES, "binary_sensor": binary_sensor.CHANNEL_ENTITIES, "event": event.CHANNEL_ENTITIES}
+
+
+@pytest.fixture
+def gateway():
+    hass = MagicMock()
+    hass.data = {}
+    home_server = MagicMock()
+    home_server.is_internal_device.side_effect = lambda device_id: device_id in {HOMESERVER_DEVICE_ID, 9999, 12222}
+    # Templates.get_instance startet den Lade-Thread von pyhausbus
+    with (
+        patch("hausbus.gateway.HomeServer", return_value=home_server),
+        patch("hausbus.gateway.Templates.get_instance") as templates,
+        patch("hausbus.device.Templates.get_instance") as device_templates,
+    ):
+        templates.return_value.get_feature_name_from_template.return_value = None
+        device_templates.return_value.getModuleName.return_value = "model"
+        gateway = HausbusGateway(hass, MagicMock())
+        yield gateway
+        gateway.shutdown()
+
+
+def test_dispatch_calls_handlers_in_order(gateway):
+    object_id = getObjectId(1234, 19, 1)
+    calls = []
+    gateway.add_dispatch_handler(object_id, lambda data: calls.append(("first", data)))
+    gateway.add_dispatch_handler(object_id, lambda data: calls.append(("second", data)))
+
+    data = EvOn(0)
+    gateway.busDataReceived(BusDataMessage(object_id, 0, data))
+
+    assert calls == [("first", data), ("second", data)]
+
+
+def test_dispatch_ignores_unknown_sender(gateway):
+    handler = MagicMock()
+    gateway.add_dispatch_handler(getObjectId(1234, 19, 1), handler)
+
+    gateway.busDataReceived(BusDataMessage(getObjectId(1234, 19, 2), 0, EvOn(0)))
+
+    handler.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_remove_device_drops_dispatch_handlers(gateway):
+    handler = MagicMock()
+    other_handler = MagicMock()
+    gateway.devices["1234"] = MagicMock(device_id="1234")
+    gateway.channels["1234"] = {}
+    gateway.add_dispatch_handler(getObjectId(1234, 19, 1), handler)
+    gateway.add_dispatch_handler(getObjectId(4321, 19, 1), other_handler)
+
+    assert await gateway.removeDevice("1234")
+    gateway.busDataReceived(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(0)))
+    gateway.busDataReceived(BusDataMessage(getObjectId(4321, 19, 1), 0, EvOn(0)))
+
+    handler.assert_not_called()
+    other_handler.assert_called_once()
+
+
+def create_configuration(fcke: int = 0x30, startup_delay: int = 0) -> Configuration:
+    return Configuration(startup_delay, None, 1234, 0, None, None, None, None, None, None, None, None, 0, 0, 0, fcke)
+
+
+@pytest.mark.asyncio
+async def test_new_device_adds_entities_in_one_call_per_platform(gateway):
+    tasks = []
+    gateway.hass.create_task = lambda coro, name=None: tasks.append(coro)
+    gateway.async_register_device = AsyncMock()
+    listeners = {domain: AsyncMock() for domain in ("switch", "binary_sensor", "event")}
+    for domain, listener in listeners.items():
+        gateway.register_platform_add_channel_callback(listener, domain, CHANNEL_ENTITIES[domain])
+
+    channels = [Schalter.create(1234, 1), Schalter.create(1234, 2), Taster.create(1234, 16)]
+    for channel in channels:
+        channel.setName(f"Channel {ObjectId(channel.getObjectId()).getInstanceId()}")
+    gateway.newDeviceDetected(1234, "model", ModuleId("test", 0, 1, 0, EFirmwareId.ESP32), create_configuration(), channels)
+
+    # der Bus-Thread übergibt genau eine Aufgabe an den Loop
+    assert len(tasks) == 1
+    await tasks[0]
+
+    assert [len(listener.call_args.args[0]) for listener in listeners.values()] == [2, 1, 1]
+    for listener in listeners.values():
+        listener.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_platform_is_set_up_when_first_channel_needs_it(gateway):
+    tasks = []
+    gateway.hass.create_task = lambda coro, name=None: tasks.append(coro)
+    gateway.async_register_device = AsyncMock()
+    switch_listener = AsyncMock()
+
+    async def forward_entry_setups(entry, platforms):
+        gateway.register_platform_add_channel_callback(switch_listener, "switch", switch.CHANNEL_ENTITIES)
+
+    gateway.hass.config_entries.async_forward_entry_setups = AsyncMock(side_effect=forward_entry_setups)
+
+    channel = Schalter.create(1234, 1)
+    channel.setName("Relais 1")
+    gateway.newDeviceDetected(1234, "model", ModuleId("test", 0, 1, 0, EFirmwareId.ESP32), create_configuration(), [channel])
+    for task in tasks:
+        await task
+
+    gateway.hass.config_entries.async_forward_entry_setups.assert_awaited_once_with(gateway.config_entry, ["switch"])
+    assert gateway.platforms == {"switch"}
+    assert [entity.name for entity in switch_listener.call_args.args[0]] == ["Relais 1"]
+
+
+@pytest.mark.asyncio
+async def test_restore_topology_and_reconcile_vanished_channels(gateway):
+    tasks = []
+    gateway.hass.create_task = lambda coro, name=None: tasks.append(coro)
+    gateway.async_register_device = AsyncMock()
+    switch_listener = AsyncMock()
+    gateway.register_platform_add_channel_callback(switch_listener, "switch", switch.CHANNEL_ENTITIES)
+    gateway.topology.async_load = AsyncMock(return_value={
+        "1234": {
+            "model_type": "model",
+            "module_name": "test",
+            "major_release": 1,
+            "minor_release": 0,
+            "firmware_id": "ESP32",
+            "fcke": 0x30,
+            "special_type": 0,
+            "channels": [[19, 1, "Relais 1"], [19, 2, "Relais 2"]],
+        }
+    })
+    gateway.hass.async_add_executor_job = AsyncMock(side_effect=lambda target, *args: target(*args))
+
+    await gateway.async_restore_topology()
+    gateway.hass.async_add_executor_job.assert_awaited_once()
+    await tasks[0]
+
+    switches = switch_listener.call_args.args[0]
+    assert [switch.name for switch in switches] == ["Relais 1", "Relais 2"]
+
+    # Relais 2 fehlt bei der Live-Discovery
+    gateway.reconcile_channels("1234", {getObjectId(1234, 19, 1)})
+    assert [switch.available for switch in switches] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_new_inputs_are_added_to_the_restored_ones(gateway):
+    gateway.async_register_device = AsyncMock()
+    device = MagicMock(device_id="1234", hass_device_entry_id="dev1")
+    gateway.devices["1234"] = device
+    gateway.channels["1234"] = {}
+
+    await gateway.async_add_device_entities(1234, {}, device, {}, {}, [], ["Taster 1", "Taster 2"])
+    # später meldet das Gerät einen weiteren Kanal
+    await gateway.async_add_device_entities(1234, {}, device, {}, {}, [], ["Taster 3"])
+    assert gateway.hass.data["hausbus"]["dev1"]["inputs"] == ["Taster 1", "Taster 2", "Taster 3"]
+
+    assert await gateway.removeDevice("1234")
+    assert "dev1" not in gateway.hass.data["hausbus"]
+
+
+@pytest.mark.asyncio
+async def test_state_writes_are_coalesced_per_tick(gateway):
+    loop = asyncio.get_running_loop()
+    gateway.hass.loop = MagicMock(wraps=loop)
+    gateway._state_write_interval = 0.01
+    entities = [MagicMock(), MagicMock()]
+
+    # viele Meldungen aus dem Bus-Thread
+    def receive():
+        for _ in range(50):
+            for entity in entities:
+                gateway.schedule_state_write(entity)
+
+    await loop.run_in_executor(None, receive)
+    await asyncio.sleep(0.05)
+
+    assert gateway.hass.loop.call_soon_threadsafe.call_count == 1
+    for entity in entities:
+        entity.async_write_ha_state.assert_called_once()
+
+
+def test_statistics_count_received_unknown_and_sent_messages(gateway):
+    gateway.add_dispatch_handler(getObjectId(1234, 19, 1), MagicMock())
+
+    gateway.busDataReceived(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(0)))
+    gateway.busDataReceived(BusDataMessage(getObjectId(1234, 19, 2), 0, EvOn(0)))
+    # eigener Befehl, der per Broadcast zurückkommt
+    gateway.busDataReceived(BusDataMessage(getObjectId(HOMESERVER_DEVICE_ID, 0, 1), getObjectId(4321, 19, 1), EvOn(0)))
+    # andere interne Geräte werden nicht gezählt
+    gateway.busDataReceived(BusDataMessage(getObjectId(9999, 19, 1), 0, EvOn(0)))
+
+    statistics = gateway.statistics.as_dict()
+    assert (statistics["received"], statistics["unknown"], statistics["sent"]) == (2, 1, 1)
+    assert statistics["devices"]["1234"]["received"] == 2
+    assert statistics["devices"]["4321"]["sent"] == 1
+    assert statistics["message_types"] == {"EvOn": 2}
+    assert sum(statistics["handler_latency_ms"].values()) == 2
+
+
+def test_bus_trace_writes_one_record_per_message(tmp_path):
+    trace = HausbusBusTrace(str(tmp_path / "trace.log"), 1024 * 1024, 1)
+    try:
+        trace.trace(BusDataMessage(getObjectId(1234, 19, 1), 0, EvOn(5)))
+    finally:
+        trace.close()
+
+    record = json.loads((tmp_path / "trace.log").read_text())
+    assert (record["sender"], record["type"], record["data"]) == ("1234.19.1", "EvOn", {"duration": 5})
+
+
+@pytest.mark.asyncio
+async def test_button_trigger_name_is_resolved_once_templates_are_loaded(gateway):
+    tasks = []
+    gateway.hass.create_task = lambda coro, name=None: tasks.append(coro)
+    gateway.async_register_device = AsyncMock()
+    for domain in ("binary_sensor", "event"):
+        gateway.register_platform_add_channel_callback(AsyncMock(), domain, CHANNEL_ENTITIES[domain])
+
+    taster = Taster.create(1234, 16)
+    taster.setName("Taster 1")
+    with patch("hausbus.gateway.Templates.get_instance") as templates:
+        # pyhausbus lädt die Templates noch im Hintergrund
+        lookup = templates.return_value.get_feature_name_from_template
+        lookup.return_value = None
+        gateway.newDeviceDetected(1234, "model", ModuleId("test", 0, 1, 0, EFirmwareId.ESP32), create_configuration(), [taster])
+        await tasks[0]
+
+        gateway.hass.loop = MagicMock()
+        lookup.return_value = "Taster 1"
+        gateway.busDataReceived(BusDataMessage(taster.getObjectId(), 0, EvCovered(0)))
+        lookups = lookup.call_count
+        gateway.busDataReceived(BusDataMessage(taster.getObjectId(), 0, EvCovered(0)))
+
+        assert lookup.call_count == lookups
+    gateway.hass.loop.call_soon_threadsafe.assert_any_call(
+        gateway.hass.bus.async_fire, "hausbus_button_event", {"device_id": None, "type": "button_pressed", "subtype": "Taster 1"}
+    )
+
+
+def test_send_burst_sends_pre_resolved_calls_in_order(gateway):
+    switch = HausbusSwitch(Schalter.create(1234, 1), MagicMock(device_id="1234", special_type=0))
+    calls = []
+    switch._channel = MagicMock()
+    switch._channel.off.side_effect = lambda delay: calls.append(("off", delay))
+    sends = [switch.bulk_command("off", None), lambda: calls.append("second")]
+
+    with patch("hausbus.gateway.time.sleep") as sleep:
+        gateway.send_burst(sends, 0.005)
+
+    assert calls == [("off", 0), "second"]
+    sleep.assert_called_once_with(0.005)
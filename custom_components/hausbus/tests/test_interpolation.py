@@ -0,0 +1,128 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pyhausbus.de.hausbus.homeassistant.proxy.Dimmer import Dimmer
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.Configuration import Configuration as DimmerConfiguration
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOff import EvOff as DimmerEvOff
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvOn import EvOn as DimmerEvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.data.EvStart import EvStart as DimmerEvStart
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.params.EDirection import EDirection as DimmerDirection
+from pyhausbus.de.hausbus.homeassistant.proxy.dimmer.params.EMode import EMode as DimmerMode
+from pyhausbus.de.hausbus.homeassistant.proxy.Rollladen import Rollladen
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvClosed import EvClosed
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.data.EvStart import EvStart
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.params.EDirection import EDirection
+from pyhausbus.de.hausbus.homeassistant.proxy.rollladen.params.MOptions import MOptions
+
+from hausbus.cover import HausbusCover
+from hausbus.interpolation import Movement
+from hausbus.light import HausbusDimmerLight
+
+
+class FakeLoop:
+    """Runs call_soon_threadsafe directly and keeps the call_later callbacks for the test."""
+
+    def __init__(self) -> None:
+        self.timers = []
+
+    def call_soon_threadsafe(self, callback, *args):
+        callback(*args)
+
+    def call_later(self, delay, callback, *args):
+        self.timers.append((delay, callback, args))
+
+    def run_timer(self, now: float) -> None:
+        _delay, callback, args = self.timers.pop(0)
+        with patch("hausbus.interpolation.time.monotonic", return_value=now):
+            callback(*args)
+
+
+def test_movement_stops_at_target():
+    movement = Movement(80, 20, 10, 100)
+
+    assert [movement.value_at(now) for now in (90, 100, 103, 106, 200)] == [80, 80, 50, 20, 20]
+
+
+@pytest.fixture
+def cover():
+    cover = HausbusCover(Rollladen.create(1234, 1), MagicMock(device_id="1234", special_type=0))
+    cover.hass = MagicMock()
+    cover.hass.loop = FakeLoop()
+    cover.platform = MagicMock()
+    cover.platform.config_entry.runtime_data.gateway.options = {"interpolation_interval": 1.0}
+    cover.async_write_ha_state = MagicMock()
+    cover.schedule_update_ha_state = MagicMock()
+    # Fahrzeit 20 s zu, 40 s auf; Haus-Bus zählt 100 als geschlossen
+    cover.handle_event(Configuration(20, 40, MOptions(0)))
+    cover.handle_event(EvClosed(100))
+    return cover
+
+
+def test_cover_position_is_interpolated_while_moving(cover):
+    loop = cover.hass.loop
+    with patch("hausbus.interpolation.time.monotonic", return_value=0):
+        cover.handle_event(EvStart(EDirection.TO_OPEN))
+
+    loop.run_timer(1)
+    loop.run_timer(10)
+    assert cover.current_cover_position == 25
+    assert cover.async_write_ha_state.call_count == 2
+
+    # der gemeldete Wert der Hardware beendet die Schätzung
+    cover.handle_event(EvClosed(70))
+    loop.run_timer(11)
+    assert cover.current_cover_position == 30
+    assert loop.timers == []
+
+
+def test_cover_interpolation_stops_at_requested_position(cover):
+    loop = cover.hass.loop
+    cover._requested_position = 10
+    with patch("hausbus.interpolation.time.monotonic", return_value=0):
+        cover.handle_event(EvStart(EDirection.TO_OPEN))
+
+    loop.run_timer(2)
+    loop.run_timer(5)
+    assert cover.current_cover_position == 10
+    assert loop.timers == []
+
+
+def test_dimmer_ramp_brightness_is_interpolated():
+    light = HausbusDimmerLight(Dimmer.create(1234, 1), MagicMock(device_id="1234", special_type=0))
+    light.hass = MagicMock()
+    light.hass.loop = loop = FakeLoop()
+    light.platform = MagicMock()
+    light.platform.config_entry.runtime_data.gateway.options = {"interpolation_interval": 1.0}
+    light.async_write_ha_state = MagicMock()
+    light.schedule_update_ha_state = MagicMock()
+    # Dimmbereich 20 % bis 80 %, die Rampenzeit 120 * 50 ms = 6 s gilt für 0-100 %
+    light.handle_event(DimmerConfiguration(DimmerMode.DIMM_CR, 0, 120, 20, 80))
+    light.handle_event(DimmerEvOff())
+
+    with patch("hausbus.interpolation.time.monotonic", return_value=0):
+        light.handle_event(DimmerEvStart(DimmerDirection.TO_LIGHT))
+    loop.run_timer(3)
+    assert light.is_on
+    assert light.brightness == light.percent_to_ha_brightness(70)
+
+    # die Hardware meldet die echte Helligkeit
+    light.handle_event(DimmerEvOn(40, 0))
+    loop.run_timer(4)
+    assert light.brightness == 0.4 * 255
+    assert loop.timers == []
+
+    # TOGGLE läuft entgegengesetzt zur letzten Rampe bis zum Anfang des Dimmbereichs
+    with patch("hausbus.interpolation.time.monotonic", return_value=10):
+        light.handle_event(DimmerEvStart(DimmerDirection.TOGGLE))
+    loop.run_timer(20)
+    assert light.brightness == light.percent_to_ha_brightness(20)
+    assert loop.timers == []
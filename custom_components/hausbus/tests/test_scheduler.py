@@ -0,0 +1,95 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from pyhausbus.HausBusUtils import getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Status import Status
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Configuration import Configuration
+
+from hausbus.scheduler import HausbusRequestScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = HausbusRequestScheduler(1000, 1, 0.05, 1)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+    scheduler.join(1)
+
+
+def sent_event(send: MagicMock) -> threading.Event:
+    event = threading.Event()
+    send.side_effect = lambda: event.set()
+    return event
+
+
+def test_identical_requests_are_sent_once(scheduler):
+    send = MagicMock()
+    object_id = getObjectId(1234, 19, 1)
+    sent = sent_event(send)
+
+    scheduler.request(object_id, "Status", send)
+    scheduler.request(object_id, "Status", send)
+    assert sent.wait(1)
+    scheduler.request(object_id, "Status", send)
+    scheduler.reply_received(object_id, Status(0, 0, 0, 0))
+
+    assert send.call_count == 1
+    assert scheduler.in_flight == 0
+
+
+def test_device_in_flight_limit(scheduler):
+    first, second, other_device = MagicMock(), MagicMock(), MagicMock()
+    first_sent, second_sent, other_sent = sent_event(first), sent_event(second), sent_event(other_device)
+
+    scheduler.request(getObjectId(1234, 19, 1), "Configuration", first)
+    scheduler.request(getObjectId(1234, 19, 2), "Configuration", second)
+    scheduler.request(getObjectId(4321, 19, 1), "Configuration", other_device)
+
+    # das zweite Gerät wird nicht durch das erste blockiert
+    assert first_sent.wait(1) and other_sent.wait(1)
+    assert not second_sent.is_set()
+
+    scheduler.reply_received(getObjectId(1234, 19, 1), Configuration(0, 0, 0, 0, 0))
+    assert second_sent.wait(1)
+
+
+def test_unanswered_request_is_retried_then_dropped(scheduler):
+    send = MagicMock()
+    object_id = getObjectId(1234, 19, 1)
+
+    scheduler.request(object_id, "Status", send)
+    time.sleep(0.5)
+
+    assert send.call_count == 2
+    assert scheduler.pending == 0
+    assert scheduler.in_flight == 0
+
+
+def test_reread_after_write_is_sent_after_the_reply_in_flight(scheduler):
+    send = MagicMock()
+    object_id = getObjectId(1234, 19, 1)
+    sent = sent_event(send)
+
+    scheduler.request(object_id, "Configuration", send)
+    assert sent.wait(1)
+    sent.clear()
+    # die laufende Antwort kann noch die alte Konfiguration enthalten
+    scheduler.request(object_id, "Configuration", send, reread=True)
+    assert not sent.wait(0.01)
+
+    scheduler.reply_received(object_id, Configuration(0, 0, 0, 0, 0))
+    assert sent.wait(1)
+    assert send.call_count == 2
+    scheduler.reply_received(object_id, Configuration(0, 0, 0, 0, 0))
+    assert scheduler.in_flight == 0
@@ -0,0 +1,40 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import threading
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from hausbus.sender import HausbusCommandSender
+
+
+def test_commands_are_sent_in_order_on_the_sender_thread():
+    sender = HausbusCommandSender(10)
+    sender.start()
+    calls = []
+    try:
+        futures = [sender.submit(lambda i=i: calls.append((i, threading.current_thread().name))) for i in range(5)]
+        for future in futures:
+            future.result(1)
+    finally:
+        sender.stop()
+        sender.join(1)
+
+    assert calls == [(i, "hausbus-command-sender") for i in range(5)]
+
+
+def test_full_queue_rejects_commands():
+    # nicht gestartet, damit die Queue voll bleibt
+    sender = HausbusCommandSender(2)
+    sender.submit(lambda: None)
+    sender.submit(lambda: None)
+
+    with pytest.raises(HomeAssistantError):
+        sender.submit(lambda: None)
+    assert sender.pending == 2
@@ -0,0 +1,101 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from pyhausbus.de.hausbus.homeassistant.proxy.Temperatursensor import Temperatursensor
+from pyhausbus.de.hausbus.homeassistant.proxy.temperatursensor.data.EvStatus import EvStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.PowerMeter import PowerMeter
+from pyhausbus.de.hausbus.homeassistant.proxy.powerMeter.data.EvStatus import EvStatus as PowerMeterEvStatus
+
+from hausbus.sensor import HausbusEnergySensor, HausbusTemperaturSensor
+
+
+@pytest.fixture
+def sensor():
+    channel = Temperatursensor.create(1234, 1)
+    channel.setName("Temperatur")
+    sensor = HausbusTemperaturSensor(channel, MagicMock(device_id="1234", special_type=0))
+    sensor.schedule_update_ha_state = MagicMock()
+    return sensor
+
+
+def receive(sensor, now: float, celsius: int, centi_celsius: int = 0) -> None:
+    with patch("hausbus.sensor.time.monotonic", return_value=now):
+        sensor.handle_event(EvStatus(celsius, centi_celsius, 0))
+
+
+def test_unchanged_and_insignificant_values_are_filtered(sensor):
+    sensor._apply_filter({"deadband": 0.3})
+
+    receive(sensor, 0, 20)
+    receive(sensor, 1, 20)
+    receive(sensor, 2, 20, 20)
+    receive(sensor, 3, 20, 50)
+
+    assert sensor.schedule_update_ha_state.call_count == 2
+    assert sensor.native_value == 20.5
+
+
+def test_heartbeat_writes_unchanged_value(sensor):
+    sensor._apply_filter({"heartbeat": 60})
+
+    receive(sensor, 0, 20)
+    assert not sensor.force_update
+    receive(sensor, 30, 20)
+    receive(sensor, 61, 20)
+
+    assert sensor.schedule_update_ha_state.call_count == 2
+    # HA schreibt den unveränderten Wert nur mit force_update
+    assert sensor.force_update
+
+    receive(sensor, 62, 21)
+    assert not sensor.force_update
+
+
+def test_change_within_min_interval_is_deferred(sensor):
+    sensor._apply_filter({"min_interval": 10})
+    sensor.hass = MagicMock()
+
+    receive(sensor, 0, 20)
+    receive(sensor, 5, 21)
+    receive(sensor, 6, 22)
+
+    assert sensor.schedule_update_ha_state.call_count == 1
+    sensor.hass.loop.call_soon_threadsafe.assert_called_once()
+
+    with patch("hausbus.sensor.time.monotonic", return_value=10):
+        sensor._async_publish_pending()
+    assert sensor.native_value == 22
+
+
+def test_energy_is_integrated_and_published_by_interval():
+    channel = PowerMeter.create(1234, 1)
+    channel.setName("Zähler")
+    energy = HausbusEnergySensor(channel, MagicMock(device_id="1234", special_type=0))
+    energy.async_write_ha_state = MagicMock()
+
+    for now, power, centi_power in ((0, 1, 0), (1800, 3, 0), (3600, 3, 0)):
+        with patch("hausbus.sensor.time.monotonic", return_value=now):
+            energy.handle_event(PowerMeterEvStatus(power, centi_power, 0))
+
+    # der letzte Wert gilt bis zur nächsten Meldung: 0,5 h mit 1 kW und 0,5 h mit 3 kW
+    assert energy.native_value is None
+    energy._async_publish()
+    assert energy.native_value == 2.0
+    energy._async_publish()
+    energy.async_write_ha_state.assert_called_once()
+    assert energy.extra_restore_state_data.native_value == 2.0
+
+    # über einen Ausfall des Geräts wird nicht integriert
+    energy.set_device_available(False)
+    energy.set_device_available(True)
+    with patch("hausbus.sensor.time.monotonic", return_value=36000):
+        energy.handle_event(PowerMeterEvStatus(3, 0, 0))
+    energy._async_publish()
+    assert energy.native_value == 2.0
@@ -0,0 +1,71 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from pyhausbus.HausBusUtils import HOMESERVER_OBJECT_ID, getObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.commands.GetModuleId import GetModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.Configuration import Configuration
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EFirmwareId import EFirmwareId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EIndex import EIndex
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.MGroupMask import MGroupMask
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.commands.GetStatus import GetStatus
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.commands.On import On
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOn import EvOn
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.Status import Status
+from pyhausbus.de.hausbus.homeassistant.proxy.schalter.params.EState import EState
+
+from hausbus.tests.simulator import HausbusSimulator, build_frame, create_modules, decode_frame, default_data, encode_data
+from hausbus.transport import HausbusDatagramProtocol
+
+
+def test_frames_encode_what_pyhausbus_decodes():
+    module_id = ModuleId("sim", 7, 1, 2, EFirmwareId.ESP32)
+    configuration = default_data(Configuration, deviceId=4711, FCKE=0x30)
+
+    for data in (module_id, configuration):
+        sender, receiver, decoded = decode_frame(build_frame(getObjectId(4711, 0, 1), 0, data))
+        assert (sender, type(decoded), encode_data(decoded)) == (getObjectId(4711, 0, 1), type(data), encode_data(data))
+    assert decoded.getDeviceId() == 4711
+
+
+@pytest.mark.asyncio
+async def test_simulated_modules_answer_discovery_and_commands(socket_enabled):
+    loop = asyncio.get_running_loop()
+    received = []
+    listener = MagicMock()
+    listener.busDataReceived.side_effect = received.append
+    client, _ = await loop.create_datagram_endpoint(lambda: HausbusDatagramProtocol(loop, [listener]), local_addr=("127.0.0.1", 0))
+    simulator = HausbusSimulator(create_modules(4), client.get_extra_info("sockname"), latency=0.001)
+    await simulator.start("127.0.0.2", 0)
+    relay = getObjectId(10000, 19, 1)
+
+    async def send_and_wait(receiver, command, count):
+        client.sendto(build_frame(HOMESERVER_OBJECT_ID, receiver, command), simulator.address)
+        for _ in range(100):
+            if len(received) >= count:
+                break
+            await asyncio.sleep(0.01)
+
+    try:
+        await send_and_wait(0, GetModuleId(EIndex.RUNNING, MGroupMask(0xFF)), 5)
+        await send_and_wait(relay, GetStatus(), 7)
+        await send_and_wait(relay, On(0, 0), 9)
+    finally:
+        simulator.close()
+        client.close()
+
+    data = [message.getData() for message in received]
+    # jeder Befehl kommt wie beim Broadcast zurück
+    assert [type(item).__name__ for item in data] == ["GetModuleId", *["ModuleId"] * 4, "GetStatus", "Status", "On", "EvOn"]
+    assert data[6].getState() is EState.OFF
+    assert isinstance(data[-1], EvOn) and isinstance(data[6], Status)
+    assert received[-1].getSenderObjectId() == relay
@@ -0,0 +1,63 @@
+# start in custom_components directory: pytest hausbus/tests/ --cov=hausbus --cov-branch
+import sys
+import os
+
+# Pfad zu custom_components hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+import struct
+
+import pytest
+from unittest.mock import MagicMock
+
+from pyhausbus.HausBusUtils import getObjectId
+
+from hausbus.transport import HausbusDatagramProtocol, HausbusTransportSocket, parse_frame
+
+EV_OFF = "pyhausbus.de.hausbus.homeassistant.proxy.schalter.data.EvOff"
+
+
+def frame(sender: int, function_id: int, data: bytes) -> bytes:
+    return struct.pack("<2sBBIIHB", b"\xef\xef", 0, 1, sender, 0, len(data) + 1, function_id) + data
+
+
+def test_parse_frame_rejects_invalid_frames():
+    assert parse_frame(b"\xef\xef\x00") is None
+    assert parse_frame(b"\x00" * 20) is None
+    assert parse_frame(frame(getObjectId(1234, 19, 1), 201, b"\x05\x00")) == (getObjectId(1234, 19, 1), 0, 201, b"\x05\x00")
+
+
+@pytest.mark.asyncio
+async def test_frames_keep_their_order_while_a_class_is_imported(monkeypatch):
+    monkeypatch.delitem(sys.modules, EV_OFF)
+    received = []
+    listener = MagicMock()
+    listener.busDataReceived.side_effect = lambda message: received.append(type(message.getData()).__name__)
+    protocol = HausbusDatagramProtocol(asyncio.get_running_loop(), [listener])
+
+    sender = getObjectId(1234, 19, 1)
+    protocol.datagram_received(frame(sender, 200, b""), ("127.0.0.1", 5855))
+    protocol.datagram_received(frame(sender, 201, b"\x05\x00"), ("127.0.0.1", 5855))
+    # EvOff wird erst im Executor importiert, EvOn wartet dahinter
+    assert received == []
+
+    for _ in range(100):
+        if len(received) == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert received == ["EvOff", "EvOn"]
+    assert listener.busDataReceived.call_args.args[0].getData().getDuration() == 5
+
+
+@pytest.mark.asyncio
+async def test_socket_shim_sends_through_transport_in_the_loop():
+    transport = MagicMock()
+    sock = MagicMock()
+    shim = HausbusTransportSocket(asyncio.get_running_loop(), transport, sock)
+
+    shim.sendto(b"in loop", ("192.168.0.255", 5855))
+    await asyncio.get_running_loop().run_in_executor(None, shim.sendto, b"from thread", ("192.168.0.255", 5855))
+
+    transport.sendto.assert_called_once_with(b"in loop", ("192.168.0.255", 5855))
+    sock.sendto.assert_called_once_with(b"from thread", ("192.168.0.255", 5855))
@@ -0,0 +1,94 @@
+"""Persistent cache of the discovered Haus-Bus topology."""
+
+from __future__ import annotations
+
+import importlib
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from pyhausbus.ABusFeature import ABusFeature
+import pyhausbus.HausBusUtils as HausBusUtils
+from pyhausbus.ObjectId import ObjectId
+from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.data.ModuleId import ModuleId
+from pyhausbus.de.hausbus.homeassistant.proxy.controller.params.EFirmwareId import EFirmwareId
+
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.topology"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class HausbusTopologyStore:
+    """Stores devices and channels of the bus, so that entities can be created without waiting for the discovery."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Set up the store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        """Load the cached devices."""
+        data = await self._store.async_load()
+        self._devices = data.get("devices", {}) if data else {}
+        LOGGER.debug("loaded topology of %s devices", len(self._devices))
+        return self._devices
+
+    @callback
+    def async_update_device(self, device_id: int, model_type: str, module_id: ModuleId, fcke: int, special_type: int, channels: list[ABusFeature]) -> None:
+        """Store the result of a live discovery of a device."""
+        self._devices[str(device_id)] = {
+            "model_type": model_type,
+            "module_name": module_id.getName(),
+            "major_release": module_id.getMajorRelease(),
+            "minor_release": module_id.getMinorRelease(),
+            "firmware_id": module_id.getFirmwareId().name,
+            "fcke": fcke,
+            "special_type": special_type,
+            "channels": [
+                [ObjectId(channel.getObjectId()).getClassId(), ObjectId(channel.getObjectId()).getInstanceId(), channel.getName()]
+                for channel in channels
+            ],
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove_device(self, device_id: str) -> None:
+        """Remove a device from the cache."""
+        if self._devices.pop(device_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"devices": self._devices}
+
+
+def module_id_from_cache(entry: dict[str, Any]) -> ModuleId:
+    """Create the ModuleId of a cached device."""
+    return ModuleId(entry["module_name"], 0, entry["major_release"], entry["minor_release"], EFirmwareId.value_of(entry["firmware_id"]))
+
+
+def channels_from_cache(device_id: int, entry: dict[str, Any]) -> list[ABusFeature]:
+    """Create the pyhausbus channel instances of a cached device."""
+    channels: list[ABusFeature] = []
+    for class_id, instance_id, name in entry["channels"]:
+        try:
+            class_name = ProxyFactory.getBusClassNameForClass(class_id)
+            cls = getattr(importlib.import_module(class_name), class_name.rsplit(".", 1)[-1])
+            channel = cls(HausBusUtils.getObjectId(device_id, class_id, instance_id))
+            channel.setName(name)
+        except (ImportError, AttributeError, TypeError) as err:
+            LOGGER.warning("unknown cached channel class %s on device %s: %s", class_id, device_id, err)
+            continue
+
+        channels.append(channel)
+    return channels
+
+
+def devices_channels_from_cache(devices: dict[str, dict[str, Any]]) -> dict[str, list[ABusFeature]]:
+    """Create the channels of all cached devices; imports the proxy modules, so run it in the executor."""
+    return {device_id: channels_from_cache(int(device_id), entry) for device_id, entry in devices.items()}
@@ -0,0 +1,181 @@
+"""Asyncio UDP transport for the Haus-Bus connection."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import importlib
+import logging
+import socket
+import struct
+import sys
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pyhausbus.BusDataMessage import BusDataMessage
+from pyhausbus.BusHandler import RESULT_START, BusHandler
+from pyhausbus.HausBusUtils import UDP_PORT, getClassId
+from pyhausbus.de.hausbus.homeassistant.proxy import ProxyFactory
+
+LOGGER = logging.getLogger(__name__)
+
+FRAME_HEADER = b"\xef\xef"
+# 2 Byte Kennung, Kontrollbyte, Nachrichtenzähler, Sender, Empfänger, Datenlänge, FunctionId
+FRAME = struct.Struct("<2sBBIIHB")
+
+
+def parse_frame(data: bytes) -> tuple[int, int, int, bytes] | None:
+    """Split a UDP frame into sender, receiver, function id and function data."""
+    if len(data) < FRAME.size:
+        return None
+    header, _control, _counter, sender, receiver, _length, function_id = FRAME.unpack_from(data)
+    if header != FRAME_HEADER:
+        return None
+    return sender, receiver, function_id, data[FRAME.size:]
+
+
+class HausbusDatagramProtocol(asyncio.DatagramProtocol):
+    """Decodes received frames on the event loop and hands them to the bus listeners of pyhausbus.
+
+    The data classes of pyhausbus are imported on first use. Such an import runs in the
+    executor and later frames wait behind it, so the order of the messages is kept.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, listeners: list[Any]) -> None:
+        """Set up the protocol."""
+        self._loop = loop
+        self._listeners = listeners
+        # (classId, functionId) -> Datenklasse, erspart die if-Kette der ProxyFactory
+        self._classes: dict[tuple[int, int], type] = {}
+        self._backlog: deque[tuple[int, int, int, bytes]] = deque()
+        self._importing = False
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Queue a received frame and deliver it if no import is running."""
+        frame = parse_frame(data)
+        if frame is None:
+            LOGGER.debug("invalid frame from %s", addr)
+            return
+        self._backlog.append(frame)
+        if not self._importing:
+            self._drain()
+
+    def error_received(self, exc: Exception) -> None:
+        """Log socket errors."""
+        LOGGER.warning("bus socket error: %s", exc)
+
+    def _drain(self) -> None:
+        while self._backlog:
+            sender, receiver, function_id, function_data = self._backlog[0]
+            class_id = getClassId(receiver if function_id < RESULT_START else sender)
+            data_class = self._classes.get((class_id, function_id))
+            if data_class is None:
+                class_name = ProxyFactory.getBusClassNameFor(class_id, function_id)
+                module = sys.modules.get(class_name)
+                if module is None:
+                    self._importing = True
+                    future = self._loop.run_in_executor(None, importlib.import_module, class_name)
+                    future.add_done_callback(self._imported)
+                    return
+                data_class = self._classes[(class_id, function_id)] = getattr(module, class_name.rsplit(".", 1)[1])
+
+            self._backlog.popleft()
+            self._deliver(sender, receiver, data_class, function_data)
+
+    def _imported(self, future: asyncio.Future[Any]) -> None:
+        self._importing = False
+        if future.exception() is not None:
+            LOGGER.error("could not import bus class: %s", future.exception())
+            self._backlog.popleft()
+        self._drain()
+
+    def _deliver(self, sender: int, receiver: int, data_class: type, function_data: bytes) -> None:
+        try:
+            data = data_class._fromBytes(function_data, [0])
+        except Exception:  # noqa: BLE001
+            LOGGER.error("could not decode %s from %s", data_class.__name__, sender, exc_info=True)
+            return
+
+        message = BusDataMessage(sender, receiver, data)
+        for listener in list(self._listeners):
+            try:
+                listener.busDataReceived(message)
+            except Exception:  # noqa: BLE001
+                LOGGER.error("bus listener %s failed", listener, exc_info=True)
+
+
+class HausbusTransportSocket:
+    """Replaces the send socket of the BusHandler.
+
+    On the event loop frames go through the transport. Other threads (command sender,
+    pyhausbus workers) send directly on the non-blocking socket and only hop to the loop
+    if the socket buffer is full.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, transport: asyncio.DatagramTransport, sock: socket.socket) -> None:
+        """Set up the socket shim."""
+        self._loop = loop
+        self._transport = transport
+        self._sock = sock
+
+    def sendto(self, data: bytes, address: tuple[str, int]) -> None:
+        """Send a frame from any thread."""
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._transport.sendto(data, address)
+            return
+        try:
+            self._sock.sendto(data, address)
+        except BlockingIOError:
+            self._loop.call_soon_threadsafe(self._transport.sendto, bytes(data), address)
+
+
+class HausbusTransport:
+    """The asyncio bus connection that replaces the receive thread of pyhausbus."""
+
+    def __init__(self, transport: asyncio.DatagramTransport, protocol: HausbusDatagramProtocol) -> None:
+        """Hold the transport."""
+        self.transport = transport
+        self.protocol = protocol
+
+    def close(self) -> None:
+        """Close the socket."""
+        self.transport.close()
+
+
+async def async_start_transport(hass: HomeAssistant, port: int = UDP_PORT) -> HausbusTransport | None:
+    """Start the asyncio transport and install it into pyhausbus.
+
+    Only possible before pyhausbus opened its own connection, otherwise None is returned and
+    the thread based connection stays in use.
+    """
+    if BusHandler._singleInstance is not None:
+        LOGGER.warning("bus connection already started, using the thread transport")
+        return None
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.bind(("0.0.0.0", port))
+    except OSError as err:
+        sock.close()
+        LOGGER.warning("could not open bus port %s, using the thread transport: %s", port, err)
+        return None
+
+    # BusHandler.__init__ startet den Empfangs-Thread nur, solange es noch keine Instanz gibt
+    bus_handler = BusHandler.__new__(BusHandler)
+    loop = hass.loop
+    transport, protocol = await loop.create_datagram_endpoint(lambda: HausbusDatagramProtocol(loop, bus_handler.listeners), sock=sock)
+    if BusHandler._singleInstance is not None:
+        transport.close()
+        LOGGER.warning("bus connection started meanwhile, using the thread transport")
+        return None
+    bus_handler.sock = HausbusTransportSocket(loop, transport, sock)
+    BusHandler._singleInstance = bus_handler
+    await hass.async_add_executor_job(bus_handler._getBroadcastIp)
+    LOGGER.debug("asyncio bus transport listening on port %s", port)
+    return HausbusTransport(transport, protocol)